@@ -0,0 +1,38 @@
+import json
+from typing import Optional
+
+from api.aio.client import read_response
+from config import API_ENDPOINTS
+
+
+async def login(context, payload):
+    """
+    Async counterpart of ``api.auth.login``.
+
+    Args:
+        context: The async API request context
+        payload: The login payload
+    """
+    url = API_ENDPOINTS["LOGIN"]
+
+    response = await context.post(
+        url, data=json.dumps(payload), headers=({"Content-Type": "application/json"})
+    )
+
+    return response
+
+
+async def login_token(context, payload) -> Optional[str]:
+    """
+    Log in and return the access token.
+
+    Args:
+        context: The async API request context
+        payload: The login payload
+
+    Returns:
+        The access token, or None if the login failed
+    """
+    response = await login(context, payload)
+    body = await read_response(response)
+    return body.get("access_token") if response.ok and isinstance(body, dict) else None
@@ -0,0 +1,451 @@
+"""
+Bulk landscape operations on the async API layer.
+
+This module fans out the creation, linking and configuration of whole
+landscape sections (``mesh``, ``systems``, ``sources``, ``objects``,
+``products``) and the deletion of created entities, with a configurable
+concurrency limit.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from api.aio.client import read_response
+from api.aio.mesh import create_mesh, delete_mesh
+from api.aio.object import config_object, create_object, delete_object, link_object_to_source
+from api.aio.product import (
+    create_data_product_schema,
+    create_product,
+    delete_product,
+    link_product_to_object,
+    link_product_to_product,
+)
+from api.aio.source import (
+    config_connection_detail_source,
+    create_source,
+    delete_source,
+    link_system_to_source,
+    set_connection_secret,
+)
+from api.aio.system import create_system, delete_system
+from test_data.shared.connection_source_payload import create_connection_source_payload
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.object_payload import configure_object_payload, create_object_payload
+from test_data.shared.product_payload import create_product_payload
+from test_data.shared.schema_product_payload import schema_product_create_payload
+from test_data.shared.source_payload import create_source_payload
+from test_data.shared.system_payload import create_system_payload
+from utils.common import find_entity, register_entity
+from utils.entity_registry import EntityRegistry
+from utils.entity_tracker import created_identifier
+from utils.landscape import Landscape
+
+DEFAULT_CONCURRENCY = 8
+
+# Landscape section -> (entity type, create function, payload factory(item, id_map))
+SECTIONS: Dict[str, Tuple[str, Callable[..., Awaitable[Any]], Callable[..., Dict[str, Any]]]] = {
+    "mesh": ("mesh", create_mesh, lambda item, id_map: create_mesh_payload(item.get("name"))),
+    "systems": (
+        "system",
+        create_system,
+        lambda item, id_map: create_system_payload(item.get("name")),
+    ),
+    "sources": (
+        "source",
+        create_source,
+        lambda item, id_map: create_source_payload(item.get("name")),
+    ),
+    "objects": (
+        "object",
+        create_object,
+        lambda item, id_map: create_object_payload(item.get("name")),
+    ),
+    "products": (
+        "product",
+        create_product,
+        lambda item, id_map: create_product_payload(
+            find_entity(id_map, item["mesh"])["identifier"], item.get("name")
+        ),
+    ),
+}
+
+
+# Entity type -> delete function, in teardown order (dependents before what they depend on)
+DELETE_ORDER: Tuple[Tuple[str, Callable[..., Awaitable[Any]]], ...] = (
+    ("product", delete_product),
+    ("object", delete_object),
+    ("source", delete_source),
+    ("system", delete_system),
+    ("mesh", delete_mesh),
+)
+
+
+class BulkOperationError(Exception):
+    """Raised when some operations of a bulk call failed."""
+
+    def __init__(self, message: str, failures: List[Tuple[str, Any]], results: Dict[str, Any]):
+        super().__init__(message)
+        self.failures = failures
+        self.results = results
+
+
+async def _gather_bounded(
+    operations: List[Tuple[str, Callable[[], Awaitable[Any]]]], concurrency: int
+) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+    """Run keyed operations with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(key: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await operation()
+
+    outcomes = await asyncio.gather(
+        *[_run(key, operation) for key, operation in operations], return_exceptions=True
+    )
+    results, failures = {}, []
+    for (key, _), outcome in zip(operations, outcomes):
+        if isinstance(outcome, BaseException):
+            failures.append((key, outcome))
+        else:
+            results[key] = outcome
+    return results, failures
+
+
+async def _checked(response: Any) -> Any:
+    """Return the decoded body of a successful response, raise otherwise."""
+    body = await read_response(response)
+    if not response.ok:
+        raise RuntimeError(f"Request failed: {response.status} - {body}")
+    return body
+
+
+async def bulk_create(
+    context: Any,
+    section: str,
+    items: List[Dict[str, Any]],
+    access_token: str,
+    request: Any = None,
+    id_map: Optional[EntityRegistry] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[str, str]:
+    """
+    Create every entity of a landscape section concurrently.
+
+    Args:
+        context: The async API request context
+        section: The landscape section name (see ``SECTIONS``)
+        items: The section entries from the landscape YAML
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        id_map: Registered entities; created entities are added to it
+        concurrency: Maximum number of creates in flight
+
+    Returns:
+        Mapping of landscape id to server identifier
+
+    Raises:
+        BulkOperationError: If any create failed (successful ones are still registered)
+    """
+    entity_type, create, build_payload = SECTIONS[section]
+    id_map = id_map if id_map is not None else EntityRegistry()
+
+    def _operation(item: Dict[str, Any]) -> Callable[[], Awaitable[Any]]:
+        async def _create() -> str:
+            payload = build_payload(item, id_map)
+            body = await _checked(await create(context, payload, access_token, request))
+            identifier = created_identifier(body)
+            if identifier is None:
+                raise RuntimeError(f"Response missing identifier: {body}")
+            return identifier
+
+        return _create
+
+    results, failures = await _gather_bounded(
+        [(item["id"], _operation(item)) for item in items], concurrency
+    )
+    for key, identifier in results.items():
+        register_entity(id_map, {"id": key, "identifier": identifier, "type": entity_type})
+
+    if failures:
+        raise BulkOperationError(
+            f"{len(failures)}/{len(items)} {section} creates failed", failures, results
+        )
+    return results
+
+
+def landscape_links(landscape: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """
+    List the edges of a landscape.
+
+    Args:
+        landscape: The landscape configuration (a compiled Landscape has them already)
+
+    Returns:
+        List of (link kind, parent id, child id) tuples
+    """
+    if isinstance(landscape, Landscape):
+        return list(landscape.links)
+    links = [("system_source", s["system"], s["id"]) for s in landscape.get("sources", [])]
+    links += [("source_object", o["source"], o["id"]) for o in landscape.get("objects", [])]
+    object_ids = {o["id"] for o in landscape.get("objects", [])}
+    for product in landscape.get("products", []):
+        for input_id in product.get("input", []):
+            kind = "object_product" if input_id in object_ids else "product_product"
+            links.append((kind, input_id, product["id"]))
+    return links
+
+
+async def _link(
+    context: Any, kind: str, parent: Dict, child: Dict, access_token: str, request: Any
+) -> Any:
+    """Create a single link of the given kind."""
+    if kind == "system_source":
+        return await link_system_to_source(context, parent, child, access_token, request)
+    if kind == "source_object":
+        return await link_object_to_source(context, parent, child, access_token, request)
+    if kind == "object_product":
+        return await link_product_to_object(context, child, parent, access_token, request)
+    return await link_product_to_product(context, parent, child, access_token, request)
+
+
+async def bulk_link(
+    context: Any,
+    links: List[Tuple[str, str, str]],
+    id_map: EntityRegistry,
+    access_token: str,
+    request: Any = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """
+    Create many links concurrently.
+
+    Args:
+        context: The async API request context
+        links: (link kind, parent id, child id) tuples, see ``landscape_links``
+        id_map: Registered entities
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        concurrency: Maximum number of links in flight
+
+    Returns:
+        The number of links created
+
+    Raises:
+        BulkOperationError: If any link failed
+    """
+
+    def _operation(kind: str, parent_id: str, child_id: str) -> Callable[[], Awaitable[Any]]:
+        async def _create_link() -> Any:
+            parent, child = find_entity(id_map, parent_id), find_entity(id_map, child_id)
+            if not parent or not child:
+                raise KeyError(f"Unknown entity in link {parent_id} -> {child_id}")
+            return await _checked(
+                await _link(context, kind, parent, child, access_token, request)
+            )
+
+        return _create_link
+
+    operations = [
+        (f"{parent} -> {child}", _operation(kind, parent, child))
+        for kind, parent, child in links
+    ]
+    results, failures = await _gather_bounded(operations, concurrency)
+    if failures:
+        raise BulkOperationError(f"{len(failures)}/{len(links)} links failed", failures, results)
+    return len(results)
+
+
+async def bulk_configure(
+    context: Any,
+    landscape: Dict[str, Any],
+    id_map: EntityRegistry,
+    access_token: str,
+    request: Any = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """
+    Apply connection details, secrets, object configs and product schemas concurrently.
+
+    Args:
+        context: The async API request context
+        landscape: The landscape configuration
+        id_map: Registered entities
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        concurrency: Maximum number of updates in flight
+
+    Returns:
+        The number of updates applied
+
+    Raises:
+        BulkOperationError: If any update failed
+    """
+    secrets = {
+        "access_key": os.getenv("S3_ACCESS_KEY", ""),
+        "access_secret": os.getenv("S3_SECRET_KEY", ""),
+    }
+    operations = []
+
+    def _add(key: str, function: Callable[..., Awaitable[Any]], entity_id: str, payload: Any):
+        async def _update() -> Any:
+            return await _checked(
+                await function(
+                    context, find_entity(id_map, entity_id), payload, access_token, request
+                )
+            )
+
+        operations.append((key, _update))
+
+    for source in landscape.get("sources", []):
+        _add(
+            f"connection {source['id']}",
+            config_connection_detail_source,
+            source["id"],
+            create_connection_source_payload(),
+        )
+        _add(f"secret {source['id']}", set_connection_secret, source["id"], secrets)
+    for obj in landscape.get("objects", []):
+        _add(f"config {obj['id']}", config_object, obj["id"], configure_object_payload())
+    for product in landscape.get("products", []):
+        _add(
+            f"schema {product['id']}",
+            create_data_product_schema,
+            product["id"],
+            schema_product_create_payload(),
+        )
+
+    results, failures = await _gather_bounded(operations, concurrency)
+    if failures:
+        raise BulkOperationError(
+            f"{len(failures)}/{len(operations)} updates failed", failures, results
+        )
+    return len(results)
+
+
+async def build_landscape(
+    context: Any,
+    landscape: Dict[str, Any],
+    access_token: str,
+    request: Any = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> EntityRegistry:
+    """
+    Stand up a whole landscape with bulk creates, links and configuration.
+
+    Meshes, systems, sources and objects are created in a single wave;
+    products follow once their host mesh exists.
+
+    Args:
+        context: The async API request context
+        landscape: The landscape configuration
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        concurrency: Maximum number of requests in flight per section
+
+    Returns:
+        The populated entity registry
+    """
+    id_map = EntityRegistry()
+    first_wave = await asyncio.gather(
+        *[
+            bulk_create(
+                context,
+                section,
+                landscape.get(section, []),
+                access_token,
+                request,
+                id_map,
+                concurrency,
+            )
+            for section in ("mesh", "systems", "sources", "objects")
+        ],
+        return_exceptions=True,
+    )
+    for outcome in first_wave:
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+    await bulk_create(
+        context,
+        "products",
+        landscape.get("products", []),
+        access_token,
+        request,
+        id_map,
+        concurrency,
+    )
+    await bulk_link(
+        context, landscape_links(landscape), id_map, access_token, request, concurrency
+    )
+    await bulk_configure(context, landscape, id_map, access_token, request, concurrency)
+    return id_map
+
+
+async def bulk_delete(
+    context: Any,
+    entities: Dict[str, List[str]],
+    access_token: str,
+    request: Any = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[str]:
+    """
+    Delete entities in reverse dependency order, each type's entities concurrently.
+
+    Products go first, then objects, sources, systems and meshes. Entities of
+    one type that still have dependents of the same type (e.g. linked
+    products) get a 409 and are retried once the others are gone; entities
+    that no longer exist (404) count as deleted. Every type is attempted even
+    if an earlier one had failures.
+
+    Args:
+        context: The async API request context
+        entities: Identifiers by entity type ("product", "object", "source", "system", "mesh")
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        concurrency: Maximum number of deletes in flight
+
+    Returns:
+        The deleted entities, as ``"<type> <identifier>"`` keys
+
+    Raises:
+        BulkOperationError: If some entities could not be deleted (the others are)
+    """
+    deleted, failures = [], []
+
+    def _operation(
+        delete: Callable[..., Awaitable[Any]], identifier: str
+    ) -> Callable[[], Awaitable[Any]]:
+        async def _delete() -> int:
+            response = await delete(context, identifier, access_token, request)
+            if not response.ok and response.status != 404:
+                raise RuntimeError(
+                    f"Delete failed: {response.status} - {await read_response(response)}"
+                )
+            return response.status
+
+        return _delete
+
+    for kind, delete in DELETE_ORDER:
+        pending = list(dict.fromkeys(entities.get(kind, [])))
+        while pending:
+            operations = [
+                (f"{kind} {identifier}", _operation(delete, identifier)) for identifier in pending
+            ]
+            results, tier_failures = await _gather_bounded(operations, concurrency)
+            deleted.extend(results)
+            conflicts = [key for key, error in tier_failures if "Delete failed: 409" in str(error)]
+            if not results or not conflicts:
+                failures.extend(tier_failures)
+                break
+            # Retry what was blocked by entities of the same type deleted in this pass
+            failures.extend(failure for failure in tier_failures if failure[0] not in conflicts)
+            pending = [key.split(" ", 1)[1] for key in conflicts]
+
+    if failures:
+        raise BulkOperationError(
+            f"{len(failures)}/{len(deleted) + len(failures)} deletes failed",
+            failures,
+            {key: True for key in deleted},
+        )
+    return deleted
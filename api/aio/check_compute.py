@@ -0,0 +1,21 @@
+from api.aio.client import record_api_info
+from config import API_ENDPOINTS
+from utils.common import get_headers
+
+
+async def check_status_compute(context, identifier, access_token, request):
+    """
+    Async counterpart of ``api.check_compute.check_status_compute``.
+
+    Args:
+        context: The async API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+    """
+    url = f"{API_ENDPOINTS['CHECK_COMPUTE']}/?identifier={identifier}"
+    headers = get_headers(access_token)
+
+    response = await context.get(url, headers=headers)
+    await record_api_info(request, "GET", url, {}, response)
+
+    return response
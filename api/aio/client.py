@@ -0,0 +1,175 @@
+"""
+Async API client helpers.
+
+This module provides the building blocks shared by the ``api.aio`` modules:
+a request context wrapper bounding the number of in-flight requests and
+wrapping responses in memoizing ``AsyncApiResponse`` objects, a factory for
+Playwright async request contexts and response recording.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Optional, TypeVar
+
+from playwright.async_api import APIResponse, async_playwright
+
+from utils.api_response import AsyncApiResponse
+from utils.api_trace import get_sink, trace_call
+from utils.cassette import AsyncCassetteResponse, get_cassette
+from utils.common import record_api_info as _record_api_info
+from utils.entity_tracker import TRACKER, entity_type_of
+from utils.latency import LATENCY
+
+T = TypeVar("T")
+
+
+class BoundedContext:
+    """Async request context limiting the number of concurrent requests."""
+
+    def __init__(self, context: Any, max_concurrency: int = 16):
+        """
+        Initialize the bounded context.
+
+        Args:
+            context: A Playwright async ``APIRequestContext``
+            max_concurrency: Maximum number of requests in flight
+        """
+        self.context = context
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _send(self, method: str, url: str, kwargs: Any) -> AsyncApiResponse:
+        """
+        Send a request, time it into the per-endpoint histograms and wrap its
+        response, appending it to the JSONL trace when ``API_TRACE`` is set,
+        recording it into or serving it from the cassette if any, and report
+        created and deleted entities to the teardown tracker.
+        """
+        cassette = get_cassette()
+        async with self._semaphore:
+            started_at = time.time()
+            start = time.perf_counter()
+            if cassette is not None and cassette.replaying:
+                raw = cassette.replay(method, url, kwargs, AsyncCassetteResponse)
+            else:
+                raw = await getattr(self.context, method)(url, **kwargs)
+            response = AsyncApiResponse(raw, time.perf_counter() - start)
+        recording = cassette is not None and cassette.recording
+        tracked = isinstance(raw, APIResponse) and entity_type_of(url)
+        traced = get_sink() is not None
+        if recording or tracked or traced:
+            # Synchronous view of the memoized body for the cassette, the tracker and the trace
+            snapshot = await response.snapshot()
+            if recording:
+                cassette.record(method, url, kwargs, snapshot)
+            if tracked:
+                TRACKER.observe(method, url, kwargs, snapshot)
+            if traced:
+                trace_call(method, url, kwargs, snapshot, started_at)
+        LATENCY.record(method, url, response.ttfb)
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        return await self._send("get", url, kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        return await self._send("post", url, kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> Any:
+        return await self._send("put", url, kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> Any:
+        return await self._send("delete", url, kwargs)
+
+    async def dispose(self) -> None:
+        await self.context.dispose()
+
+
+@asynccontextmanager
+async def async_api_context(
+    base_url: str, max_concurrency: int = 16
+) -> AsyncIterator[BoundedContext]:
+    """
+    Open a Playwright async request context bounded by a semaphore.
+
+    Args:
+        base_url: The API base URL
+        max_concurrency: Maximum number of requests in flight
+
+    Yields:
+        A BoundedContext instance
+    """
+    async with async_playwright() as playwright:
+        context = await playwright.request.new_context(base_url=base_url)
+        try:
+            yield BoundedContext(context, max_concurrency)
+        finally:
+            await context.dispose()
+
+
+async def read_response(response: Any) -> Any:
+    """
+    Read the body of an async response as JSON, falling back to text.
+
+    Args:
+        response: An ``AsyncApiResponse`` (or a Playwright async ``APIResponse``)
+
+    Returns:
+        The decoded JSON body, or the text body if it is not JSON
+    """
+    try:
+        return await response.json()
+    except Exception:
+        return await response.text()
+
+
+async def record_api_info(
+    request: Optional[Any], method: str, url: str, payload: Any, response: Any
+) -> None:
+    """
+    Async counterpart of ``utils.common.record_api_info``.
+
+    Args:
+        request: The test request object for logging (may be None)
+        method: The HTTP method
+        url: The request URL
+        payload: The request payload or params
+        response: An ``AsyncApiResponse`` (or a Playwright async ``APIResponse``)
+    """
+    if request is None:
+        return
+    _record_api_info(request, method, url, payload, await read_response(response))
+
+
+def run_async(coroutine: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous test code.
+
+    The coroutine runs on a fresh event loop in a dedicated thread so it never
+    clashes with the loop owned by Playwright's sync API. The caller's context
+    variables (e.g. the trace's test node id) carry over to that thread.
+
+    Args:
+        coroutine: The coroutine to run
+
+    Returns:
+        The coroutine result
+    """
+    result: dict = {}
+    context = contextvars.copy_context()
+
+    def _target() -> None:
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=context.run, args=(_target,), name="api-aio")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
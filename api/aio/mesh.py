@@ -0,0 +1,78 @@
+"""
+Async mesh operations for API testing.
+
+This module mirrors ``api.mesh`` on top of an async request context so many
+mesh calls can be issued concurrently.
+"""
+
+import json
+
+from api.aio.client import record_api_info
+from config import API_ENDPOINTS
+from utils.common import get_headers
+
+
+async def get_all_mesh(context, access_token, request):
+    """
+    Retrieve all mesh resources from the API.
+
+    Args:
+        context: The async API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response containing all mesh resources
+    """
+    url = API_ENDPOINTS["MESH"]
+    headers = get_headers(access_token)
+
+    response = await context.get(url, headers=headers)
+    await record_api_info(request, "GET", url, {}, response)
+
+    return response
+
+
+async def create_mesh(context, payload, access_token, request):
+    """
+    Create a new mesh resource via API.
+
+    Args:
+        context: The async API request context
+        payload: The mesh data to create
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response containing the created mesh resource
+    """
+    url = API_ENDPOINTS["MESH"]
+    headers = get_headers(access_token)
+    data = json.dumps(payload)
+
+    response = await context.post(url, data=data, headers=headers)
+    await record_api_info(request, "POST", url, payload, response)
+
+    return response
+
+
+async def delete_mesh(context, mesh_id, access_token, request):
+    """
+    Delete a mesh resource by its identifier.
+
+    Args:
+        context: The async API request context
+        mesh_id: The identifier of the mesh to delete
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response indicating the deletion result
+    """
+    url = f"{API_ENDPOINTS['MESH']}/?identifier={mesh_id}"
+    headers = get_headers(access_token)
+
+    response = await context.delete(url, headers=headers)
+    await record_api_info(request, "DELETE", url, {}, response)
+
+    return response
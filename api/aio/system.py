@@ -0,0 +1,79 @@
+"""
+Async system operations for API testing.
+
+This module mirrors ``api.system`` on top of an async request context so many
+system calls can be issued concurrently.
+"""
+
+import json
+
+from api.aio.client import record_api_info
+from config import API_ENDPOINTS
+from utils.common import get_headers
+
+
+async def get_all_system(context, access_token, request):
+    """
+    Retrieve all system resources from the API.
+
+    Args:
+        context: The async API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response containing all system resources
+    """
+    url = API_ENDPOINTS["SYSTEM"]
+    headers = get_headers(access_token)
+
+    response = await context.get(url, headers=headers)
+    await record_api_info(request, "GET", url, {}, response)
+
+    return response
+
+
+async def create_system(context, payload, access_token, request):
+    """
+    Create a new system resource via API.
+
+    Args:
+        context: The async API request context
+        payload: The system data to create
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response containing the created system resource
+    """
+    url = API_ENDPOINTS["SYSTEM"]
+    headers = get_headers(access_token)
+    data = json.dumps(payload)
+
+    response = await context.post(url, data=data, headers=headers)
+    await record_api_info(request, "POST", url, payload, response)
+
+    return response
+
+
+async def delete_system(context, system_id, access_token, request):
+    """
+    Delete a system resource by its identifier.
+
+    Args:
+        context: The async API request context
+        system_id: The identifier of the system to delete
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        API response indicating the deletion result
+    """
+    url = API_ENDPOINTS["SYSTEM"]
+    headers = get_headers(access_token)
+    params = {"identifier": system_id}
+
+    response = await context.delete(url, params=params, headers=headers)
+    await record_api_info(request, "DELETE", url, {}, response)
+
+    return response
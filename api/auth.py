@@ -1,5 +1,6 @@
 import json
 from config import API_ENDPOINTS
+from utils.api_response import send
 
 
 def login(context, payload):
@@ -14,8 +15,8 @@ def login(context, payload):
     """
     url = API_ENDPOINTS["LOGIN"]
 
-    response = context.post(
-        url, data=json.dumps(payload), headers=({"Content-Type": "application/json"})
+    response = send(
+        context, "post", url, data=json.dumps(payload), headers=({"Content-Type": "application/json"})
     )
 
     return response
@@ -1,4 +1,5 @@
 from config import API_ENDPOINTS
+from utils.api_response import send
 from utils.common import record_api_info, get_headers
 
 
@@ -14,7 +15,7 @@ def check_status_compute(context, identifier, access_token, request):
     url = f"{API_ENDPOINTS['CHECK_COMPUTE']}/?identifier={identifier}"
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
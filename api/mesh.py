@@ -8,6 +8,7 @@ including creating, reading, and deleting mesh resources.
 import json
 
 from config import API_ENDPOINTS
+from utils.api_response import send
 from utils.common import record_api_info, get_headers
 
 
@@ -26,7 +27,7 @@ def get_all_mesh(context, access_token, request):
     url = API_ENDPOINTS["MESH"]
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -49,7 +50,7 @@ def create_mesh(context, payload, access_token, request):
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.post(url, data=data, headers=headers)
+    response = send(context, "post", url, data=data, headers=headers)
     record_api_info(request, "POST", url, payload, response)
 
     return response
@@ -71,7 +72,7 @@ def delete_mesh(context, mesh_id, access_token, request):
     url = f"{API_ENDPOINTS['MESH']}/?identifier={mesh_id}"
     headers = get_headers(access_token)
 
-    response = context.delete(url, headers=headers)
+    response = send(context, "delete", url, headers=headers)
     record_api_info(request, "DELETE", url, {}, response)
 
     return response
@@ -8,6 +8,7 @@ including creating, reading, deleting, linking, and configuring object resources
 import json
 
 from config import API_ENDPOINTS
+from utils.api_response import send
 from utils.common import record_api_info, get_headers
 
 
@@ -26,7 +27,7 @@ def get_all_object(context, access_token, request):
     url = API_ENDPOINTS["OBJECT"]
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -38,7 +39,7 @@ def get_object_by_id(context, object_id, access_token, request):
     """
     url = f"{API_ENDPOINTS['OBJECT']}/?identifier={object_id}"
     headers = get_headers(access_token)
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -61,7 +62,7 @@ def create_object(context, payload, access_token, request):
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.post(url, data=data, headers=headers)
+    response = send(context, "post", url, data=data, headers=headers)
     record_api_info(request, "POST", url, payload, response)
 
     return response
@@ -83,7 +84,7 @@ def delete_object(context, object_id, access_token, request):
     url = f"{API_ENDPOINTS['OBJECT']}/?identifier={object_id}"
     headers = get_headers(access_token)
 
-    response = context.delete(url, headers=headers)
+    response = send(context, "delete", url, headers=headers)
     record_api_info(request, "DELETE", url, {}, response)
 
     return response
@@ -116,7 +117,7 @@ def link_object_to_source(
         "child_identifier": object_entity["identifier"],
     }
 
-    response = context.post(url, params=params, headers=headers)
+    response = send(context, "post", url, params=params, headers=headers)
     record_api_info(request, "POST", url, params, response)
 
     return response
@@ -146,7 +147,7 @@ def config_object(
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.put(url, data=data, headers=headers)
+    response = send(context, "put", url, data=data, headers=headers)
     record_api_info(request, "PUT", url, payload, response)
 
     return response
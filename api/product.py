@@ -1,6 +1,7 @@
 import json
 
 from config import API_ENDPOINTS
+from utils.api_response import send
 from utils.common import record_api_info, get_headers
 
 
@@ -19,7 +20,7 @@ def get_all_product(context, access_token, request):
     url = API_ENDPOINTS["PRODUCT"]
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -31,7 +32,7 @@ def get_product_by_id(context, product_id, access_token, request):
     """
     url = f"{API_ENDPOINTS['PRODUCT']}/?identifier={product_id}"
     headers = get_headers(access_token)
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
     return response
 
@@ -53,7 +54,7 @@ def create_product(context, payload, access_token, request):
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.post(url, data=data, headers=headers)
+    response = send(context, "post", url, data=data, headers=headers)
     record_api_info(request, "POST", url, payload, response)
 
     return response
@@ -75,7 +76,7 @@ def delete_product(context, product_id, access_token, request):
     url = f"{API_ENDPOINTS['PRODUCT']}/?identifier={product_id}"
     headers = get_headers(access_token)
 
-    response = context.delete(url, headers=headers)
+    response = send(context, "delete", url, headers=headers)
     record_api_info(request, "DELETE", url, {}, response)
 
     return response
@@ -108,7 +109,7 @@ def link_product_to_object(
         "child_identifier": product_entity["identifier"],
     }
 
-    response = context.post(url, params=params, headers=headers)
+    response = send(context, "post", url, params=params, headers=headers)
     record_api_info(request, "POST", url, params, response)
 
     return response
@@ -141,7 +142,7 @@ def link_product_to_product(
         "child_identifier": product_child_entity["identifier"],
     }
 
-    response = context.post(url, params=params, headers=headers)
+    response = send(context, "post", url, params=params, headers=headers)
     record_api_info(request, "POST", url, params, response)
 
     return response
@@ -173,7 +174,7 @@ def create_data_product_schema(
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.put(url, data=data, headers=headers)
+    response = send(context, "put", url, data=data, headers=headers)
     record_api_info(request, "PUT", url, payload, response)
 
     return response
@@ -203,7 +204,7 @@ def create_transformation_builder(
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.put(url, data=data, headers=headers)
+    response = send(context, "put", url, data=data, headers=headers)
     record_api_info(request, "PUT", url, payload, response)
 
     return response
@@ -8,6 +8,7 @@ including creating, reading, deleting, linking, and configuring source resources
 import json
 
 from config import API_ENDPOINTS
+from utils.api_response import send
 from utils.common import record_api_info, get_headers
 
 
@@ -26,7 +27,7 @@ def get_all_source(context, access_token, request):
     url = API_ENDPOINTS["SOURCE"]
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -46,7 +47,7 @@ def get_source_by_id(context, source_id, access_token, request):
     url = f"{API_ENDPOINTS['SOURCE']}?identifier={source_id}"
     headers = get_headers(access_token)
 
-    response = context.get(url, headers=headers)
+    response = send(context, "get", url, headers=headers)
     record_api_info(request, "GET", url, {}, response)
 
     return response
@@ -69,7 +70,7 @@ def create_source(context, payload, access_token, request):
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.post(url, data=data, headers=headers)
+    response = send(context, "post", url, data=data, headers=headers)
     record_api_info(request, "POST", url, payload, response)
 
     return response
@@ -91,7 +92,7 @@ def delete_source(context, source_id, access_token, request):
     url = f"{API_ENDPOINTS['SOURCE']}/?identifier={source_id}"
     headers = get_headers(access_token)
 
-    response = context.delete(url, headers=headers)
+    response = send(context, "delete", url, headers=headers)
     record_api_info(request, "DELETE", url, {}, response)
 
     return response
@@ -124,7 +125,7 @@ def link_system_to_source(
         "child_identifier": source_entity["identifier"],
     }
 
-    response = context.post(url, params=params, headers=headers)
+    response = send(context, "post", url, params=params, headers=headers)
     record_api_info(request, "POST", url, params, response)
 
     return response
@@ -154,7 +155,7 @@ def config_connection_detail_source(
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.put(url, data=data, headers=headers)
+    response = send(context, "put", url, data=data, headers=headers)
     record_api_info(request, "PUT", url, payload, response)
 
     return response
@@ -184,7 +185,7 @@ def set_connection_secret(
     headers = get_headers(access_token)
     data = json.dumps(payload)
 
-    response = context.post(url, data=data, headers=headers)
+    response = send(context, "post", url, data=data, headers=headers)
     record_api_info(request, "POST", url, payload, response)
 
     return response
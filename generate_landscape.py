@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic landscape YAML for scale testing.
+
+The output is streamed, so large landscapes never sit in memory, e.g.:
+
+    python generate_landscape.py --systems 100 --sources-per-system 10 --objects-per-source 10 \
+        --products 1000 --fan-in 4 --chain-depth 8 --seed 42 -o /tmp/landscape-10k.yml
+    LANDSCAPE_FILE=/tmp/landscape-10k.yml pytest tests/e2e/landscape/test_landscape_bulk.py
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.landscape_synth import LandscapeShape, write_landscape  # noqa: E402
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic landscape YAML.")
+    parser.add_argument("--systems", type=int, default=10)
+    parser.add_argument("--sources-per-system", type=int, default=2)
+    parser.add_argument("--objects-per-source", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10, help="Products per chain level")
+    parser.add_argument("--fan-in", type=int, default=2, help="Inputs per product")
+    parser.add_argument("--chain-depth", type=int, default=1, help="Number of product levels")
+    parser.add_argument("--meshes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Output file (default: standard output)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Write the landscape."""
+    args = parse_args(argv)
+    try:
+        shape = LandscapeShape(
+            systems=args.systems,
+            sources_per_system=args.sources_per_system,
+            objects_per_source=args.objects_per_source,
+            products=args.products,
+            fan_in=args.fan_in,
+            chain_depth=args.chain_depth,
+            meshes=args.meshes,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 2
+
+    if not args.output:
+        write_landscape(shape, sys.stdout)
+        return 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        count = write_landscape(shape, f)
+    print(f"📝 {count} entities written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
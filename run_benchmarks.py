@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the harness hot paths against the in-process mock context.
+
+Measures the client-side cost of our own code (step dispatch, payload
+building, the entity registry, API call recording, schema and transformation
+builder steps, a whole procedure) in operations per second and bytes
+allocated per operation, stores the results in the benchmark history and
+compares them with an earlier commit, e.g.:
+
+    python run_benchmarks.py
+    python run_benchmarks.py --scale 10000 --width 200 --only builder_resolution,wide_schema
+    python run_benchmarks.py --compare 1a2b3c4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+# Add the project root and the procedure steps to the Python path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests", "e2e", "procedures"))
+
+import test_data.velora as velora  # noqa: E402
+from steps.step_types import get_step_instance  # noqa: E402
+from tests.e2e.procedures.mock_config import (  # noqa: E402
+    MockAPIConfig,
+    MockResponse,
+    create_mock_context,
+    setup_mock_responses,
+)
+from utils.common import find_entity, record_api_info, register_entity  # noqa: E402
+from utils.entity_registry import EntityRegistry  # noqa: E402
+from utils.microbench import (  # noqa: E402
+    BenchHistory,
+    Benchmark,
+    current_commit,
+    format_results,
+    run_benchmark,
+)
+from utils.procedure_executor import StepRequest  # noqa: E402
+from utils.procedure_plan import load_procedure  # noqa: E402
+
+PROCEDURE_FILE = os.path.join("test_data", "procedures", "procedure-1.py")
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the harness hot paths.")
+    parser.add_argument("--scale", type=int, default=1000, help="Operations per benchmark call")
+    parser.add_argument(
+        "--width", type=int, default=50, help="Schema fields and transformation inputs"
+    )
+    parser.add_argument("--min-time", type=float, default=1.0, help="Timed seconds per benchmark")
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument(
+        "--compare", metavar="COMMIT", help="Compare with this commit (default: the latest other)"
+    )
+    parser.add_argument("--history", help="History file (default: BENCH_HISTORY or .benchmarks/)")
+    parser.add_argument("--no-save", action="store_true", help="Do not store the results")
+    return parser.parse_args(argv)
+
+
+def mock_api_context():
+    """Return a fresh (context, access_token) pair on the mock context."""
+    config = MockAPIConfig()
+    context = create_mock_context()
+    setup_mock_responses(context, config)
+    return context, config.access_token
+
+
+def quiet(function):
+    """Run ``function(state)`` with the steps' prints sent to a buffer."""
+
+    def _run(state):
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(state)
+
+    return _run
+
+
+def registered(count, entity_type="product"):
+    """Return a registry with ``count`` entities of a type."""
+    registry = EntityRegistry()
+    for n in range(count):
+        registry.register(
+            {"id": f"{entity_type}-{n}", "identifier": f"id-{n}", "type": entity_type}
+        )
+    return registry
+
+
+def wide_schema(width):
+    """Return a product schema payload with ``width`` fields."""
+    field = {
+        "description": None,
+        "primary": False,
+        "optional": False,
+        "data_type": {"meta": {}, "column_type": "DOUBLE"},
+        "classification": "internal",
+        "sensitivity": None,
+        "tags": [],
+    }
+    fields = [{**field, "name": f"column_{n}", "primary": n == 0} for n in range(width)]
+    return {"details": {"product_type": "stored", "fields": fields}}
+
+
+def builder_step(width):
+    """Return a transformation builder step joining ``width`` input products."""
+    refs = [f"product-{n}" for n in range(width)]
+    transformations = [
+        {
+            "transform": "join_rename_select",
+            "input_ref": left,
+            "other_ref": right,
+            "output": f"joined_{n}",
+            "join": "inner",
+            "conditions": [{"left": "report_id", "operator": "eq", "right": "report_id"}],
+            "select_all_columns": True,
+        }
+        for n, (left, right) in enumerate(zip(refs, refs[1:] + refs[:1]))
+    ]
+    return {
+        "type": "apply_product_transformation",
+        "input": {
+            "product_ref": "product-0",
+            "transformations": {
+                "config": {"docker_tag": "0.0.23", "executor_instances": 1},
+                "input_refs": refs,
+                "transformations": transformations,
+            },
+        },
+    }
+
+
+def benchmarks(scale, width):
+    """Return the benchmarks, by name."""
+    plan = load_procedure(PROCEDURE_FILE)
+    steps = plan.steps
+    api_context = mock_api_context()
+    request = StepRequest("benchmark")
+    factories = [
+        getattr(velora, name) for name in sorted(dir(velora)) if name.endswith("_payload")
+    ]
+    entities = [
+        {"id": f"entity-{n}", "identifier": f"id-{n}", "type": "object"} for n in range(scale)
+    ]
+    lookups = registered(scale, "object")
+    ids = lookups.ids()
+    response = MockResponse(201, {"entity": {"identifier": "id-0"}})
+    payload = velora.create_product_excavation_payload()
+    builder_inputs = registered(max(width, 1))
+    steps_per_round = max(1, scale // len(steps))
+
+    def dispatch(_):
+        for n in range(scale):
+            get_step_instance(request, steps[n % len(steps)], api_context, lookups)
+
+    def build_payloads(_):
+        for _ in range(max(1, scale // len(factories))):
+            for factory in factories:
+                factory()
+
+    def register(registry):
+        for entity in entities:
+            register_entity(registry, entity)
+
+    def find(_):
+        for entity_id in ids:
+            find_entity(lookups, entity_id)
+
+    def record(node_request):
+        for _ in range(scale):
+            record_api_info(node_request, "POST", "/api/data/product", payload, response)
+
+    def execute_steps(state):
+        registry, step_list = state
+        for step in step_list:
+            get_step_instance(request, step, api_context, registry).execute()
+
+    def run_procedures(forks):
+        for fork, registry, context in forks:
+            for step in fork.steps:
+                get_step_instance(request, step, context, registry).execute()
+
+    schema_step = {"type": "define_product_schema", "ref": "product-0", "input": wide_schema(width)}
+    schema_count = max(1, scale // 10)
+    builder_count = max(1, scale // 10)
+
+    return {
+        "step_dispatch": Benchmark("step_dispatch", dispatch, ops=scale),
+        "payload_build": Benchmark(
+            "payload_build",
+            build_payloads,
+            ops=max(1, scale // len(factories)) * len(factories),
+        ),
+        "registry_register": Benchmark(
+            "registry_register", register, setup=EntityRegistry, ops=scale
+        ),
+        "registry_find": Benchmark("registry_find", find, ops=scale),
+        "record_api_info": Benchmark(
+            "record_api_info", record, setup=lambda: StepRequest("benchmark"), ops=scale
+        ),
+        "wide_schema": Benchmark(
+            "wide_schema",
+            quiet(execute_steps),
+            setup=lambda: (builder_inputs, [schema_step] * schema_count),
+            ops=schema_count,
+        ),
+        # The builder step consumes its input: every call gets fresh steps
+        "builder_resolution": Benchmark(
+            "builder_resolution",
+            quiet(execute_steps),
+            setup=lambda: (builder_inputs, [builder_step(width) for _ in range(builder_count)]),
+            ops=builder_count,
+        ),
+        "procedure_run": Benchmark(
+            "procedure_run",
+            quiet(run_procedures),
+            setup=lambda: [
+                (plan.fork(), EntityRegistry(), mock_api_context()) for _ in range(steps_per_round)
+            ],
+            ops=steps_per_round * len(steps),
+        ),
+    }
+
+
+def main(argv=None):
+    """Run the benchmarks, store and compare the results."""
+    args = parse_args(argv)
+    selected = benchmarks(args.scale, args.width)
+    if args.only:
+        names = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in names if name not in selected]
+        if unknown:
+            print(f"❌ Unknown benchmarks: {', '.join(unknown)} (among {', '.join(selected)})")
+            return 2
+        selected = {name: selected[name] for name in names}
+
+    commit = current_commit()
+    print(f"⏱️ Harness benchmarks at {commit}: scale {args.scale}, width {args.width}")
+    results = []
+    for benchmark in selected.values():
+        results.append(run_benchmark(benchmark, min_time=args.min_time))
+        print(f"  {benchmark.name}: {results[-1].median_ops_per_sec:,.0f} ops/s")
+
+    history = BenchHistory(args.history)
+    baseline = history.baseline(args.compare, exclude=None if args.compare else commit)
+    if args.compare and baseline is None:
+        print(f"⚠️ No stored run for commit {args.compare}")
+    print()
+    print(format_results(results, baseline))
+    if not args.no_save:
+        history.append(results, commit, scale=args.scale, width=args.width)
+        print(f"\n📝 Results stored in {history.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
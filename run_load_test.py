@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test runner for procedures.
+
+Replays a procedure with concurrent virtual users and prints throughput and
+latency per step type, e.g.:
+
+    python run_load_test.py test_data/procedures/procedure-1.py --users 20 --ramp-up 30 --duration 300
+    python run_load_test.py --mock --users 4 --duration 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Add the project root and the procedure steps to the Python path
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests", "e2e", "procedures"))
+
+from steps.step_types import get_step_instance  # noqa: E402
+from utils.api_pool import ApiContextPool  # noqa: E402
+from utils.latency import LATENCY  # noqa: E402
+from utils.load_runner import LoadRunner  # noqa: E402
+from utils.mock_server import start_from_env  # noqa: E402
+from utils.procedure_plan import load_procedure  # noqa: E402
+from utils.teardown import teardown_tracked  # noqa: E402
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Run a procedure with concurrent virtual users.")
+    parser.add_argument(
+        "procedure", nargs="?", default="test_data/procedures/procedure-1.py", help="Procedure file"
+    )
+    parser.add_argument("--users", type=int, default=int(os.getenv("LOAD_USERS", "10")))
+    parser.add_argument(
+        "--ramp-up", type=float, default=float(os.getenv("LOAD_RAMP_UP", "0")), help="Seconds"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=float(os.getenv("LOAD_DURATION", "60")), help="Seconds"
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=float(os.getenv("LOAD_THINK_TIME", "0")), help="Seconds"
+    )
+    parser.add_argument("--mock", action="store_true", help="Use the mocked API context")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show step output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the load test."""
+    load_dotenv()
+    args = parse_args(argv)
+    # MOCK_SERVER=1 points API_URL at an in-process mock server
+    start_from_env()
+    plan = load_procedure(args.procedure)
+
+    pool = None
+    if args.mock:
+        from tests.e2e.procedures.mock_config import (
+            create_mock_context,
+            mock_config,
+            setup_mock_responses,
+        )
+
+        mock_context = create_mock_context()
+        setup_mock_responses(mock_context, mock_config)
+
+        def context_factory():
+            return mock_context, mock_config.access_token
+
+        context_release = None
+    else:
+        # One connection per user unless API_MAX_CONNECTIONS caps it explicitly
+        os.environ.setdefault("API_MAX_CONNECTIONS", str(args.users))
+        pool = ApiContextPool.from_env()
+        access_token = pool.access_token()
+        if not access_token:
+            print("❌ Login failed, no access token.")
+            return 1
+
+        def context_factory():
+            return pool.context(), access_token
+
+        context_release = pool.release
+
+    runner = LoadRunner(
+        plan,
+        get_step_instance,
+        context_factory,
+        users=args.users,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        think_time=args.think_time,
+        context_release=context_release,
+    )
+    print(
+        f"🚀 {args.users} virtual users on {args.procedure} "
+        f"(ramp-up {args.ramp_up:g}s, duration {args.duration:g}s, run {runner.run_id})"
+    )
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        report = runner.run()
+    if pool is not None:
+        pool.close()
+        # Delete what the virtual users created (TEARDOWN=0 keeps it)
+        teardown_tracked(access_token)
+
+    print("=" * 50)
+    print(report.format())
+    latency = LATENCY.format_summary()
+    if latency:
+        print()
+        print(latency)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"📝 Report written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
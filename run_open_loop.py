@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the create_* endpoints.
+
+Sends create requests at fixed target rates, one stage per rate, and prints
+coordinated-omission-corrected latencies per target, e.g.:
+
+    python run_open_loop.py --rates 5,10,20,40 --duration 60
+    python run_open_loop.py --targets mesh,product --rates 50 --duration 30 --json open-loop.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api.aio.client import async_api_context, run_async  # noqa: E402
+from utils.api_pool import ApiContextPool  # noqa: E402
+from utils.mock_server import start_from_env  # noqa: E402
+from utils.open_loop import TARGETS, OpenLoopGenerator  # noqa: E402
+from utils.teardown import teardown_tracked  # noqa: E402
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Drive create_* endpoints at fixed rates.")
+    parser.add_argument(
+        "--targets", default=",".join(TARGETS), help=f"Comma-separated, among {', '.join(TARGETS)}"
+    )
+    parser.add_argument(
+        "--rates", default="10", help="Comma-separated requests per second, one stage each"
+    )
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per stage")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("OPEN_LOOP_MAX_CONCURRENCY", "256")),
+        help="Maximum requests in flight (waiting for a slot counts as latency)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the reports to this file")
+    return parser.parse_args(argv)
+
+
+async def run_stages(base_url, access_token, targets, rates, duration, max_concurrency):
+    """Run one open-loop stage per rate on a single async request context."""
+    reports = []
+    async with async_api_context(base_url, max_concurrency) as context:
+        generator = OpenLoopGenerator(context, access_token, targets)
+        for rate in rates:
+            report = await generator.run(rate, duration)
+            print(report.format())
+            print()
+            reports.append(report)
+    return reports
+
+
+def main(argv=None):
+    """Run the open-loop stages."""
+    load_dotenv()
+    args = parse_args(argv)
+    # MOCK_SERVER=1 points API_URL at an in-process mock server
+    start_from_env()
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    rates = [float(rate) for rate in args.rates.split(",")]
+
+    pool = ApiContextPool.from_env()
+    access_token = pool.access_token()
+    pool.close()
+    if not access_token:
+        print("❌ Login failed, no access token.")
+        return 1
+
+    print(
+        f"🚀 Open loop on {', '.join(targets)} at {args.rates} req/s, "
+        f"{args.duration:g}s per stage"
+    )
+    print("=" * 50)
+    reports = run_async(
+        run_stages(pool.base_url, access_token, targets, rates, args.duration, args.max_concurrency)
+    )
+    # Delete what the stages created (TEARDOWN=0 keeps it)
+    teardown_tracked(access_token)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([report.to_dict() for report in reports], f, indent=2)
+        print(f"📝 Reports written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,8 +11,17 @@ from typing import Any, Dict, List
 
 import pytest
 from dotenv import load_dotenv
+from playwright.sync_api import Playwright
 import requests
 
+from utils.api_pool import ApiContextPool
+from utils.api_recorder import format_calls
+from utils.api_trace import close_sink, trace_context
+from utils.cassette import close_cassette
+from utils.latency import LATENCY
+from utils.mock_server import start_from_env
+from utils.teardown import teardown_tracked
+
 # Load environment variables
 load_dotenv()
 
@@ -21,6 +30,96 @@ WEBHOOK_URL = os.getenv("WEB_HOOK_GLUE", "")
 TARGET_WEBHOOK = os.getenv("ID_GROUP_GLUE", "")
 
 
+@pytest.fixture(scope="session")
+def shared_tmp_dir(tmp_path_factory: pytest.TempPathFactory, worker_id: str) -> str:
+    """
+    Return a temporary directory shared by every xdist worker of the run.
+
+    Args:
+        tmp_path_factory: The pytest temporary path factory
+        worker_id: The xdist worker id ("master" when not distributed)
+
+    Returns:
+        The directory path
+    """
+    base = tmp_path_factory.getbasetemp()
+    return str(base if worker_id == "master" else base.parent)
+
+
+@pytest.fixture(scope="session")
+def api_pool(playwright: Playwright) -> Any:
+    """
+    Provide the worker's pooled API request contexts.
+
+    Args:
+        playwright: The Playwright instance
+
+    Yields:
+        The ApiContextPool shared by every suite of this worker
+    """
+    pool = ApiContextPool.from_env(playwright)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def api_context(api_pool: ApiContextPool) -> Any:
+    """
+    Provide the shared API request context and access token.
+
+    Args:
+        api_pool: The worker's API context pool
+
+    Returns:
+        Tuple of (context, access_token)
+    """
+    context = api_pool.context()
+    access_token = api_pool.access_token()
+    if not access_token:
+        print("⚠️ Warning: No API token available. Tests requiring authentication will fail.")
+    return context, access_token
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """
+    Register the command line options of the suite.
+
+    Args:
+        parser: The pytest option parser
+    """
+    parser.addoption(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume a procedure run from its checkpoint (see utils.procedure_checkpoint)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Start the local mock API server when ``MOCK_SERVER`` is set.
+
+    Only the controller starts it; xdist workers inherit its ``API_URL``.
+
+    Args:
+        config: The pytest config object
+    """
+    if not hasattr(config, "workerinput"):
+        config._mock_server = start_from_env()  # type: ignore
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """
+    Stop the local mock API server, if any.
+
+    Args:
+        config: The pytest config object
+    """
+    server = getattr(config, "_mock_server", None)
+    if server is not None:
+        server.stop()
+
+
 def pytest_sessionstart(session: pytest.Session) -> None:
     """
     Initialize test session results tracking.
@@ -39,6 +138,24 @@ def pytest_sessionstart(session: pytest.Session) -> None:
     }
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Any) -> Any:
+    """
+    Tag the API calls of a test (setup, call and teardown) for the JSONL trace.
+
+    Args:
+        item: The test item being executed
+        nextitem: The next test item
+
+    Yields:
+        Control to the test protocol
+    """
+    step = getattr(item, "callspec", None) and item.callspec.params.get("step")
+    step_type = step.get("type") if hasattr(step, "get") else None
+    with trace_context(item.nodeid, step_type):
+        yield
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo) -> Any:
     """
@@ -61,11 +178,16 @@ def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo) -> Any:
 
         if rep.passed:
             results["passed"] += 1
+            # Recorded calls are only needed to report failures
+            item._api_calls = None
         elif rep.failed:
             results["failed"] += 1
 
-            # Get API information from test item
+            # Get API information from test item (decoded only now, on failure)
             api_info = getattr(item, "_api_info", {})
+            api_calls = format_calls(item)
+            if api_calls:
+                rep.sections.append(("Recorded API calls", api_calls))
 
             results["failures"].append(
                 {
@@ -91,6 +213,18 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus: pytest.ExitCode) -
     end_time = datetime.now()
     start_time = results["start_time"]
 
+    # Delete what the session created and did not clean up (TEARDOWN=0 keeps it)
+    teardown_tracked()
+
+    # xdist workers hand their latency histograms to the controller
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency"] = LATENCY.snapshot()
+
+    # Write the remaining API trace records and the recorded cassette
+    close_sink()
+    close_cassette()
+
     # Generate test summary
     summary = _generate_test_summary(results, start_time, end_time)
 
@@ -101,6 +235,30 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus: pytest.ExitCode) -
     _send_webhook_notification(payload)
 
 
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    """
+    Merge the latency histograms of a finished xdist worker.
+
+    Args:
+        node: The worker node
+        error: The worker error, if it crashed
+    """
+    LATENCY.merge(getattr(node, "workeroutput", {}).get("latency", []))
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    """
+    Print the per-endpoint latency table at the end of the run.
+
+    Args:
+        terminalreporter: The terminal reporter plugin
+    """
+    latency = LATENCY.format_summary()
+    if latency:
+        terminalreporter.write_sep("=", "API latency")
+        terminalreporter.write_line(latency)
+
+
 def _generate_test_summary(
     results: Dict[str, Any], start_time: datetime, end_time: datetime
 ) -> str:
@@ -126,6 +284,10 @@ def _generate_test_summary(
         f"- ⏱ Duration: {round(results['duration'], 2)}s"
     )
 
+    latency = LATENCY.format_summary()
+    if latency:
+        summary += f"\n\n{latency}"
+
     # Add failure details if any
     if results["failures"]:
         summary += "\n\n🚨 **Failures Details:**\n"
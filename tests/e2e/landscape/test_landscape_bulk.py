@@ -0,0 +1,51 @@
+"""
+Bulk landscape build.
+
+Stands up a whole landscape through the async bulk API: every section is
+created concurrently, then links and configuration are applied in batches.
+Opt-in with ``LANDSCAPE_BULK=1``.
+"""
+
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+from api.aio.auth import login_token
+from api.aio.bulk import build_landscape
+from api.aio.client import async_api_context, run_async
+from utils.common import record_api_info
+from utils.landscape import load_landscape
+from utils.token_cache import TokenCache
+
+load_dotenv()
+
+LANDSCAPE_FILE = os.getenv("LANDSCAPE_FILE", "test_data/landscapes/landscape-4.yml")
+landscape_config = load_landscape(LANDSCAPE_FILE)
+
+BASE_URL = os.getenv("API_URL", "http://localhost:8000")
+USERNAME = os.getenv("QA_USERNAME", "")
+PASSWORD = os.getenv("QA_PASSWORD", "")
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "8"))
+BULK = os.getenv("LANDSCAPE_BULK", "").lower() in ("1", "true", "yes")
+
+
+@pytest.mark.skipif(not BULK, reason="Set LANDSCAPE_BULK=1 to build the landscape in bulk")
+def test_bulk_build_landscape(request):
+    async def _build():
+        async with async_api_context(BASE_URL, BULK_CONCURRENCY) as context:
+            access_token = await TokenCache.access_token(
+                lambda: login_token(context, {"user": USERNAME, "password": PASSWORD})
+            )
+            if not access_token:
+                return None
+            return await build_landscape(
+                context, landscape_config, access_token, request, BULK_CONCURRENCY
+            )
+
+    id_map = run_async(_build())
+    if id_map is None:
+        record_api_info(request, "POST", "/api/iam/login", {"user": USERNAME}, "Login failed")
+        pytest.fail("Login failed - no access token")
+
+    assert set(landscape_config.entities) == set(id_map.ids())
@@ -1,10 +1,9 @@
 import os
 import pytest
 from dotenv import load_dotenv
-from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
 import json
 
-from utils.load_config import load_config
+from utils.landscape import load_landscape
 from test_data.shared.mesh_payload import create_mesh_payload
 from test_data.shared.system_payload import create_system_payload
 from test_data.shared.source_payload import create_source_payload
@@ -12,50 +11,86 @@ from test_data.shared.object_payload import create_object_payload, configure_obj
 from test_data.shared.product_payload import create_product_payload
 from test_data.shared.connection_source_payload import create_connection_source_payload
 from test_data.shared.schema_product_payload import schema_product_create_payload
+from api.source import get_source_by_id
+from api.object import get_object_by_id
+from api.product import get_product_by_id
+from utils.api_response import send
+from utils.common import find_entity, record_api_info, register_entity
+from utils.compute_poller import compute_identifiers_of, wait_for_computes
+from utils.compute_simulator import time_functions
+from utils.entity_registry import create_registry
+from utils.landscape_reconcile import (
+    fetch_details,
+    fetch_state,
+    landscape_key,
+    links_path,
+    plan_reconcile,
+    reconcile_enabled,
+)
+from utils.teardown import keep_after_teardown
 
 
 load_dotenv()
 
-landscape_config = load_config("test_data/landscapes/landscape-4.yml")
+LANDSCAPE_FILE = "test_data/landscapes/landscape-4.yml"
+landscape_config = load_landscape(LANDSCAPE_FILE)
 
-BASE_URL = os.getenv("API_URL", "http://localhost:8000")
 USERNAME = os.getenv("QA_USERNAME", "")
 PASSWORD = os.getenv("QA_PASSWORD", "")
 X_ACCOUNT = os.getenv("X_ACCOUNT", "")
+# Wait for every source/object/product compute at the end of the landscape build
+WAIT_FOR_COMPUTE = os.getenv("LANDSCAPE_WAIT_COMPUTE", "").lower() in ("1", "true", "yes")
+# Reuse the entities of a previous run and only create what is missing
+RECONCILE = reconcile_enabled()
 
 
 
 @pytest.fixture(scope="session")
-def api_context(playwright: Playwright):
-    """Create API request context and get access token"""
-    context = playwright.request.new_context(base_url=BASE_URL)
-    login_payload = {"user": USERNAME, "password": PASSWORD}
-    access_token = None
-    try:
-        response = context.post("/api/iam/login", data=json.dumps(login_payload), headers={"Content-Type": "application/json"})
-        access_token = response.json().get("access_token")
-    except PlaywrightTimeoutError:
-        context.dispose()
-        access_token = None
-    except Exception as e:
-        context.dispose()
-        access_token = None
-
-    yield context, access_token
-    context.dispose()
-
-
-@pytest.fixture(scope="session")
-def id_map():
-    return []
+def id_map(shared_tmp_dir):
+    return create_registry(shared_tmp_dir, "landscape")
 
 
-def register_entity(id_map, entity):
-    id_map.append(entity)
-
-
-def find_entity(id_map, entity_id):
-    return next((item for item in id_map if item['id'] == entity_id), None)
+@pytest.fixture(scope="module")
+def reconcile_plan(api_context, request):
+    if not RECONCILE:
+        yield None
+        return
+    context, access_token = api_context
+    skip_if_no_token(access_token)
+    key = landscape_key(LANDSCAPE_FILE)
+    state = fetch_state(context, access_token, request)
+    plan = plan_reconcile(landscape_config, key, state, links_path(key))
+    plan.details = fetch_details(context, access_token, request, plan)
+    print(plan.summary())
+    if plan.warning():
+        print(f"⚠️ {plan.warning()}")
+    yield plan
+    plan.save_links()
+
+
+def landscape_payload(plan, item, payload):
+    """Give the entity its stable name in reconcile mode."""
+    if plan:
+        payload["entity"]["name"] = plan.name(item["id"])
+    return payload
+
+
+def reuse_existing(plan, id_map, item, entity_type):
+    """Register the existing entity of ``item`` in reconcile mode; return whether there is one."""
+    identifier = plan.identifier(item["id"]) if plan else None
+    if identifier is None:
+        return False
+    print(f"♻️ Reusing {entity_type} {item['id']}: {identifier}")
+    register_entity(id_map, {"id": item["id"], "identifier": identifier, "type": entity_type})
+    return True
+
+
+def register_created(plan, id_map, item, entity_type, identifier):
+    """Register a created entity; in reconcile mode it is also kept after the session."""
+    register_entity(id_map, {"id": item["id"], "identifier": identifier, "type": entity_type})
+    if plan:
+        # A reconciled landscape outlives the session
+        keep_after_teardown({entity_type: [identifier]})
 
 
 def get_headers(token):
@@ -70,15 +105,6 @@ def skip_if_no_token(access_token):
         pytest.skip("Skipping test: Access token not found")
 
 
-def record_api_info(request, method, url, payload, response):
-    request.node._api_info = {
-        "method": method,
-        "url": url,
-        "payload": payload,
-        "response": response.json() if response else None
-    }
-
-
 def assert_success_response(response):
     try:
         if not response.ok:
@@ -119,54 +145,50 @@ def test_login_api(api_context, request):
         }
         assert access_token is not None
 
-@pytest.mark.parametrize("mesh", landscape_config["mesh"], ids=[m["id"] for m in landscape_config["mesh"]])
-def test_create_mesh(api_context, id_map, request, mesh):
+@pytest.mark.parametrize("mesh", landscape_config["mesh"], ids=landscape_config.ids("mesh"))
+def test_create_mesh(api_context, id_map, reconcile_plan, request, mesh):
     context, access_token = api_context
     skip_if_no_token(access_token)
-    payload = create_mesh_payload(mesh.get("name"))
-    response = context.post('/api/data/mesh', data=json.dumps(payload), headers=get_headers(access_token))
+    if reuse_existing(reconcile_plan, id_map, mesh, "mesh"):
+        return
+    payload = landscape_payload(reconcile_plan, mesh, create_mesh_payload(mesh.get("name")))
+    response = send(context, "post", '/api/data/mesh', data=json.dumps(payload), headers=get_headers(access_token))
     record_api_info(request, "POST", "/api/data/mesh", payload, response)
     mesh_id = assert_entity_created(response)
     print(mesh_id)
-    register_entity(id_map, {
-        "id": mesh["id"],
-        "identifier": mesh_id,
-        "type": "mesh"
-    })
-
-@pytest.mark.parametrize("system", landscape_config["systems"], ids=[s["id"] for s in landscape_config["systems"]])
-def test_create_system(api_context, id_map, request, system):
+    register_created(reconcile_plan, id_map, mesh, "mesh", mesh_id)
+
+@pytest.mark.parametrize("system", landscape_config["systems"], ids=landscape_config.ids("systems"))
+def test_create_system(api_context, id_map, reconcile_plan, request, system):
     context, access_token = api_context
     skip_if_no_token(access_token)
-    payload = create_system_payload(system.get("name"))
-    response = context.post('/api/data/data_system', data=json.dumps(payload), headers=get_headers(access_token))
+    if reuse_existing(reconcile_plan, id_map, system, "system"):
+        return
+    payload = landscape_payload(reconcile_plan, system, create_system_payload(system.get("name")))
+    response = send(context, "post", '/api/data/data_system', data=json.dumps(payload), headers=get_headers(access_token))
     record_api_info(request, "POST", "/api/data/data_system", payload, response)
     system_id = response.json()['identifier']
     assert system_id is not None, "System ID is missing"
-    register_entity(id_map, {
-        "id": system["id"],
-        "identifier": system_id,
-        "type": "system"
-    })
-
-@pytest.mark.parametrize("source", landscape_config["sources"], ids=[s["id"] for s in landscape_config["sources"]])
-def test_create_source(api_context, id_map, request, source):
+    register_created(reconcile_plan, id_map, system, "system", system_id)
+
+@pytest.mark.parametrize("source", landscape_config["sources"], ids=landscape_config.ids("sources"))
+def test_create_source(api_context, id_map, reconcile_plan, request, source):
     context, access_token = api_context
     skip_if_no_token(access_token)
-    payload = create_source_payload(source.get("name"))
-    response = context.post('/api/data/origin', data=json.dumps(payload), headers=get_headers(access_token))
+    if reuse_existing(reconcile_plan, id_map, source, "source"):
+        return
+    payload = landscape_payload(reconcile_plan, source, create_source_payload(source.get("name")))
+    response = send(context, "post", '/api/data/origin', data=json.dumps(payload), headers=get_headers(access_token))
     record_api_info(request, "POST", "/api/data/origin", payload, response)
     source_id = assert_entity_created(response)
-    register_entity(id_map, {
-        "id": source["id"],
-        "identifier": source_id,
-        "type": "source"
-    })
+    register_created(reconcile_plan, id_map, source, "source", source_id)
 
 @pytest.mark.parametrize("source", landscape_config["sources"], ids=[f"{source['system']} to {source['id']}" for source in landscape_config["sources"]])
-def test_link_system_to_source(api_context, id_map, request, source):
+def test_link_system_to_source(api_context, id_map, reconcile_plan, request, source):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    if reconcile_plan and not reconcile_plan.needs_link(source["system"], source["id"]):
+        return
     source_entity = find_entity(id_map, source["id"])
     system_entity = find_entity(id_map, source["system"])
     print("identifier:", system_entity["identifier"])
@@ -176,60 +198,70 @@ def test_link_system_to_source(api_context, id_map, request, source):
             "identifier": system_entity["identifier"],
             "child_identifier": source_entity["identifier"],
         }
-        response = context.post(
+        response = send(
+            context,
+            "post",
             '/api/data/link/data_system/origin',
             params=params,
             headers=get_headers(access_token)
         )
         record_api_info(request, "POST", "/api/data/link/data_system/origin", params, response)
         assert_success_response(response)
+        if reconcile_plan:
+            reconcile_plan.link_applied(params["identifier"], params["child_identifier"])
 
 
-@pytest.mark.parametrize("source", landscape_config["sources"], ids=[f"{source['id']}" for source in landscape_config["sources"]])
-def test_configure_connection_details(api_context, id_map, request, source):
+@pytest.mark.parametrize("source", landscape_config["sources"], ids=landscape_config.ids("sources"))
+def test_configure_connection_details(api_context, id_map, reconcile_plan, request, source):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    payload = create_connection_source_payload()
+    if reconcile_plan and not reconcile_plan.needs_config(source["id"], "connection", payload):
+        return
     source_entity = find_entity(id_map, source["id"])
     if source_entity:
-        payload = create_connection_source_payload()
         url = f'/api/data/origin/connection?identifier={source_entity["identifier"]}'
-        response = context.put(url, data=json.dumps(payload), headers=get_headers(access_token))
+        response = send(context, "put", url, data=json.dumps(payload), headers=get_headers(access_token))
         record_api_info(request, "PUT", url, payload, response)
         assert_success_response(response)
+        if reconcile_plan:
+            reconcile_plan.config_applied(source["id"])
 
-@pytest.mark.parametrize("source", landscape_config["sources"], ids=[f"{source['id']}" for source in landscape_config["sources"]])
-def test_set_connection_secrets(api_context, id_map, request, source):
+@pytest.mark.parametrize("source", landscape_config["sources"], ids=landscape_config.ids("sources"))
+def test_set_connection_secrets(api_context, id_map, reconcile_plan, request, source):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    payload = {
+        "access_key": os.getenv("S3_ACCESS_KEY", ""),
+        "access_secret": os.getenv("S3_SECRET_KEY", ""),
+    }
+    if reconcile_plan and not reconcile_plan.needs_secrets(source["id"], payload):
+        return
     source_entity = find_entity(id_map, source["id"])
     if source_entity:
-        payload = {
-            "access_key": os.getenv("S3_ACCESS_KEY", ""),
-            "access_secret": os.getenv("S3_SECRET_KEY", ""),
-        }
         url = f'/api/data/origin/secret?identifier={source_entity["identifier"]}'
-        response = context.post(url, data=json.dumps(payload), headers=get_headers(access_token))
+        response = send(context, "post", url, data=json.dumps(payload), headers=get_headers(access_token))
         record_api_info(request, "POST", url, payload, response)
         assert_success_response(response)
 
-@pytest.mark.parametrize("object", landscape_config["objects"], ids=[o["id"] for o in landscape_config["objects"]])
-def test_create_object(api_context, id_map, request, object):
+@pytest.mark.parametrize("object", landscape_config["objects"], ids=landscape_config.ids("objects"))
+def test_create_object(api_context, id_map, reconcile_plan, request, object):
     context, access_token = api_context
     skip_if_no_token(access_token)
-    payload = create_object_payload(object.get("name"))
-    response = context.post('/api/data/resource', data=json.dumps(payload), headers=get_headers(access_token))
+    if reuse_existing(reconcile_plan, id_map, object, "object"):
+        return
+    payload = landscape_payload(reconcile_plan, object, create_object_payload(object.get("name")))
+    response = send(context, "post", '/api/data/resource', data=json.dumps(payload), headers=get_headers(access_token))
     record_api_info(request, "POST", "/api/data/resource", payload, response)
     object_id = assert_entity_created(response)
-    register_entity(id_map, {
-        "id": object["id"],
-        "identifier": object_id,
-        "type": "object"
-    })
+    register_created(reconcile_plan, id_map, object, "object", object_id)
 
 @pytest.mark.parametrize("object", landscape_config["objects"], ids=[f"{object['source']} to {object['id']}" for object in landscape_config["objects"]])
-def test_link_object_to_source(api_context, id_map, request, object):
+def test_link_object_to_source(api_context, id_map, reconcile_plan, request, object):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    if reconcile_plan and not reconcile_plan.needs_link(object["source"], object["id"]):
+        return
     object_entity = find_entity(id_map, object["id"])
     source_entity = find_entity(id_map, object["source"])
     if object_entity and source_entity:
@@ -237,44 +269,52 @@ def test_link_object_to_source(api_context, id_map, request, object):
             "identifier": source_entity["identifier"],
             "child_identifier": object_entity["identifier"],
         }
-        response = context.post('/api/data/link/origin/resource', params=params, headers=get_headers(access_token))
+        response = send(context, "post", '/api/data/link/origin/resource', params=params, headers=get_headers(access_token))
         record_api_info(request, "POST", "/api/data/link/origin/resource", params, response)
         assert_success_response(response)
+        if reconcile_plan:
+            reconcile_plan.link_applied(params["identifier"], params["child_identifier"])
 
-@pytest.mark.parametrize("object", landscape_config["objects"], ids=[f"{object['id']}" for object in landscape_config["objects"]])
-def test_configure_object_details(api_context, id_map, request, object):
+@pytest.mark.parametrize("object", landscape_config["objects"], ids=landscape_config.ids("objects"))
+def test_configure_object_details(api_context, id_map, reconcile_plan, request, object):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    payload = configure_object_payload()
+    if reconcile_plan and not reconcile_plan.needs_config(object["id"], "config", payload):
+        return
     object_entity = find_entity(id_map, object["id"])
     if object_entity:
-        payload = configure_object_payload()
         url = f'/api/data/resource/config?identifier={object_entity["identifier"]}'
-        response = context.put(url, data=json.dumps(payload), headers=get_headers(access_token))
+        response = send(context, "put", url, data=json.dumps(payload), headers=get_headers(access_token))
         record_api_info(request, "PUT", url, payload, response)
         assert_success_response(response)
+        if reconcile_plan:
+            reconcile_plan.config_applied(object["id"])
 
-@pytest.mark.parametrize("product", landscape_config["products"], ids=[product["id"] for product in landscape_config["products"]])
-def test_create_product(api_context, id_map, request, product):
+@pytest.mark.parametrize("product", landscape_config["products"], ids=landscape_config.ids("products"))
+def test_create_product(api_context, id_map, reconcile_plan, request, product):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    if reuse_existing(reconcile_plan, id_map, product, "product"):
+        return
     mesh = find_entity(id_map, product["mesh"])
-    payload = create_product_payload(mesh["identifier"], product.get("name"))
-    response = context.post('/api/data/product', data=json.dumps(payload), headers=get_headers(access_token))
+    payload = landscape_payload(
+        reconcile_plan, product, create_product_payload(mesh["identifier"], product.get("name"))
+    )
+    response = send(context, "post", '/api/data/product', data=json.dumps(payload), headers=get_headers(access_token))
     record_api_info(request, "POST", "/api/data/product", payload, response)
     product_id = assert_entity_created(response)
-    register_entity(id_map, {
-        "id": product["id"],
-        "identifier": product_id,
-        "type": "product"
-    })
+    register_created(reconcile_plan, id_map, product, "product", product_id)
 
 
-@pytest.mark.parametrize("product", landscape_config["products"], ids=[f"{product['id']}" for product in landscape_config["products"]])
-def test_link_inputs_to_product(api_context, id_map, request, product):
+@pytest.mark.parametrize("product", landscape_config["products"], ids=landscape_config.ids("products"))
+def test_link_inputs_to_product(api_context, id_map, reconcile_plan, request, product):
     context, access_token = api_context
     skip_if_no_token(access_token)
     product_entity = find_entity(id_map, product["id"])
     for input in product["input"]:
+        if reconcile_plan and not reconcile_plan.needs_link(input, product["id"]):
+            continue
         entity = find_entity(id_map, input)
         if entity and product_entity:
             if "obj" in input:
@@ -282,26 +322,61 @@ def test_link_inputs_to_product(api_context, id_map, request, product):
                     "identifier": entity["identifier"],
                     "child_identifier": product_entity["identifier"],
                 }
-                response = context.post('/api/data/link/resource/product', params = params, headers=get_headers(access_token))
+                response = send(context, "post", '/api/data/link/resource/product', params = params, headers=get_headers(access_token))
                 record_api_info(request, "POST", "/api/data/link/resource/product", params, response)
                 assert_success_response(response)
+                if reconcile_plan:
+                    reconcile_plan.link_applied(params["identifier"], params["child_identifier"])
             elif "prod" in input:
                 params = {
                     "identifier": entity["identifier"],
                     "child_identifier": product_entity["identifier"],
                 }
-                response = context.post('/api/data/link/product/product', params = params, headers=get_headers(access_token))
+                response = send(context, "post", '/api/data/link/product/product', params = params, headers=get_headers(access_token))
                 record_api_info(request, "POST", "/api/data/link/product/product", params, response)
                 assert_success_response(response)
+                if reconcile_plan:
+                    reconcile_plan.link_applied(params["identifier"], params["child_identifier"])
 
-@pytest.mark.parametrize("product", landscape_config["products"], ids=[f"{product['id']}" for product in landscape_config["products"]])
-def test_create_data_product_schema(api_context, id_map, request, product):
+@pytest.mark.parametrize("product", landscape_config["products"], ids=landscape_config.ids("products"))
+def test_create_data_product_schema(api_context, id_map, reconcile_plan, request, product):
     context, access_token = api_context
     skip_if_no_token(access_token)
+    payload = schema_product_create_payload()
+    if reconcile_plan and not reconcile_plan.needs_config(product["id"], "schema", payload):
+        return
     product_entity = find_entity(id_map, product["id"])
     if product_entity:
-        payload = schema_product_create_payload()
         url = f'/api/data/product/schema?identifier={product_entity["identifier"]}'
-        response = context.put(url, data=json.dumps(payload), headers=get_headers(access_token))
+        response = send(context, "put", url, data=json.dumps(payload), headers=get_headers(access_token))
         record_api_info(request, "PUT", url, payload, response)
         assert_success_response(response)
+        if reconcile_plan:
+            reconcile_plan.config_applied(product["id"])
+
+
+@pytest.mark.skipif(not WAIT_FOR_COMPUTE, reason="Set LANDSCAPE_WAIT_COMPUTE=1 to wait for computes")
+def test_wait_for_computes(api_context, id_map, reconcile_plan, request):
+    context, access_token = api_context
+    skip_if_no_token(access_token)
+    fetchers = {"source": get_source_by_id, "object": get_object_by_id, "product": get_product_by_id}
+    details = []
+    for entity_type, fetch in fetchers.items():
+        for entity in id_map.of_type(entity_type):
+            if reconcile_plan and reconcile_plan.is_settled(entity["id"]):
+                # Reused entities computed in an earlier run
+                continue
+            response = fetch(context, entity["identifier"], access_token, request)
+            assert_success_response(response)
+            details.append({**response.json(), "id": entity["id"], "type": entity_type})
+
+    compute_ids = compute_identifiers_of(details)
+    futures = wait_for_computes(
+        context, compute_ids.values(), access_token, request, **time_functions(context)
+    )
+    failures = [
+        f"{entity_id}: {futures[compute_id].exception()}"
+        for entity_id, compute_id in compute_ids.items()
+        if futures[compute_id].exception()
+    ]
+    assert not failures, "Computes did not complete:\n" + "\n".join(failures)
@@ -7,7 +7,12 @@ API endpoints without requiring a real server.
 
 from typing import Dict, Any, Optional
 from unittest.mock import Mock
+from urllib.parse import parse_qs, urlsplit
 import re
+import threading
+
+from config import API_ENDPOINTS
+from utils.compute_simulator import ComputeSimulator, VirtualClock
 
 
 class MockResponse:
@@ -32,13 +37,32 @@ class MockAPIConfig:
 
     def __init__(self):
         self.entity_counter = 0
+        self._counter_lock = threading.Lock()
         self.access_token = "mock_access_token_12345"
         self.base_url = "http://localhost:8000"
+        # Computes progress in virtual time, advanced by the waiters' sleeps
+        self.clock = VirtualClock()
+        self.computes = ComputeSimulator.from_env(self.clock)
 
     def get_next_id(self) -> int:
-        """Get the next available entity ID."""
-        self.entity_counter += 1
-        return self.entity_counter
+        """Get the next available entity ID (thread-safe: parallel steps and users share it)."""
+        with self._counter_lock:
+            self.entity_counter += 1
+            return self.entity_counter
+
+    def compute_identifier(self, identifier: str) -> str:
+        """Get the compute identifier of an entity."""
+        return f"compute_{identifier}"
+
+    def create_mock_compute_response(self, identifier: Optional[str]) -> MockResponse:
+        """Create a mock compute status response from the compute simulator."""
+        status = self.computes.status(identifier) if identifier else None
+        if status is None:
+            return self.create_mock_error_response(404, f"Compute {identifier} not found")
+        return MockResponse(
+            status_code=200,
+            json_data={"identifier": identifier, "status": {"status": status}},
+        )
 
     def create_mock_mesh_response(
         self, identifier: Optional[str] = None
@@ -239,7 +263,7 @@ class MockAPIConfig:
                     "identifier": identifier,
                 },
                 "entity_info": {},
-                "compute_identifier": "compute_identifier",
+                "compute_identifier": self.compute_identifier(identifier),
                 "secrets": [],
                 "connection": "connection",
                 "healthy": "healthy",
@@ -267,25 +291,39 @@ def setup_mock_responses(context: Mock, config: MockAPIConfig) -> None:
     # Setup login response
     context.post.return_value = config.create_mock_login_response()
 
-    context.get.return_value = config.get_mock_by_id_response()
+    # Waiters polling this context sleep in the config's virtual time
+    context.virtual_clock = config.clock
 
     # Setup entity creation responses with specific methods
     def mock_post_entity(url, data=None, headers=None, **kwargs):
-        if "mesh" in url:
+        if "link" in url or "secret" in url:
+            return config.create_mock_success_response()
+        elif "mesh" in url:
             return config.create_mock_mesh_response()
         elif "data_system" in url:
             return config.create_mock_system_response()
         elif "origin" in url:  # Source endpoint
-            return config.create_mock_source_response()
+            response = config.create_mock_source_response()
         elif "resource" in url:  # Object endpoint
-            return config.create_mock_object_response()
+            response = config.create_mock_object_response()
         elif "product" in url:
-            return config.create_mock_product_response()
+            response = config.create_mock_product_response()
         else:
             return config.create_mock_success_response()
+        # Sources, objects and products start a compute when created
+        identifier = response.json()["entity"]["identifier"]
+        config.computes.start(config.compute_identifier(identifier))
+        return response
+
+    def mock_get_entity(url, headers=None, params=None, **kwargs):
+        query = {key: values[-1] for key, values in parse_qs(urlsplit(url).query).items()}
+        identifier = (params or query).get("identifier")
+        if API_ENDPOINTS["CHECK_COMPUTE"] in url:
+            return config.create_mock_compute_response(identifier)
+        return config.get_mock_by_id_response(identifier)
 
     context.post.side_effect = mock_post_entity
-    # context.get.side_effect = mock_get_entity
+    context.get.side_effect = mock_get_entity
 
     # Setup PUT requests (for updates)
     context.put.return_value = config.create_mock_success_response()
@@ -57,7 +57,7 @@ class DeleteMeshStep(ProcedureStep):
         if not mesh_ref:
             pytest.fail("Mesh reference ('mesh_ref') is required for deletion.")
 
-        mesh_entry = self.id_map.get(mesh_ref)
+        mesh_entry = self.id_map.find(mesh_ref)
         if not mesh_entry or "identifier" not in mesh_entry:
             pytest.fail("Mesh reference ('mesh_ref') not found in id_map.")
         mesh_id = mesh_entry["identifier"]
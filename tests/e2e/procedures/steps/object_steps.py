@@ -43,7 +43,7 @@ class GetObjectByIdStep(ProcedureStep):
         if not object_ref:
             pytest.fail("Missing required input: 'object_ref'.")
 
-        object_entry = self.id_map.get(object_ref)
+        object_entry = self.id_map.find(object_ref)
         if not object_entry or "identifier" not in object_entry:
             pytest.fail(f"'object_ref' '{object_ref}' not found in id_map.")
 
@@ -103,7 +103,7 @@ class DeleteObjectStep(ProcedureStep):
         if not object_ref:
             pytest.fail("Object reference ('object_ref') is required for retrieval.")
 
-        object_entry = self.id_map.get(object_ref)
+        object_entry = self.id_map.find(object_ref)
         if not object_entry or "identifier" not in object_entry:
             pytest.fail("Object reference ('object_ref') not found in id_map.")
         object_id = object_entry["identifier"]
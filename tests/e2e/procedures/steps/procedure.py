@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from utils.entity_registry import EntityRegistry
+
 
 class ProcedureStep:
     """Base class for all procedure steps."""
@@ -9,7 +11,7 @@ class ProcedureStep:
         request: Any,
         step: Dict[str, Any],
         api_context: tuple[Any, str],
-        id_map: Dict[str, Any],
+        id_map: EntityRegistry,
     ):
         """
         Initialize a procedure step.
@@ -18,7 +20,7 @@ class ProcedureStep:
             request: The test request object
             step: The step configuration
             api_context: Tuple of (context, access_token)
-            id_map: The entity ID mapping dictionary
+            id_map: The entity registry
         """
         self.request = request
         self.step = step
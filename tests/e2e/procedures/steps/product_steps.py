@@ -45,7 +45,7 @@ class GetProductByIdStep(ProcedureStep):
         if not product_ref:
             pytest.fail("Missing required input: 'product_ref'.")
 
-        product_entry = self.id_map.get(product_ref)
+        product_entry = self.id_map.find(product_ref)
         if not product_entry or "identifier" not in product_entry:
             pytest.fail(f"'product_ref' '{product_ref}' not found in id_map.")
 
@@ -109,7 +109,7 @@ class DeleteProductStep(ProcedureStep):
         if not product_ref:
             pytest.fail("Product reference ('product_ref') is required for deletion.")
 
-        product_entry = self.id_map.get(product_ref)
+        product_entry = self.id_map.find(product_ref)
         if not product_entry or "identifier" not in product_entry:
             pytest.fail("Product reference ('product_ref') not found in id_map.")
         product_id = product_entry["identifier"]
@@ -44,7 +44,7 @@ class GetSourceByIdStep(ProcedureStep):
         if not source_ref:
             pytest.fail("Source reference ('source_ref') is required for retrieval.")
 
-        source_entry = self.id_map.get(source_ref)
+        source_entry = self.id_map.find(source_ref)
         if not source_entry or "identifier" not in source_entry:
             pytest.fail("Source reference ('source_ref') not found in id_map.")
         source_id = source_entry["identifier"]
@@ -105,7 +105,7 @@ class DeleteSourceStep(ProcedureStep):
         if not source_ref:
             pytest.fail("Source reference ('source_ref') is required for deletion.")
 
-        source_entry = self.id_map.get(source_ref)
+        source_entry = self.id_map.find(source_ref)
         if not source_entry or "identifier" not in source_entry:
             pytest.fail("Source reference ('source_ref') not found in id_map.")
         source_id = source_entry["identifier"]
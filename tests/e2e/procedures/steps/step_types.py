@@ -0,0 +1,91 @@
+"""
+Procedure step types.
+
+Maps the ``type`` of a procedure step configuration to the ProcedureStep
+subclass executing it. Shared by the procedure generators and the load runner.
+"""
+
+from typing import Any, Dict, Type
+
+from steps.procedure import ProcedureStep
+from steps.mesh_steps import CreateMeshStep, GetAllMeshStep
+from steps.check_compute import CheckStatusComputeStep
+from steps.object_steps import (
+    ConfigureObjectDetailsStep,
+    CreateObjectStep,
+    GetAllObjectStep,
+    GetObjectByIdStep,
+    LinkObjectToSourceStep,
+)
+from steps.product_steps import (
+    CreateDataProductSchemaStep,
+    CreateProductStep,
+    CreateTransformationBuilderStep,
+    GetAllProductStep,
+    GetProductByIdStep,
+    LinkProductToObjectStep,
+    LinkProductToProductStep,
+)
+from steps.source_steps import (
+    ConfigureConnectionDetailsStep,
+    CreateSourceStep,
+    GetAllSourceStep,
+    GetSourceByIdStep,
+    LinkSystemToSourceStep,
+    SetConnectionSecretsStep,
+)
+from steps.system_steps import CreateSystemStep, GetAllSystemStep
+
+STEP_TYPES: Dict[str, Type[ProcedureStep]] = {
+    "get_all_mesh": GetAllMeshStep,
+    "create_mesh": CreateMeshStep,
+    "get_all_system": GetAllSystemStep,
+    "create_system": CreateSystemStep,
+    "get_all_source": GetAllSourceStep,
+    "get_source_by_id": GetSourceByIdStep,
+    "create_source": CreateSourceStep,
+    "get_all_object": GetAllObjectStep,
+    "get_object_by_id": GetObjectByIdStep,
+    "create_object": CreateObjectStep,
+    "link_object_to_source": LinkObjectToSourceStep,
+    "configure_object_details": ConfigureObjectDetailsStep,
+    "get_all_product": GetAllProductStep,
+    "get_product_by_id": GetProductByIdStep,
+    "create_product": CreateProductStep,
+    "link_product_to_object": LinkProductToObjectStep,
+    "link_product_to_product": LinkProductToProductStep,
+    "define_product_schema": CreateDataProductSchemaStep,
+    "link_system_to_source": LinkSystemToSourceStep,
+    "configure_source": ConfigureConnectionDetailsStep,
+    "set_source_secret": SetConnectionSecretsStep,
+    "apply_product_transformation": CreateTransformationBuilderStep,
+    "check_status_compute": CheckStatusComputeStep,
+}
+
+
+def get_step_instance(
+    request: Any,
+    step: Dict[str, Any],
+    api_context: tuple[Any, str],
+    id_map: Any,
+) -> ProcedureStep:
+    """
+    Factory function to create step instances based on step type.
+
+    Args:
+        request: The test request object
+        step: The step configuration
+        api_context: Tuple of (context, access_token)
+        id_map: The entity registry
+
+    Returns:
+        A ProcedureStep instance
+
+    Raises:
+        ValueError: If the step type is unknown
+    """
+    step_type = step.get("type")
+    if step_type not in STEP_TYPES:
+        raise ValueError(f"Unknown step type: {step_type}")
+
+    return STEP_TYPES[step_type](request, step, api_context, id_map)
@@ -52,7 +52,7 @@ class DeleteSystemStep(ProcedureStep):
         if not system_ref:
             pytest.fail("System reference ('system_ref') is required for deletion.")
 
-        system_entry = self.id_map.get(system_ref)
+        system_entry = self.id_map.find(system_ref)
         if not system_entry or "identifier" not in system_entry:
             pytest.fail("System reference ('system_ref') not found in id_map.")
         system_id = system_entry["identifier"]
@@ -5,61 +5,31 @@ This module provides comprehensive test procedures for API automation,
 including step-by-step execution of various API operations.
 """
 
-import json
 import os
-import importlib.util
-from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
-
-
-from steps.mesh_steps import CreateMeshStep, GetAllMeshStep
-from steps.check_compute import CheckStatusComputeStep
-from steps.object_steps import (
-    ConfigureObjectDetailsStep,
-    CreateObjectStep,
-    GetAllObjectStep,
-    GetObjectByIdStep,
-    LinkObjectToSourceStep,
-)
-from steps.product_steps import (
-    CreateDataProductSchemaStep,
-    CreateProductStep,
-    CreateTransformationBuilderStep,
-    GetAllProductStep,
-    GetProductByIdStep,
-    LinkProductToObjectStep,
-    LinkProductToProductStep,
-)
-from steps.source_steps import (
-    ConfigureConnectionDetailsStep,
-    CreateSourceStep,
-    GetAllSourceStep,
-    GetSourceByIdStep,
-    LinkSystemToSourceStep,
-    SetConnectionSecretsStep,
-)
-from steps.system_steps import CreateSystemStep, GetAllSystemStep
+
+
+from steps.step_types import get_step_instance
 
 import pytest
 from utils.common import record_api_info
+from utils.entity_registry import create_registry
+from utils.procedure_checkpoint import ProcedureCheckpoint, checkpoint_enabled, revalidate
+from utils.procedure_executor import ProcedureExecutor, report_outcome, step_index
+from utils.procedure_plan import load_procedure, step_id
 from config import API_ENDPOINTS
 
 
-# Load procedure configuration
-spec = importlib.util.spec_from_file_location(
-    "procedure_config", "test_data/procedures/procedure-1.py"
-)
-if spec is None:
-    raise FileNotFoundError("Could not load procedure configuration file")
-if spec.loader is None:
-    raise FileNotFoundError("Could not load procedure configuration file")
-procedure_config = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(procedure_config)
-config = procedure_config.config
+# Load procedure configuration as a lazy plan: payload factories only run
+# when the step that uses them executes
+PROCEDURE_FILE = "test_data/procedures/procedure-1.py"
+procedure_plan = load_procedure(PROCEDURE_FILE)
+config = procedure_plan.config
 
 # Environment variables
-BASE_URL = os.getenv("API_URL", "http://localhost:8000")
 USERNAME = os.getenv("QA_USERNAME", "test_user")
 PASSWORD = os.getenv("QA_PASSWORD", "test_password")
+# Number of worker threads; values above 1 run independent steps concurrently
+PROCEDURE_WORKERS = int(os.getenv("PROCEDURE_WORKERS", "1"))
 
 if config is None:
     config = {}
@@ -68,87 +38,81 @@ global is_check_compute
 
 
 @pytest.fixture(scope="session")
-def api_context(playwright: Playwright):
-    """Create API request context and get access token"""
-    context = playwright.request.new_context(base_url=BASE_URL)
-    login_payload = {"user": USERNAME, "password": PASSWORD}
-    access_token = None
-    try:
-        response = context.post(
-            "/api/iam/login",
-            data=json.dumps(login_payload),
-            headers={"Content-Type": "application/json"},
+def id_map(shared_tmp_dir):
+    """Return an empty entity registry (shared across workers with ENTITY_REGISTRY=sqlite)."""
+    return create_registry(shared_tmp_dir, "procedure")
+
+
+@pytest.fixture(scope="session")
+def checkpoint(request, api_context, id_map):
+    """
+    Checkpoint the run after every step, or resume the run given with --resume.
+
+    Returns:
+        The run's ProcedureCheckpoint, or None with PROCEDURE_CHECKPOINT=0
+    """
+    if not checkpoint_enabled():
+        yield None
+        return
+    steps = config.get("steps", [])
+    run_id = request.config.getoption("resume")
+    if run_id:
+        checkpoint = ProcedureCheckpoint.load(run_id, PROCEDURE_FILE)
+        context, access_token = api_context
+        gone = revalidate(checkpoint, context, access_token, request)
+        rerun = checkpoint.invalidate(gone, steps)
+        checkpoint.restore(id_map)
+        print(
+            f"↩️ Resuming procedure run {run_id}: {len(checkpoint.completed)} steps completed, "
+            f"{len(gone)} entities gone, {len(rerun)} steps to run again"
         )
-        access_token = response.json().get("access_token")
-    except PlaywrightTimeoutError:
-        context.dispose()
-        access_token = None
-    except Exception as e:
-        context.dispose()
-        access_token = None
+    else:
+        checkpoint = ProcedureCheckpoint.create(PROCEDURE_FILE)
+        print(f"📌 Procedure run {checkpoint.run_id}")
+    yield checkpoint
+    checkpoint.finish(id_map, steps)
 
-    yield context, access_token
-    context.dispose()
+
+def run_checkpointed(checkpoint, index, step, id_map, execute):
+    """Run a step unless it completed already, and checkpoint it once it passed."""
+    if checkpoint is None:
+        execute()
+        return
+    key = step_id(index, step)
+    if checkpoint.is_resumed(key):
+        return
+    execute()
+    checkpoint.complete(key, id_map)
 
 
 @pytest.fixture(scope="session")
-def id_map():
-    """Return an empty ID mapping dictionary."""
-    return {}
+def procedure_outcomes(api_pool, api_context, id_map, checkpoint):
+    """
+    Run the whole procedure on a worker pool when PROCEDURE_WORKERS > 1.
 
+    Independent branches of the step dependency graph run concurrently; each
+    parametrized test then reports the outcome of its own step.
 
-def get_step_instance(
-    request,
-    step,
-    api_context,
-    id_map,
-):
+    Returns:
+        Mapping of step index to outcome, or None for sequential execution
     """
-    Factory function to create step instances based on step type.
+    if PROCEDURE_WORKERS <= 1:
+        return None
 
-    Args:
-        request: The test request object
-        step: The step configuration
-        api_context: Tuple of (context, access_token)
-        id_map: The entity ID mapping dictionary
+    _, access_token = api_context
 
-    Returns:
-        A ProcedureStep instance
+    def run_step(index, step, step_request, context):
+        instance = get_step_instance(step_request, step, (context, access_token), id_map)
+        run_checkpointed(checkpoint, index, step, id_map, instance.execute)
 
-    Raises:
-        ValueError: If the step type is unknown
-    """
-    step_type = step.get("type")
-    mapping = {
-        "get_all_mesh": GetAllMeshStep,
-        "create_mesh": CreateMeshStep,
-        "get_all_system": GetAllSystemStep,
-        "create_system": CreateSystemStep,
-        "get_all_source": GetAllSourceStep,
-        "get_source_by_id": GetSourceByIdStep,
-        "create_source": CreateSourceStep,
-        "get_all_object": GetAllObjectStep,
-        "get_object_by_id": GetObjectByIdStep,
-        "create_object": CreateObjectStep,
-        "link_object_to_source": LinkObjectToSourceStep,
-        "configure_object_details": ConfigureObjectDetailsStep,
-        "get_all_product": GetAllProductStep,
-        "get_product_by_id": GetProductByIdStep,
-        "create_product": CreateProductStep,
-        "link_product_to_object": LinkProductToObjectStep,
-        "link_product_to_product": LinkProductToProductStep,
-        "define_product_schema": CreateDataProductSchemaStep,
-        "link_system_to_source": LinkSystemToSourceStep,
-        "configure_source": ConfigureConnectionDetailsStep,
-        "set_source_secret": SetConnectionSecretsStep,
-        "apply_product_transformation": CreateTransformationBuilderStep,
-        "check_status_compute": CheckStatusComputeStep,
-    }
-
-    if step_type not in mapping:
-        raise ValueError(f"Unknown step type: {step_type}")
-
-    return mapping[step_type](request, step, api_context, id_map)
+    executor = ProcedureExecutor(
+        config.get("steps", []),
+        run_step,
+        max_workers=PROCEDURE_WORKERS,
+        worker_setup=api_pool.context,
+        worker_teardown=lambda context: api_pool.release(),
+    )
+    return executor.run()
 
 
 def test_login_api(api_context, request):
@@ -174,14 +138,18 @@ def test_login_api(api_context, request):
 
 @pytest.mark.parametrize(
     "step",
-    config.get("steps", []),
-    ids=lambda x: f"Step {config.get('steps', []).index(x) + 1}: {x['type']}_{x.get('id') or x.get('identifier') or x.get('ref') or ''}",
+    [
+        pytest.param(step, id=step_id(index, step))
+        for index, step in enumerate(config.get("steps", []))
+    ],
 )
 def test_step_execution(
     request,
     step,
     api_context,
     id_map,
+    checkpoint,
+    procedure_outcomes,
 ):
     """
     Execute individual test steps.
@@ -190,6 +158,16 @@ def test_step_execution(
         request: The test request object
         step: The step configuration
         api_context: Tuple of (context, access_token)
-        id_map: The entity ID mapping dictionary
+        id_map: The entity registry
+        checkpoint: The run's checkpoint, or None
+        procedure_outcomes: Outcomes of a parallel run, or None
     """
-    get_step_instance(request, step, api_context, id_map).execute()
+    index = step_index(config.get("steps", []), step)
+    if checkpoint is not None and checkpoint.is_resumed(step_id(index, step)):
+        pytest.skip(f"Completed in procedure run {checkpoint.run_id}")
+    if procedure_outcomes is not None:
+        report_outcome(request, procedure_outcomes[index])
+        return
+
+    instance = get_step_instance(request, step, api_context, id_map)
+    run_checkpointed(checkpoint, index, step, id_map, instance.execute)
@@ -7,37 +7,10 @@ including step-by-step execution of various API operations.
 
 import json
 import os
-import importlib.util
 from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
 
 
-from steps.mesh_steps import CreateMeshStep, GetAllMeshStep
-from steps.check_compute import CheckStatusComputeStep
-from steps.object_steps import (
-    ConfigureObjectDetailsStep,
-    CreateObjectStep,
-    GetAllObjectStep,
-    GetObjectByIdStep,
-    LinkObjectToSourceStep,
-)
-from steps.product_steps import (
-    CreateDataProductSchemaStep,
-    CreateProductStep,
-    CreateTransformationBuilderStep,
-    GetAllProductStep,
-    GetProductByIdStep,
-    LinkProductToObjectStep,
-    LinkProductToProductStep,
-)
-from steps.source_steps import (
-    ConfigureConnectionDetailsStep,
-    CreateSourceStep,
-    GetAllSourceStep,
-    GetSourceByIdStep,
-    LinkSystemToSourceStep,
-    SetConnectionSecretsStep,
-)
-from steps.system_steps import CreateSystemStep, GetAllSystemStep
+from steps.step_types import get_step_instance
 
 import pytest
 from tests.e2e.procedures.mock_config import (
@@ -46,25 +19,23 @@ from tests.e2e.procedures.mock_config import (
     mock_config,
 )
 from utils.common import record_api_info
+from utils.entity_registry import create_registry
+from utils.procedure_executor import ProcedureExecutor, report_outcome, step_index
+from utils.procedure_plan import load_procedure, step_id
 from config import API_ENDPOINTS
 
 
-# Load procedure configuration
-spec = importlib.util.spec_from_file_location(
-    "procedure_config", "test_data/procedures/procedure-1.py"
-)
-if spec is None:
-    raise FileNotFoundError("Could not load procedure configuration file")
-if spec.loader is None:
-    raise FileNotFoundError("Could not load procedure configuration file")
-procedure_config = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(procedure_config)
-config = procedure_config.config
+# Load procedure configuration as a lazy plan: payload factories only run
+# when the step that uses them executes
+procedure_plan = load_procedure("test_data/procedures/procedure-1.py")
+config = procedure_plan.config
 
 # Environment variables
 BASE_URL = os.getenv("API_URL", "http://localhost:8000")
 USERNAME = os.getenv("QA_USERNAME", "test_user")
 PASSWORD = os.getenv("QA_PASSWORD", "test_password")
+# Number of worker threads; values above 1 run independent steps concurrently
+PROCEDURE_WORKERS = int(os.getenv("PROCEDURE_WORKERS", "1"))
 
 if config is None:
     config = {}
@@ -88,63 +59,31 @@ def api_context():
 
 
 @pytest.fixture(scope="session")
-def id_map():
-    """Return an empty ID mapping dictionary."""
-    return {}
+def id_map(shared_tmp_dir):
+    """Return an empty entity registry (shared across workers with ENTITY_REGISTRY=sqlite)."""
+    return create_registry(shared_tmp_dir, "procedure_mock")
 
 
-def get_step_instance(
-    request,
-    step,
-    api_context,
-    id_map,
-):
+@pytest.fixture(scope="session")
+def procedure_outcomes(api_context, id_map):
     """
-    Factory function to create step instances based on step type.
+    Run the whole procedure on a worker pool when PROCEDURE_WORKERS > 1.
 
-    Args:
-        request: The test request object
-        step: The step configuration
-        api_context: Tuple of (context, access_token)
-        id_map: The entity ID mapping dictionary
+    The mock context is shared by every worker thread.
 
     Returns:
-        A ProcedureStep instance
-
-    Raises:
-        ValueError: If the step type is unknown
+        Mapping of step index to outcome, or None for sequential execution
     """
-    step_type = step.get("type")
-    mapping = {
-        "get_all_mesh": GetAllMeshStep,
-        "create_mesh": CreateMeshStep,
-        "get_all_system": GetAllSystemStep,
-        "create_system": CreateSystemStep,
-        "get_all_source": GetAllSourceStep,
-        "get_source_by_id": GetSourceByIdStep,
-        "create_source": CreateSourceStep,
-        "get_all_object": GetAllObjectStep,
-        "get_object_by_id": GetObjectByIdStep,
-        "create_object": CreateObjectStep,
-        "link_object_to_source": LinkObjectToSourceStep,
-        "configure_object_details": ConfigureObjectDetailsStep,
-        "get_all_product": GetAllProductStep,
-        "get_product_by_id": GetProductByIdStep,
-        "create_product": CreateProductStep,
-        "link_product_to_object": LinkProductToObjectStep,
-        "link_product_to_product": LinkProductToProductStep,
-        "define_product_schema": CreateDataProductSchemaStep,
-        "link_system_to_source": LinkSystemToSourceStep,
-        "configure_source": ConfigureConnectionDetailsStep,
-        "set_source_secret": SetConnectionSecretsStep,
-        "apply_product_transformation": CreateTransformationBuilderStep,
-        "check_status_compute": CheckStatusComputeStep,
-    }
-
-    if step_type not in mapping:
-        raise ValueError(f"Unknown step type: {step_type}")
-
-    return mapping[step_type](request, step, api_context, id_map)
+    if PROCEDURE_WORKERS <= 1:
+        return None
+
+    def run_step(index, step, step_request, worker_state):
+        get_step_instance(step_request, step, api_context, id_map).execute()
+
+    executor = ProcedureExecutor(
+        config.get("steps", []), run_step, max_workers=PROCEDURE_WORKERS
+    )
+    return executor.run()
 
 
 def test_login_api(api_context, request):
@@ -170,14 +109,17 @@ def test_login_api(api_context, request):
 
 @pytest.mark.parametrize(
     "step",
-    config.get("steps", []),
-    ids=lambda x: f"Step {config.get('steps', []).index(x) + 1}: {x['type']}_{x.get('id') or x.get('identifier') or x.get('ref') or ''}",
+    [
+        pytest.param(step, id=step_id(index, step))
+        for index, step in enumerate(config.get("steps", []))
+    ],
 )
 def test_step_execution(
     request,
     step,
     api_context,
     id_map,
+    procedure_outcomes,
 ):
     """
     Execute individual test steps.
@@ -186,7 +128,13 @@ def test_step_execution(
         request: The test request object
         step: The step configuration
         api_context: Tuple of (context, access_token)
-        id_map: The entity ID mapping dictionary
+        id_map: The entity registry
+        procedure_outcomes: Outcomes of a parallel run, or None
     """
+    if procedure_outcomes is not None:
+        steps = config.get("steps", [])
+        report_outcome(request, procedure_outcomes[step_index(steps, step)])
+        return
+
     get_step_instance(request, step, api_context, id_map).execute()
     print(id_map)
@@ -0,0 +1,154 @@
+import asyncio
+import inspect
+import json
+from types import SimpleNamespace
+
+import api.mesh
+import api.object
+import api.product
+import api.source
+import api.system
+import api.check_compute
+import api.aio.mesh
+import api.aio.object
+import api.aio.product
+import api.aio.source
+import api.aio.system
+import api.aio.check_compute
+from api.aio.client import BoundedContext, read_response, run_async
+from utils.api_response import AsyncApiResponse
+from utils.latency import LATENCY
+
+
+class FakeAsyncResponse:
+    def __init__(self, body):
+        self.ok = True
+        self.status = 200
+        self._body = body
+        self.reads = 0
+
+    async def json(self):
+        self.reads += 1
+        return self._body
+
+    async def text(self):
+        return json.dumps(self._body)
+
+
+class FakeAsyncContext:
+    """Async request context recording calls and peak concurrency."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _send(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return FakeAsyncResponse({"entity": {"identifier": f"id-{len(self.calls)}"}})
+
+    async def get(self, url, **kwargs):
+        return await self._send("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self._send("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self._send("PUT", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self._send("DELETE", url, **kwargs)
+
+
+def public_functions(module):
+    return {
+        name: function
+        for name, function in inspect.getmembers(module, inspect.isfunction)
+        if function.__module__ == module.__name__
+    }
+
+
+def test_async_modules_mirror_sync_surface():
+    pairs = [
+        (api.mesh, api.aio.mesh),
+        (api.system, api.aio.system),
+        (api.source, api.aio.source),
+        (api.object, api.aio.object),
+        (api.product, api.aio.product),
+        (api.check_compute, api.aio.check_compute),
+    ]
+    for sync_module, async_module in pairs:
+        sync_functions = public_functions(sync_module)
+        async_functions = public_functions(async_module)
+        assert sync_functions.keys() == async_functions.keys()
+        for name, function in async_functions.items():
+            assert inspect.iscoroutinefunction(function)
+            assert inspect.signature(function) == inspect.signature(sync_functions[name])
+
+
+def test_bounded_context_limits_concurrency():
+    fake = FakeAsyncContext()
+    request = SimpleNamespace(node=SimpleNamespace())
+
+    async def scenario():
+        context = BoundedContext(fake, max_concurrency=3)
+        return await asyncio.gather(
+            *[api.aio.mesh.create_mesh(context, {"n": n}, "token", request) for n in range(10)]
+        )
+
+    responses = run_async(scenario())
+
+    assert len(responses) == 10
+    assert fake.peak == 3
+    assert request.node._api_info["method"] == "POST"
+    assert "entity" in request.node._api_info["response"]
+
+
+def test_request_urls_match_sync_layer():
+    fake = FakeAsyncContext(delay=0)
+    entity = {"identifier": "abc"}
+
+    async def scenario():
+        await api.aio.product.create_data_product_schema(fake, entity, {}, "token", None)
+        await api.aio.source.link_system_to_source(fake, entity, entity, "token", None)
+
+    run_async(scenario())
+
+    assert fake.calls[0][:2] == ("PUT", "/api/data/product/schema/?identifier=abc")
+    assert fake.calls[1][2]["params"] == {"identifier": "abc", "child_identifier": "abc"}
+
+
+def test_bounded_context_returns_memoizing_responses():
+    fake = FakeAsyncContext(delay=0)
+    request = SimpleNamespace(node=SimpleNamespace())
+
+    async def scenario():
+        response = await api.aio.mesh.create_mesh(BoundedContext(fake), {}, "token", request)
+        return response, await read_response(response), await response.json()
+
+    response, body, again = run_async(scenario())
+
+    assert isinstance(response, AsyncApiResponse) and response.ok and response.ttfb >= 0
+    assert body == again == {"entity": {"identifier": "id-1"}}
+    # Recorded, read and parsed again: the fake response is decoded once
+    assert response._raw.reads == 1
+
+
+def test_bounded_context_times_requests():
+    def mesh_posts():
+        histogram = LATENCY.histograms().get(("POST", "/api/data/mesh"))
+        return histogram.count if histogram else 0
+
+    async def scenario():
+        context = BoundedContext(FakeAsyncContext(delay=0))
+        await asyncio.gather(*[api.aio.mesh.create_mesh(context, {}, "token", None) for _ in range(3)])
+
+    before = mesh_posts()
+    run_async(scenario())
+
+    assert mesh_posts() == before + 3
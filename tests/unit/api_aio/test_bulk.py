@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+from api.aio.bulk import BulkOperationError, build_landscape, bulk_create, landscape_links
+from api.aio.client import run_async
+from utils.entity_registry import EntityRegistry
+
+LANDSCAPE = {
+    "mesh": [{"id": "mesh1", "name": "Mesh"}],
+    "systems": [{"id": "sys1", "name": "System"}],
+    "sources": [{"id": "src1", "system": "sys1", "name": "Source"}],
+    "objects": [
+        {"id": "obj1", "source": "src1", "name": "Object 1"},
+        {"id": "obj2", "source": "src1", "name": "Object 2"},
+    ],
+    "products": [
+        {"id": "prod1", "input": ["obj1", "obj2"], "mesh": "mesh1", "name": "Product 1"},
+        {"id": "prod2", "input": ["prod1"], "mesh": "mesh1", "name": "Product 2"},
+    ],
+}
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.ok = status < 400
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+    async def text(self):
+        return json.dumps(self._body)
+
+
+class FakeBackend:
+    """Async request context handing out identifiers and counting concurrency."""
+
+    def __init__(self, fail_names=()):
+        self.fail_names = fail_names
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _send(self, method, url, data=None, **kwargs):
+        self.requests.append((method, url))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.005)
+        self.in_flight -= 1
+        payload = json.loads(data) if data else {}
+        name = payload.get("entity", {}).get("name", "")
+        if any(name.startswith(prefix) for prefix in self.fail_names):
+            return FakeResponse(422, {"errors": ["invalid"]})
+        identifier = f"id-{len(self.requests)}"
+        if url.endswith("data_system"):
+            return FakeResponse(200, {"identifier": identifier})
+        return FakeResponse(200, {"entity": {"identifier": identifier}})
+
+    async def get(self, url, **kwargs):
+        return await self._send("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self._send("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self._send("PUT", url, **kwargs)
+
+
+def test_landscape_links_classify_inputs():
+    assert landscape_links(LANDSCAPE) == [
+        ("system_source", "sys1", "src1"),
+        ("source_object", "src1", "obj1"),
+        ("source_object", "src1", "obj2"),
+        ("object_product", "obj1", "prod1"),
+        ("object_product", "obj2", "prod1"),
+        ("product_product", "prod1", "prod2"),
+    ]
+
+
+def test_bulk_create_respects_concurrency():
+    backend = FakeBackend()
+    items = [{"id": f"obj{n}", "name": f"Object {n}"} for n in range(20)]
+
+    mapping = run_async(bulk_create(backend, "objects", items, "token", concurrency=4))
+
+    assert set(mapping) == {item["id"] for item in items}
+    assert backend.peak == 4
+
+
+def test_bulk_create_reports_partial_failures():
+    backend = FakeBackend(fail_names=("Broken",))
+    items = [{"id": "ok", "name": "Fine"}, {"id": "bad", "name": "Broken"}]
+    id_map = EntityRegistry()
+
+    with pytest.raises(BulkOperationError) as error:
+        run_async(bulk_create(backend, "objects", items, "token", id_map=id_map))
+
+    assert [key for key, _ in error.value.failures] == ["bad"]
+    assert id_map.ids() == ["ok"]
+
+
+def test_build_landscape_registers_every_entity():
+    backend = FakeBackend()
+
+    id_map = run_async(build_landscape(backend, LANDSCAPE, "token"))
+
+    assert set(id_map.ids()) == {"mesh1", "sys1", "src1", "obj1", "obj2", "prod1", "prod2"}
+    assert id_map["sys1"]["type"] == "system"
+    link_calls = [url for method, url in backend.requests if "/link/" in url]
+    assert len(link_calls) == len(landscape_links(LANDSCAPE))
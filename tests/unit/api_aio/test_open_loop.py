@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from api.aio.client import BoundedContext, run_async
+from utils.open_loop import OpenLoopGenerator
+
+
+class FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.ok = status < 400
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+    async def text(self):
+        return json.dumps(self._body)
+
+
+class SlowBackend:
+    """Async request context taking ``service_time`` per request."""
+
+    def __init__(self, service_time):
+        self.service_time = service_time
+        self.requests = []
+
+    async def post(self, url, data=None, **kwargs):
+        self.requests.append((url, json.loads(data)))
+        await asyncio.sleep(self.service_time)
+        return FakeResponse(201, {"entity": {"identifier": f"id-{len(self.requests)}"}})
+
+
+def test_requests_follow_the_schedule_and_cycle_targets():
+    backend = SlowBackend(0.001)
+    generator = OpenLoopGenerator(backend, "token", targets=["mesh", "product"])
+
+    report = run_async(generator.run(rate=200, duration=0.2))
+
+    # The host mesh, then 40 requests alternating between the targets
+    assert len(backend.requests) == 41
+    host_id = generator.host_mesh
+    assert host_id == "id-1"
+    products = [payload for url, payload in backend.requests[1:] if "product" in url]
+    assert len(products) == 20
+    assert all(payload["host_mesh_identifier"] == host_id for payload in products)
+    assert report.stats["mesh"].sent == report.stats["product"].sent == 20
+    assert report.elapsed == pytest.approx(0.2, abs=0.1)
+
+
+def test_latency_includes_queueing_behind_a_saturated_backend():
+    # One connection, 20 ms per request, 100 req/s offered: the backend serves 50 req/s
+    backend = BoundedContext(SlowBackend(0.02), max_concurrency=1)
+    generator = OpenLoopGenerator(backend, "token", targets=["mesh"])
+
+    report = run_async(generator.run(rate=100, duration=0.3))
+
+    stats = report.stats["mesh"]
+    assert stats.sent == 30 and stats.errors == 0
+    # A closed loop would report ~20 ms; here the last request waited for ~15 earlier ones
+    assert stats.corrected.percentile(50) > 0.05
+    assert stats.corrected.percentile(99) > 0.2
+    assert stats.corrected.total >= stats.service.total
+    assert "mesh" in report.format()
+
+
+def test_unknown_targets_are_rejected():
+    with pytest.raises(ValueError):
+        OpenLoopGenerator(SlowBackend(0), "token", targets=["landscape"])
@@ -0,0 +1,90 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.api_pool import ApiContextPool, PooledContext
+
+
+class FakeResponse:
+    def json(self):
+        return {"access_token": "token-1"}
+
+
+class FakeContext:
+    def __init__(self):
+        self.posts = []
+        self.disposed = False
+
+    def post(self, url, **kwargs):
+        self.posts.append(url)
+        return FakeResponse()
+
+    def get(self, url, **kwargs):
+        time.sleep(0.02)
+        return url
+
+    def dispose(self):
+        self.disposed = True
+
+
+def fake_playwright(contexts):
+    def new_context(base_url):
+        contexts.append(FakeContext())
+        return contexts[-1]
+
+    return SimpleNamespace(request=SimpleNamespace(new_context=new_context))
+
+
+def test_context_and_token_are_shared():
+    contexts = []
+    pool = ApiContextPool(
+        "http://api", fake_playwright(contexts), credentials={"user": "u", "password": "p"}
+    )
+
+    first = pool.context()
+    assert pool.context() is first
+    assert pool.access_token() == "token-1"
+    assert pool.access_token() == "token-1"
+
+    stats = pool.stats()
+    assert len(contexts) == 1 and contexts[0].posts == ["/api/iam/login"]
+    assert stats["contexts_created"] == 1
+    assert stats["logins"] == 1
+    assert stats["token_reuses"] == 1
+
+
+def test_preissued_token_skips_login():
+    contexts = []
+    pool = ApiContextPool("http://api", fake_playwright(contexts), access_token="env-token")
+
+    assert pool.access_token() == "env-token"
+    assert contexts == []
+
+
+def test_dispose_is_noop_and_release_disposes():
+    contexts = []
+    pool = ApiContextPool("http://api", fake_playwright(contexts))
+
+    context = pool.context()
+    context.dispose()
+    assert not contexts[0].disposed
+
+    pool.release()
+    assert contexts[0].disposed
+    assert pool.context() is not context
+
+
+def test_in_flight_requests_are_bounded():
+    context = FakeContext()
+    pool = ApiContextPool("http://api", max_connections=2)
+    pooled = PooledContext(pool, context)
+    threads = [threading.Thread(target=pooled.get, args=(f"/{n}",)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert stats["requests"] == 6
+    assert stats["peak_in_flight"] == 2
+    assert stats["slot_waits"] > 0
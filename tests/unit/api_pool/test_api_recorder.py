@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from utils.api_recorder import format_calls, record_call, recorded_calls
+from utils.common import record_api_info
+
+
+class RawResponse:
+    status = 200
+
+    def __init__(self, body):
+        self._body = body
+        self.json_calls = 0
+
+    def body(self):
+        return self._body
+
+    def json(self):
+        self.json_calls += 1
+        raise AssertionError("record_api_info must not decode eagerly")
+
+
+def make_request():
+    return SimpleNamespace(node=SimpleNamespace())
+
+
+def test_responses_are_decoded_only_on_access(capsys):
+    request = make_request()
+    response = RawResponse(b'{"entity": {"identifier": "abc"}}')
+
+    record_api_info(request, "POST", "/api/data/mesh", {"name": "m"}, response)
+
+    assert capsys.readouterr().out == ""
+    info = request.node._api_info
+    assert info["response"] == {"entity": {"identifier": "abc"}}
+    assert dict(info)["method"] == "POST"
+
+
+def test_ring_buffer_is_bounded(monkeypatch):
+    monkeypatch.setenv("API_RECORDER_CAPACITY", "3")
+    request = make_request()
+    for n in range(5):
+        record_call(request, "GET", f"/api/{n}", None, "ok")
+
+    assert [call.url for call in recorded_calls(request.node)] == ["/api/2", "/api/3", "/api/4"]
+    assert request.node._api_info["url"] == "/api/4"
+
+
+def test_format_calls_includes_status_timing_and_text_bodies():
+    request = make_request()
+    response = RawResponse(b"Internal Server Error")
+    response.status = 500
+    response._elapsed = 0.25
+    record_call(request, "GET", "/api/data/mesh", {}, response)
+
+    formatted = format_calls(request.node)
+
+    assert "GET /api/data/mesh -> 500 (250 ms)" in formatted
+    assert '"Internal Server Error"' in formatted
+    assert format_calls(SimpleNamespace()) is None
+
+
+def test_verbose_mode_prints_every_call(monkeypatch, capsys):
+    monkeypatch.setenv("API_RECORDER_VERBOSE", "1")
+    record_call(make_request(), "GET", "/api/data/mesh", None, {"items": []})
+
+    assert "GET /api/data/mesh" in capsys.readouterr().out
@@ -0,0 +1,63 @@
+from tests.e2e.procedures.mock_config import MockResponse
+from utils.api_response import ApiResponse, send
+
+
+class FakeRawResponse:
+    status = 201
+    ok = True
+    url = "http://api/mesh"
+    headers = {"content-type": "application/json"}
+
+    def __init__(self, body):
+        self._body = body
+        self.reads = 0
+        self.disposed = False
+
+    def body(self):
+        assert not self.disposed, "body read after dispose"
+        self.reads += 1
+        return self._body
+
+
+class FakeContext:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.response
+
+    def dispose(self):
+        pass
+
+
+def test_body_is_read_once_and_json_is_cached():
+    raw = FakeRawResponse(b'{"entity": {"identifier": "abc"}}')
+    raw.dispose = lambda: setattr(raw, "disposed", True)
+    response = send(FakeContext(raw), "post", "/api/data/mesh", data="{}")
+
+    first = response.json()
+    assert response.json() is first
+    assert response.text() == '{"entity": {"identifier": "abc"}}'
+    assert raw.reads == 1 and raw.disposed
+    assert response.headers["content-type"] == "application/json"
+    assert response.status == 201 and response.ok
+
+
+def test_timings_are_exposed():
+    response = send(FakeContext(FakeRawResponse(b"[]")), "post", "/api/data/mesh")
+    assert response.ttfb is not None and response.body_time is None
+
+    response.json()
+
+    assert response.body_time is not None and response.parse_time is not None
+    assert response.elapsed == response.ttfb + response.body_time
+
+
+def test_wraps_responses_without_raw_body():
+    response = ApiResponse(MockResponse(status_code=404, json_data={"detail": "missing"}, ok=False))
+
+    assert response.status == 404 and not response.ok
+    assert response.json() == {"detail": "missing"}
+    assert response.body() is None
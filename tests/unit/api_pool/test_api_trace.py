@@ -0,0 +1,108 @@
+import json
+import threading
+
+from api.aio.client import BoundedContext, run_async
+from utils import api_trace
+from utils.api_response import send
+from utils.api_trace import TraceSink, trace_context
+
+
+class FakeRawResponse:
+    status = 200
+    ok = True
+    url = "http://api/mesh"
+    headers = {}
+
+    def body(self):
+        return b'{"entities": []}'
+
+
+class FakeContext:
+    def get(self, url, **kwargs):
+        return FakeRawResponse()
+
+    def post(self, url, **kwargs):
+        return FakeRawResponse()
+
+
+class FakeAsyncRawResponse(FakeRawResponse):
+    async def body(self):
+        return b'{"entity": {}}'
+
+
+class FakeAsyncContext:
+    async def post(self, url, **kwargs):
+        return FakeAsyncRawResponse()
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_send_appends_tagged_records(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("API_TRACE", "1")
+    monkeypatch.setenv("API_TRACE_FILE", str(path))
+    monkeypatch.setattr(api_trace, "_sink", None)
+
+    with trace_context("tests/test_x.py::test_step[Step 1]", "create_mesh"):
+        send(FakeContext(), "post", "/api/data/mesh", data={"name": "mesh"})
+    send(FakeContext(), "get", "/api/data/mesh")
+    api_trace.close_sink()
+
+    first, second = read_lines(path)
+    assert first["node"] == "tests/test_x.py::test_step[Step 1]"
+    assert first["step"] == "create_mesh"
+    assert first["method"] == "POST" and first["status"] == 200
+    assert first["request_bytes"] == len(b'{"name":"mesh"}')
+    assert first["response_bytes"] == len(b'{"entities": []}')
+    assert first["latency_ms"] >= 0 and first["start"] > 0
+    # Outside the block, calls carry the running test (tagged by conftest)
+    assert second["node"].endswith("::test_send_appends_tagged_records")
+    assert second["step"] == "" and second["request_bytes"] is None
+
+
+def test_async_calls_are_traced(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("API_TRACE", "1")
+    monkeypatch.setenv("API_TRACE_FILE", str(path))
+    monkeypatch.setattr(api_trace, "_sink", None)
+
+    with trace_context("tests/test_x.py::test_bulk", "bulk_create"):
+        run_async(BoundedContext(FakeAsyncContext()).post("/api/data/mesh", data='{"a":1}'))
+    api_trace.close_sink()
+
+    [record] = read_lines(path)
+    assert record["node"] == "tests/test_x.py::test_bulk" and record["step"] == "bulk_create"
+    assert record["method"] == "POST" and record["status"] == 200
+    assert record["request_bytes"] == 7 and record["response_bytes"] == len(b'{"entity": {}}')
+    assert record["latency_ms"] >= 0
+
+
+def test_send_does_not_trace_when_disabled(monkeypatch):
+    monkeypatch.delenv("API_TRACE", raising=False)
+    monkeypatch.setattr(api_trace, "_sink", None)
+
+    send(FakeContext(), "get", "/api/data/mesh")
+
+    assert api_trace._sink is None
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    sink = TraceSink(str(tmp_path / "trace.jsonl"), queue_size=1)
+    release = threading.Event()
+    blocked_write = sink._file.write
+
+    def slow_write(text):
+        release.wait()
+        return blocked_write(text)
+
+    sink._file.write = slow_write
+    results = [sink.emit({"n": n}) for n in range(50)]
+    release.set()
+    sink.close()
+
+    assert not all(results)
+    assert sink.dropped == results.count(False)
+    assert len(read_lines(sink.path)) == sink.written == results.count(True)
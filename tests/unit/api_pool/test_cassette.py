@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from utils.api_trace import trace_context
+from utils.cassette import Cassette, CassetteMissError, CassetteResponse, worker_path
+from utils.token_cache import token_expiry
+
+MESH_ID = "0b8e3c1a-4a5f-4c1e-9d7e-2f6a1b3c4d5e"
+
+
+def response(status, body):
+    return CassetteResponse("", status, {"content-type": "application/json"}, json.dumps(body).encode())
+
+
+def mesh_payload(name):
+    return {"data": json.dumps({"entity": {"name": name, "label": "QA"}})}
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    path = str(tmp_path / "api.json.gz")
+    cassette = Cassette(path, "record")
+    with trace_context("tests/test_x.py::test_mesh"):
+        login = response(200, {"access_token": "secret.jwt.value"})
+        cassette.record("post", "/api/iam/login", {"data": "{}"}, login)
+        entity = {"identifier": MESH_ID, "name": "Mesh abc", "urn": f"urn:mesh:{MESH_ID}"}
+        cassette.record("post", "/api/data/mesh", mesh_payload("Mesh abc"), response(201, {"entity": entity}))
+        for status in ("RUNNING", "COMPLETED"):
+            poll = response(200, {"status": status})
+            cassette.record("get", f"/api/data/compute?identifier={MESH_ID}", {}, poll)
+    cassette.save()
+    return path
+
+
+def test_responses_are_stored_normalized(recorded):
+    stored = Cassette(recorded, "replay").interactions
+    assert [interaction["request"].split("#")[0] for interaction in stored] == [
+        "POST /api/iam/login",
+        "POST /api/data/mesh",
+        "GET /api/data/compute?identifier={{id:main-1}}",
+        "GET /api/data/compute?identifier={{id:main-1}}",
+    ]
+    assert stored[0]["body"] == {"access_token": "{{token}}"}
+    assert stored[1]["body"]["entity"] == {
+        "identifier": "{{id:main-1}}",
+        "name": "{{body:entity.name}}",
+        "urn": "urn:mesh:{{id:main-1}}",
+    }
+
+
+def test_replay_maps_identifiers_and_echoes(recorded):
+    cassette = Cassette(recorded, "replay")
+    with trace_context("tests/test_x.py::test_mesh"):
+        token = cassette.replay("post", "/api/iam/login", {"data": "{}"}).json()["access_token"]
+        assert token_expiry(token) is not None
+
+        created = cassette.replay("post", "/api/data/mesh", mesh_payload("Mesh xyz")).json()["entity"]
+        mesh_id = created["identifier"]
+        assert mesh_id != MESH_ID
+        assert created["name"] == "Mesh xyz" and created["urn"] == f"urn:mesh:{mesh_id}"
+
+        # Polls are served in order, the last response repeating
+        polls = [cassette.replay("get", f"/api/data/compute?identifier={mesh_id}", {}) for _ in range(3)]
+        assert [poll.json()["status"] for poll in polls] == ["RUNNING", "COMPLETED", "COMPLETED"]
+
+        with pytest.raises(CassetteMissError):
+            cassette.replay("delete", f"/api/data/mesh?identifier={mesh_id}", {})
+
+
+def test_replay_falls_back_to_other_tests_and_workers(recorded, tmp_path):
+    worker = Cassette(worker_path(recorded, "gw1"), "record", prefix="gw1")
+    worker.record("get", "/api/data/mesh", {}, response(200, {"entities": []}))
+    worker.save()
+    assert worker.path == str(tmp_path / "api.gw1.json.gz")
+
+    cassette = Cassette(recorded, "replay")
+    with trace_context("tests/test_y.py::test_other"):
+        assert cassette.replay("get", "/api/data/mesh", {}).json() == {"entities": []}
+        assert cassette.replay("post", "/api/data/mesh", mesh_payload("Other")).status == 201
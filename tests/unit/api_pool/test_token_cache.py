@@ -0,0 +1,107 @@
+import base64
+import json
+import threading
+
+from api.aio.client import run_async
+from utils.api_pool import ApiContextPool
+from utils.token_cache import TokenCache, token_expiry
+
+
+def make_jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_token_expiry_reads_exp_claim():
+    assert token_expiry(make_jwt(1700000000)) == 1700000000
+    assert token_expiry("not-a-jwt") is None
+    assert token_expiry("a.!!!.c") is None
+
+
+def test_cache_is_keyed_by_url_user_and_account(tmp_path):
+    first = TokenCache("http://api", "alice", "acc-1", directory=str(tmp_path))
+    assert first.path == TokenCache("http://api", "alice", "acc-1", directory=str(tmp_path)).path
+    assert first.path != TokenCache("http://api", "alice", "acc-2", directory=str(tmp_path)).path
+    assert first.path != TokenCache("http://other", "alice", "acc-1", directory=str(tmp_path)).path
+
+
+def test_get_logs_in_once_and_refreshes_before_expiry(tmp_path):
+    now = [1000.0]
+    cache = TokenCache("http://api", "alice", directory=str(tmp_path), refresh_margin=60,
+                       clock=lambda: now[0])
+    tokens = iter([make_jwt(1500), make_jwt(3000)])
+    logins = []
+
+    def login():
+        logins.append(1)
+        return next(tokens)
+
+    assert cache.get(login) == make_jwt(1500)
+    assert cache.get(login) == make_jwt(1500)
+    now[0] = 1450.0
+    assert cache.get(login) == make_jwt(3000)
+    assert len(logins) == 2
+
+
+def test_concurrent_workers_share_one_login(tmp_path):
+    logins = []
+
+    def login():
+        logins.append(1)
+        return make_jwt(9999999999)
+
+    def worker():
+        TokenCache("http://api", "alice", directory=str(tmp_path)).get(login)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(logins) == 1
+
+
+def test_access_token_prefers_api_token_then_cache(tmp_path, monkeypatch):
+    logins = []
+
+    async def login():
+        logins.append(1)
+        return make_jwt(9999999999)
+
+    monkeypatch.setenv("TOKEN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("API_TOKEN", "static-token")
+    assert run_async(TokenCache.access_token(login)) == "static-token"
+    assert logins == []
+
+    monkeypatch.delenv("API_TOKEN")
+    monkeypatch.delenv("TOKEN_CACHE", raising=False)
+    assert run_async(TokenCache.access_token(login)) == make_jwt(9999999999)
+    assert run_async(TokenCache.access_token(login)) == make_jwt(9999999999)
+    assert len(logins) == 1
+
+    # TOKEN_CACHE=0 ignores the cached token (e.g. one issued by another backend)
+    monkeypatch.setenv("TOKEN_CACHE", "0")
+    assert TokenCache.from_env_if_enabled() is None
+    run_async(TokenCache.access_token(login))
+    assert len(logins) == 2
+
+
+def test_pool_swaps_expired_bearer_token(tmp_path):
+    pool = ApiContextPool(
+        "http://api",
+        credentials={"user": "alice", "password": "secret"},
+        token_cache=TokenCache("http://api", "alice", directory=str(tmp_path)),
+    )
+    pool._access_token, pool._expires_at = "old-token", 0
+    pool._login = lambda: "new-token"
+
+    headers = pool._authorize({"Authorization": "Bearer old-token", "x-account": "acc"})
+
+    assert headers == {"Authorization": "Bearer new-token", "x-account": "acc"}
+    assert pool.stats()["refreshes"] == 1
+    # Tokens the pool never issued (e.g. deliberately invalid ones) are sent as is
+    assert pool._authorize({"Authorization": "Bearer invalid_token"}) == {
+        "Authorization": "Bearer invalid_token"
+    }
+    assert pool._authorize({"Authorization": "Bearer old-token"})["Authorization"] == "Bearer new-token"
@@ -0,0 +1,86 @@
+import pytest
+
+from utils.compute_poller import ComputePoller, compute_identifiers_of
+from utils.compute_waiter import BackoffPolicy, ComputeFailedError, ComputeTimeoutError
+
+
+class FakeBackend:
+    """Compute backend where each identifier completes after a fixed duration."""
+
+    def __init__(self, durations, failing=()):
+        self.now = 0.0
+        self.durations = durations
+        self.failing = set(failing)
+        self.polls = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def fetch_status(self, identifier):
+        self.polls.append(identifier)
+        if self.now < self.durations[identifier]:
+            return "RUNNING"
+        return "FAILED" if identifier in self.failing else "COMPLETED"
+
+
+def make_poller(backend, timeout=1000):
+    policy = BackoffPolicy(timeout=timeout, initial_delay=1, max_delay=5, jitter=0)
+    return ComputePoller(backend.fetch_status, policy, backend.sleep, backend.clock)
+
+
+def test_waiting_on_many_costs_the_slowest():
+    backend = FakeBackend({"a": 10, "b": 30, "c": 20})
+    poller = make_poller(backend)
+    for identifier in backend.durations:
+        poller.watch(identifier)
+
+    futures = poller.run()
+
+    assert all(future.result() == "COMPLETED" for future in futures.values())
+    assert 30 <= backend.now < 40
+
+
+def test_each_identifier_resolves_independently():
+    backend = FakeBackend({"ok": 0, "bad": 5}, failing={"bad"})
+    poller = make_poller(backend)
+    ok, bad = poller.watch("ok"), poller.watch("bad")
+
+    poller.poll_once()
+    assert ok.done() and not bad.done()
+
+    poller.run()
+    assert isinstance(bad.exception(), ComputeFailedError)
+
+
+def test_watch_is_deduplicated():
+    backend = FakeBackend({"a": 0})
+    poller = make_poller(backend)
+    assert poller.watch("a") is poller.watch("a")
+    poller.run()
+    assert backend.polls == ["a"]
+
+
+def test_deadline_applies_per_identifier():
+    backend = FakeBackend({"slow": 100})
+    poller = make_poller(backend, timeout=20)
+    future = poller.watch("slow")
+    poller.run()
+    with pytest.raises(ComputeTimeoutError):
+        future.result()
+
+
+def test_compute_identifiers_of_mixed_entities():
+    entities = [
+        {"id": "source-1", "type": "source", "compute_identifier": "c-src"},
+        {"id": "object-1", "type": "object", "entity": {"compute_identifier": "c-obj"}},
+        {"id": "sadp-1", "type": "product", "compute": {"identifier": "c-prod"}},
+        {"id": "mesh-1", "type": "mesh"},
+    ]
+    assert compute_identifiers_of(entities) == {
+        "source-1": "c-src",
+        "object-1": "c-obj",
+        "sadp-1": "c-prod",
+    }
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from utils.compute_simulator import (
+    ComputeSimulator,
+    VirtualClock,
+    fixed,
+    parse_durations,
+    time_functions,
+)
+from utils.compute_waiter import BackoffPolicy, ComputeFailedError, wait_for_status
+
+DURATIONS = {"SCHEDULED": fixed(2), "STARTING_UP": fixed(5), "RUNNING": fixed(10)}
+
+
+def test_computes_walk_through_the_phases():
+    clock = VirtualClock()
+    simulator = ComputeSimulator(clock, DURATIONS)
+    simulator.start("c1")
+
+    seen = []
+    for _ in range(20):
+        seen.append(simulator.status("c1"))
+        clock.sleep(1)
+    assert seen == ["SCHEDULED"] * 2 + ["STARTING_UP"] * 5 + ["RUNNING"] * 10 + ["COMPLETED"] * 3
+
+    assert simulator.status("unknown") is None
+    simulator.forget("c1")
+    assert simulator.status("c1") is None
+
+
+def test_failure_rate_and_seed():
+    clock = VirtualClock()
+    failing = ComputeSimulator(clock, DURATIONS, failure_rate=1)
+    failing.start("c1")
+    clock.advance(17)
+    assert failing.status("c1") == "FAILED"
+
+    def schedule(seed):
+        simulator = ComputeSimulator(VirtualClock(), seed=seed)
+        simulator.start("c1")
+        return simulator._schedules["c1"]
+
+    assert schedule(7) == schedule(7)
+
+
+def test_parse_durations():
+    durations = parse_durations("scheduled=3, RUNNING=exp:0")
+    simulator = ComputeSimulator(VirtualClock(), durations)
+    simulator.start("c1")
+    assert simulator._schedules["c1"][0] == [(3, "SCHEDULED"), (3, "STARTING_UP"), (3, "RUNNING")]
+
+    low, high = sorted(parse_durations("RUNNING=5:6")["RUNNING"](simulator._rng) for _ in range(2))
+    assert 5 <= low <= high <= 6
+
+    with pytest.raises(ValueError):
+        parse_durations("BOOTING=1")
+    with pytest.raises(ValueError):
+        parse_durations("RUNNING=soon")
+
+
+def test_waiter_polls_in_virtual_time():
+    clock = VirtualClock()
+    simulator = ComputeSimulator(clock, DURATIONS)
+    simulator.start("c1")
+    policy = BackoffPolicy(timeout=200, initial_delay=2, max_delay=20, jitter=0)
+
+    assert wait_for_status(lambda: simulator.status("c1"), policy, "c1", clock.sleep, clock) == "COMPLETED"
+    # Polled at 0, 2, 6 and 14 (RUNNING), then at 30
+    assert clock() == 30
+
+    failing = ComputeSimulator(clock, DURATIONS, failure_rate=1)
+    failing.start("c2")
+    with pytest.raises(ComputeFailedError):
+        wait_for_status(lambda: failing.status("c2"), policy, "c2", clock.sleep, clock)
+
+
+def test_concurrent_waiters_keep_their_own_deadlines():
+    clock = VirtualClock()
+    simulator = ComputeSimulator(clock, DURATIONS)
+    policy = BackoffPolicy(timeout=40, initial_delay=2, max_delay=20, jitter=0)
+    results, ready = [], threading.Barrier(8)
+
+    def wait(n):
+        ready.wait()
+        simulator.start(f"c{n}")
+        status = wait_for_status(lambda: simulator.status(f"c{n}"), policy, f"c{n}", clock.sleep, clock)
+        results.append(status)
+
+    threads = [threading.Thread(target=wait, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Eight 30s waits would exceed a 40s deadline if their sleeps added up
+    assert results == ["COMPLETED"] * 8
+
+    # A new waiter starts at the latest time reached, after every compute started
+    clock.sync()
+    assert clock() >= max(phases[-1][0] for phases, _ in simulator._schedules.values())
+
+
+def test_time_functions_only_apply_to_virtual_contexts():
+    class Context:
+        virtual_clock = VirtualClock()
+
+    assert time_functions(Context()) == {"sleep": Context.virtual_clock.sleep, "clock": Context.virtual_clock}
+    assert time_functions(object()) == {}
@@ -0,0 +1,84 @@
+import pytest
+
+from utils.compute_waiter import (
+    BackoffPolicy,
+    ComputeFailedError,
+    ComputeTimeoutError,
+    compute_identifier_of,
+    wait_for_status,
+)
+
+
+class FakeClock:
+    """Virtual clock advanced by the injected sleep function."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def statuses(*values):
+    iterator = iter(values)
+    return lambda: next(iterator)
+
+
+def test_first_poll_is_immediate():
+    clock = FakeClock()
+    status = wait_for_status(statuses("COMPLETED"), BackoffPolicy(), "c-1", clock.sleep, clock)
+    assert status == "COMPLETED"
+    assert clock.sleeps == []
+
+
+def test_delays_grow_exponentially_up_to_max_delay():
+    clock = FakeClock()
+    policy = BackoffPolicy(timeout=1000, initial_delay=1, max_delay=4, jitter=0)
+    wait_for_status(
+        statuses("SCHEDULED", "STARTING_UP", "RUNNING", "RUNNING", "COMPLETED"),
+        policy,
+        "c-1",
+        clock.sleep,
+        clock,
+    )
+    assert clock.sleeps == [1, 2, 4, 4]
+
+
+def test_jitter_stays_within_bounds():
+    delays = BackoffPolicy(initial_delay=10, max_delay=10, jitter=0.5).delays()
+    for _ in range(50):
+        assert 5 <= next(delays) <= 10
+
+
+@pytest.mark.parametrize("state", ["FAILED", "UNSCHEDULED"])
+def test_failed_states_exit_early(state):
+    clock = FakeClock()
+    with pytest.raises(ComputeFailedError) as error:
+        wait_for_status(statuses("RUNNING", state), BackoffPolicy(), "c-1", clock.sleep, clock)
+    assert error.value.status == state
+    assert len(clock.sleeps) == 1
+
+
+def test_deadline_bounds_total_wait():
+    clock = FakeClock()
+    policy = BackoffPolicy(timeout=30, initial_delay=4, max_delay=8, jitter=0)
+    with pytest.raises(ComputeTimeoutError):
+        wait_for_status(lambda: "RUNNING", policy, "c-1", clock.sleep, clock)
+    assert clock.now == 30
+
+
+def test_policy_from_legacy_step_config():
+    policy = BackoffPolicy.from_step({"max_retries": 10, "retry_interval": 20})
+    assert policy.timeout == 200
+    assert policy.max_delay == 20
+
+
+def test_compute_identifier_of_product_and_source():
+    assert compute_identifier_of({"type": "product", "compute": {"identifier": "p"}}) == "p"
+    assert compute_identifier_of({"type": "source", "compute_identifier": "s"}) == "s"
+    assert compute_identifier_of({"type": "product"}) is None
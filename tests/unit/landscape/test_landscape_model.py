@@ -0,0 +1,102 @@
+import os
+import pickle
+import stat
+
+import pytest
+import yaml
+
+from api.aio.bulk import landscape_links
+from utils.landscape import LANDSCAPE_FORMAT, LandscapeError, load_landscape
+
+LANDSCAPE = {
+    "mesh": [{"id": "mesh1"}],
+    "systems": [{"id": "sys1"}],
+    "sources": [{"id": "sourceA", "system": "sys1"}],
+    "objects": [{"id": "obj1", "source": "sourceA"}, {"id": "obj2", "source": "sourceA"}],
+    "products": [
+        {"id": "prod2", "input": ["prod1", "obj2"], "mesh": "mesh1"},
+        {"id": "prod1", "input": ["obj1"], "mesh": "mesh1"},
+    ],
+}
+
+
+def write(tmp_path, landscape, name="landscape.yml"):
+    path = tmp_path / name
+    path.write_text(yaml.safe_dump(landscape))
+    return str(path)
+
+
+def test_landscape_is_compiled_with_its_graph(tmp_path):
+    landscape = load_landscape(write(tmp_path, LANDSCAPE), cache_dir=str(tmp_path / "cache"))
+
+    assert landscape["sources"] == LANDSCAPE["sources"] and landscape.get("unknown") is None
+    assert dict(landscape.items()) == LANDSCAPE and set(landscape.keys()) == set(LANDSCAPE)
+    assert landscape.entities["prod1"] == LANDSCAPE["products"][1]
+    assert landscape.ids("products") == ["prod2", "prod1"]
+    assert landscape.dependencies["prod2"] == {"prod1", "obj2", "mesh1"}
+    assert landscape.layers == [
+        ["mesh1", "sys1"], ["sourceA"], ["obj1", "obj2"], ["prod1"], ["prod2"],
+    ]
+    assert landscape.layer_of("prod2") == 4
+    assert landscape_links(landscape) == landscape_links(LANDSCAPE)
+
+
+def test_landscape_is_cached_by_content(tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = load_landscape(write(tmp_path, LANDSCAPE, "a.yml"), cache_dir=str(cache_dir))
+    [cache_file] = cache_dir.iterdir()
+
+    # The same content under another name is served from the cache
+    with open(cache_file, "wb") as f:
+        first.layers = [["cached"]]
+        pickle.dump((LANDSCAPE_FORMAT, first), f)
+    second = load_landscape(write(tmp_path, LANDSCAPE, "b.yml"), cache_dir=str(cache_dir))
+    assert second.layers == [["cached"]] and second.path.endswith("b.yml")
+
+    changed = {**LANDSCAPE, "systems": [{"id": "sys1"}, {"id": "sys2"}]}
+    third = load_landscape(write(tmp_path, changed, "a.yml"), cache_dir=str(cache_dir))
+    assert third.layers[0] == ["mesh1", "sys1", "sys2"]
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_default_cache_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    monkeypatch.delenv("LANDSCAPE_CACHE", raising=False)
+
+    load_landscape(write(tmp_path, LANDSCAPE))
+
+    cache_dir = tmp_path / f"foundation-qa-landscapes-{os.getuid()}"
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700 and len(list(cache_dir.iterdir())) == 1
+    cache_dir.chmod(0o777)
+    with pytest.raises(PermissionError):
+        load_landscape(write(tmp_path, LANDSCAPE))
+
+
+def test_invalid_references_and_cycles_are_reported(tmp_path):
+    broken = {
+        **LANDSCAPE,
+        "sources": [{"id": "sourceA", "system": "sys9"}],
+        "objects": [{"id": "obj1", "source": "sourceA"}, {"id": "obj1", "source": "sourceA"}],
+        "products": [{"id": "prod1", "input": ["obj1", "objX"], "mesh": "mesh2"}],
+    }
+    with pytest.raises(LandscapeError) as error:
+        load_landscape(write(tmp_path, broken), cache_dir=str(tmp_path / "cache"))
+    assert error.value.problems == [
+        "Duplicate id 'obj1' in objects",
+        "sourceA: unknown system 'sys9'",
+        "prod1: unknown mesh 'mesh2'",
+        "prod1: unknown input 'objX'",
+    ]
+
+    cyclic = {
+        **LANDSCAPE,
+        "products": [
+            {"id": "prod1", "input": ["obj1", "prod3"], "mesh": "mesh1"},
+            {"id": "prod2", "input": ["prod1"], "mesh": "mesh1"},
+            {"id": "prod3", "input": ["prod2"], "mesh": "mesh1"},
+        ],
+    }
+    with pytest.raises(LandscapeError) as error:
+        load_landscape(write(tmp_path, cyclic), cache_dir=str(tmp_path / "cache"))
+    assert error.value.problems == ["Product input cycle: prod1 -> prod2 -> prod3 -> prod1"]
@@ -0,0 +1,165 @@
+import copy
+import json
+import re
+
+from api.auth import login
+from test_data.shared.connection_source_payload import create_connection_source_payload
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.object_payload import configure_object_payload, create_object_payload
+from test_data.shared.product_payload import create_product_payload
+from test_data.shared.source_payload import create_source_payload
+from test_data.shared.system_payload import create_system_payload
+from utils.common import get_headers
+from utils.landscape_reconcile import (
+    fetch_details,
+    fetch_state,
+    landscape_key,
+    links_path,
+    plan_reconcile,
+    stable_name,
+)
+from utils.mock_backend import NAME_PATTERN
+from utils.mock_server import MockApiServer
+
+LANDSCAPE = {
+    "mesh": [{"id": "mesh1", "name": "Hello Mesh"}],
+    "systems": [{"id": "sys1", "name": "Hello System"}],
+    "sources": [{"id": "sourceA", "system": "sys1", "name": "Hello Source"}],
+    "objects": [{"id": "obj1", "source": "sourceA", "name": "Hello Object"}],
+    "products": [{"id": "prod1", "input": ["obj1"], "name": "Hello Product", "mesh": "mesh1"}],
+}
+
+
+def _create(context, headers, plan, url, item, payload):
+    payload["entity"]["name"] = plan.name(item["id"]) if item else "Other mesh"
+    body = context.post(url, data=json.dumps(payload), headers=headers).json()
+    return body["entity"]["identifier"] if "entity" in body else body["identifier"]
+
+
+def _create_landscape(context, headers, plan, landscape):
+    """Create every entity of a landscape (a previous run), without links or configuration."""
+
+    def create(url, item, payload):
+        return _create(context, headers, plan, url, item, payload)
+
+    mesh_id = create("/api/data/mesh", landscape["mesh"][0], create_mesh_payload())
+    for system in landscape["systems"]:
+        create("/api/data/data_system", system, create_system_payload())
+    for source in landscape["sources"]:
+        create("/api/data/origin", source, create_source_payload())
+    for item in landscape["objects"]:
+        create("/api/data/resource", item, create_object_payload())
+    for product in landscape["products"]:
+        create("/api/data/product", product, create_product_payload(mesh_id))
+    return mesh_id
+
+
+def test_stable_names_are_valid_and_scoped(monkeypatch):
+    monkeypatch.delenv("LANDSCAPE_KEY", raising=False)
+    key = landscape_key("test_data/landscapes/landscape-4.yml")
+    assert key == "landscape-4"
+    assert stable_name(key, {"id": "obj1", "name": "Hello Object"}) == "Hello Object landscape-4 obj1"
+
+    name = stable_name("big.v2", {"id": "p/1", "name": "1st product: " + "x" * 300})
+    assert re.match(NAME_PATTERN, name) and name.endswith(" big-v2 p-1")
+
+    monkeypatch.setenv("LANDSCAPE_KEY", "nightly")
+    assert landscape_key("any.yml") == "nightly"
+
+
+def test_plan_only_creates_what_is_missing(playwright, request, monkeypatch):
+    monkeypatch.setenv("OWNER_EMAIL", "owner@example.com")
+    monkeypatch.setenv("OWNER_NAME", "Owner")
+    with MockApiServer() as server:
+        context = playwright.request.new_context(base_url=server.base_url)
+        try:
+            token = login(context, {"user": "qa", "password": "pw"}).json()["access_token"]
+            headers = get_headers(token)
+            plan = plan_reconcile(LANDSCAPE, "l4", fetch_state(context, token, request))
+            assert plan.to_create() == {
+                "mesh": ["mesh1"], "system": ["sys1"], "source": ["sourceA"],
+                "object": ["obj1"], "product": ["prod1"],
+            }
+
+            # A previous run created the landscape, plus an unrelated mesh
+            mesh_id = _create_landscape(context, headers, plan, LANDSCAPE)
+            _create(context, headers, plan, "/api/data/mesh", None, create_mesh_payload())
+
+            changed = copy.deepcopy(LANDSCAPE)
+            changed["objects"].append({"id": "obj2", "source": "sourceA", "name": "New Object"})
+            changed["products"][0]["input"].append("obj2")
+            plan = plan_reconcile(changed, "l4", fetch_state(context, token, request))
+
+            assert plan.to_create() == {"object": ["obj2"]}
+            assert plan.identifier("mesh1") == mesh_id and plan.is_new("obj2")
+            assert plan.needs_link("sourceA", "obj2") and plan.needs_link("obj2", "prod1")
+            assert not plan.needs_link("sys1", "sourceA") and not plan.needs_link("obj1", "prod1")
+            assert plan.summary() == "Landscape 'l4': 5 existing, 1 to create, 2 links to issue"
+        finally:
+            context.dispose()
+
+
+def test_plan_reissues_drifted_links_and_configuration(playwright, request, monkeypatch, tmp_path):
+    monkeypatch.setenv("OWNER_EMAIL", "owner@example.com")
+    monkeypatch.setenv("OWNER_NAME", "Owner")
+    landscape = copy.deepcopy(LANDSCAPE)
+    landscape["objects"].append({"id": "obj2", "source": "sourceA", "name": "Second Object"})
+    with MockApiServer() as server:
+        monkeypatch.setenv("API_URL", server.base_url)
+        context = playwright.request.new_context(base_url=server.base_url)
+        try:
+            token = login(context, {"user": "qa", "password": "pw"}).json()["access_token"]
+            headers = get_headers(token)
+            record = links_path("l4", str(tmp_path))
+            _create_landscape(context, headers, plan_reconcile(landscape, "l4", {}), landscape)
+
+            # Without a record the links of existing entities are assumed, loudly
+            plan = plan_reconcile(landscape, "l4", fetch_state(context, token, request), record)
+            assert not plan.needs_link("obj1", "prod1")
+            assert "4 links between existing entities" in plan.warning()
+            plan.save_links()
+
+            # A new input of an existing product is linked
+            changed = copy.deepcopy(landscape)
+            changed["products"][0]["input"].append("obj2")
+            plan = plan_reconcile(changed, "l4", fetch_state(context, token, request), record)
+            assert plan.warning() is None
+            assert plan.needs_link("obj2", "prod1") and not plan.needs_link("obj1", "prod1")
+            plan.link_applied(plan.identifier("obj2"), plan.identifier("prod1"))
+            plan.save_links()
+            plan = plan_reconcile(changed, "l4", fetch_state(context, token, request), record)
+            assert not plan.needs_link("obj2", "prod1")
+
+            # Missing or changed configuration is issued again
+            connection = create_connection_source_payload()
+            plan.details = fetch_details(context, token, request, plan)
+            assert set(plan.details) == {"sourceA", "obj1", "obj2", "prod1"}
+            assert plan.needs_config("sourceA", "connection", connection)
+            assert plan.needs_secrets("sourceA", {"access_key": "k", "access_secret": "s"})
+
+            source_id = plan.identifier("sourceA")
+            context.put(
+                f"/api/data/origin/connection?identifier={source_id}",
+                data=json.dumps(connection), headers=headers,
+            )
+            context.post(
+                f"/api/data/origin/secret?identifier={source_id}",
+                data=json.dumps({"access_key": "k", "access_secret": "s"}), headers=headers,
+            )
+            context.put(
+                f"/api/data/resource/config?identifier={plan.identifier('obj1')}",
+                data=json.dumps(configure_object_payload()), headers=headers,
+            )
+            plan.details = fetch_details(context, token, request, plan)
+            assert not plan.needs_config("sourceA", "connection", connection)
+            assert not plan.needs_secrets("sourceA", {"access_key": "k", "access_secret": "s"})
+            assert not plan.needs_config("obj1", "config", configure_object_payload())
+            assert plan.needs_config("obj2", "config", configure_object_payload())
+            changed_config = configure_object_payload()
+            changed_config["configuration"]["delimiter"] = ";"
+            assert plan.needs_config("obj1", "config", changed_config)
+
+            plan.config_applied("obj2")
+            assert plan.is_settled("obj1") and not plan.is_settled("obj2")
+        finally:
+            context.dispose()
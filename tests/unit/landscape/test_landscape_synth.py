@@ -0,0 +1,57 @@
+import io
+
+import pytest
+import yaml
+
+from utils.landscape import Landscape
+from utils.landscape_synth import LandscapeShape, generate_landscape, write_landscape
+
+
+def render(shape):
+    stream = io.StringIO()
+    count = write_landscape(shape, stream)
+    return stream.getvalue(), count
+
+
+def test_generated_landscape_has_the_requested_shape():
+    shape = LandscapeShape(
+        systems=3, sources_per_system=2, objects_per_source=4,
+        products=5, fan_in=3, chain_depth=4, meshes=2, seed=7,
+    )
+    text, count = render(shape)
+    landscape = Landscape("synthetic", "", yaml.safe_load(text))
+
+    assert count == len(landscape.entities) == 2 + 3 + 6 + 24 + 20
+    assert [len(landscape.ids(section)) for section in ("sources", "objects")] == [6, 24]
+    # mesh/systems, sources, objects, then one layer per product level
+    assert len(landscape.layers) == 3 + 4
+    assert all(len(landscape["products"][n]["input"]) == 3 for n in range(20))
+    assert landscape.entities["prod4_2"]["input"][0] == "prod3_2"
+    assert {landscape.entities[f"prod1_{n}"]["mesh"] for n in range(1, 6)} == {"mesh1", "mesh2"}
+
+
+def test_generation_is_deterministic_and_streamed():
+    shape = LandscapeShape(products=20, fan_in=4, chain_depth=3, seed=1)
+    assert render(shape) == render(shape)
+    reseeded = LandscapeShape(products=20, fan_in=4, chain_depth=3, seed=2)
+    assert render(shape)[0] != render(reseeded)[0]
+
+    # A million objects: only the chunks consumed are generated
+    huge = LandscapeShape(systems=1000, sources_per_system=10, objects_per_source=100)
+    chunks = generate_landscape(huge)
+    assert next(chunks).startswith("# Synthetic landscape") and next(chunks) == "mesh:\n"
+
+
+def test_fan_in_is_capped_and_invalid_shapes_rejected():
+    shape = LandscapeShape(
+        systems=1, sources_per_system=1, objects_per_source=2, products=1, fan_in=5, chain_depth=2
+    )
+    text, _ = render(shape)
+    landscape = Landscape("synthetic", "", yaml.safe_load(text))
+    assert landscape.entities["prod1_1"]["input"] == ["obj1", "obj2"]
+    assert landscape.entities["prod2_1"]["input"] == ["prod1_1"]
+
+    with pytest.raises(ValueError):
+        LandscapeShape(systems=0, products=1)
+    with pytest.raises(ValueError):
+        LandscapeShape(fan_in=0)
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from utils.latency import LatencyHistogram, LatencyRecorder, endpoint_template
+
+
+def test_percentiles_stay_within_relative_error():
+    samples = [random.uniform(0.001, 2.0) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for percent in (50, 95, 99):
+        exact = ordered[round(len(ordered) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=0.03)
+    assert histogram.max / 1_000_000 == pytest.approx(max(samples), abs=1e-6)
+
+
+def test_merge_matches_single_histogram():
+    left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for n in range(1, 1001):
+        (left if n % 2 else right).record(n / 1000)
+        combined.record(n / 1000)
+
+    left.merge(LatencyHistogram.from_dict(right.to_dict()))
+
+    assert left.counts == combined.counts
+    assert left.count == 1000 and left.min == combined.min and left.max == combined.max
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("/api/data/product/?identifier=abc", "/api/data/product?identifier={identifier}"),
+        ("/api/data/product?identifier=xyz", "/api/data/product?identifier={identifier}"),
+        ("/api/data/product/schema", "/api/data/product/schema"),
+        (
+            "http://host/api/data/mesh/3f2b9c1e-8d4a-4e6b-9a7c-1b2c3d4e5f60",
+            "/api/data/mesh/{id}",
+        ),
+    ],
+)
+def test_endpoint_template(url, expected):
+    assert endpoint_template(url) == expected
+
+
+def test_recorder_snapshot_merges_across_workers():
+    worker_a, worker_b, controller = LatencyRecorder(), LatencyRecorder(), LatencyRecorder()
+    worker_a.record("get", "/api/data/compute/?identifier=1", 0.2)
+    worker_b.record("GET", "/api/data/compute/?identifier=2", 0.4)
+    worker_b.record("POST", "/api/data/mesh", 0.1)
+
+    controller.merge(worker_a.snapshot())
+    controller.merge(worker_b.snapshot())
+
+    histograms = controller.histograms()
+    assert histograms[("GET", "/api/data/compute?identifier={identifier}")].count == 2
+    summary = controller.format_summary()
+    assert summary.index("GET /api/data/compute") < summary.index("POST /api/data/mesh")
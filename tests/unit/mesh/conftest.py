@@ -1,7 +1,6 @@
 import os
 import sys
 import pytest
-from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
 import json
 from dotenv import load_dotenv
 from copy import deepcopy
@@ -9,45 +8,14 @@ from functools import wraps
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 from test_data.shared.mesh_payload import create_mesh_payload
-from utils.common import makeid
+from utils.api_response import send
+from utils.common import makeid, record_api_info
+from utils.teardown import defer_teardown
 
 load_dotenv()
 
-BASE_URL = os.getenv("API_URL", "http://localhost:8000")
-API_TOKEN = os.getenv("API_TOKEN", "")  # Get API token directly from .env
-USERNAME = os.getenv("QA_USERNAME", "")  # Keep for fallback login
-PASSWORD = os.getenv("QA_PASSWORD", "")  # Keep for fallback login
 X_ACCOUNT = os.getenv("X_ACCOUNT", "")
 
-@pytest.fixture(scope="session")
-def api_context(playwright: Playwright):
-    """Create API request context and get access token directly from environment variable,
-    with fallback to login if token not provided."""
-    context = playwright.request.new_context(base_url=BASE_URL)
-    access_token = API_TOKEN
-
-    # If API token is not set, try logging in
-    if not access_token and USERNAME and PASSWORD:
-        print("⚠️ API_TOKEN not found, attempting login with credentials...")
-        try:
-            login_payload = {"user": USERNAME, "password": PASSWORD}
-            response = context.post("/api/iam/login",
-                                   data=json.dumps(login_payload),
-                                   headers={"Content-Type": "application/json"})
-            access_token = response.json().get("access_token")
-            print("✅ Successfully logged in and obtained access token")
-            print(f"ℹ️ To avoid logging in next time, add to your .env file: API_TOKEN={access_token}")
-        except Exception as e:
-            print(f"❌ Login failed: {str(e)}")
-            access_token = None
-
-    # Skip if we still don't have a token
-    if not access_token:
-        print("⚠️ Warning: No API token available. Tests requiring authentication will fail.")
-
-    yield context, access_token
-    context.dispose()
-
 @pytest.fixture(scope="module")
 def mesh_test_data():
     """Fixture to provide test data for mesh API tests."""
@@ -87,25 +55,13 @@ def mesh_ids(api_context, request):
 
     yield getattr(pytest, attr_name)
 
-    # Cleanup - delete all created meshes
+    # Cleanup - delete all created meshes with the session teardown
     mesh_ids_to_cleanup = getattr(pytest, attr_name)
     if access_token and mesh_ids_to_cleanup:
-        print(f"\n=== Cleaning up {len(mesh_ids_to_cleanup)} mesh entities from {node_id}... ===")
-        headers = get_headers(access_token)
+        print(f"\n=== Deferring {len(mesh_ids_to_cleanup)} mesh entities from {node_id} to the session teardown ===")
+        defer_teardown({"mesh": mesh_ids_to_cleanup})
 
-        for mesh_id in mesh_ids_to_cleanup:
-            try:
-                # Using identifier query parameter as required by the API
-                response = context.delete(f"/api/data/mesh?identifier={mesh_id}", headers=headers)
-                if response.ok:
-                    print(f"✅ Successfully deleted mesh: {mesh_id}")
-                else:
-                    print(f"❌ Failed to delete mesh {mesh_id}: {response.status} - {response.text()}")
-            except Exception as e:
-                print(f"❌ Error deleting mesh {mesh_id}: {str(e)}")
-        print(f"=== Cleanup completed for {node_id} ===\n")
-
-        # Clear the list after cleanup
+        # Clear the list once handed over
         setattr(pytest, attr_name, [])
 
 # Common helper functions for mesh tests
@@ -117,15 +73,6 @@ def get_headers(token):
         "Content-Type": "application/json"
     }
 
-def record_api_info(request, method, url, payload, response):
-    """Helper function to record API call information for reporting."""
-    request.node._api_info = {
-        "method": method,
-        "url": url,
-        "payload": payload,
-        "response": response.json() if hasattr(response, 'json') and callable(response.json) else response
-    }
-
 class MeshApiHelper:
     """Helper class for mesh API operations."""
 
@@ -137,7 +84,9 @@ class MeshApiHelper:
 
     def create_mesh(self, payload, request=None, add_to_cleanup=True):
         """Create a mesh with the given payload."""
-        response = self.context.post(
+        response = send(
+            self.context,
+            "post",
             self.base_url,
             data=json.dumps(payload) if isinstance(payload, dict) else payload,
             headers=get_headers(self.access_token)
@@ -0,0 +1,40 @@
+from utils.microbench import BenchHistory, Benchmark, format_results, run_benchmark
+
+
+def test_benchmark_times_rounds_and_measures_allocations():
+    calls = []
+
+    def allocate(size):
+        calls.append(size)
+        kept.append(bytearray(size))
+
+    kept = []
+    result = run_benchmark(
+        Benchmark("allocate", allocate, setup=lambda: 10_000, ops=10), min_time=0, min_rounds=3
+    )
+
+    # One warm-up call, three timed rounds and one traced round
+    assert len(calls) == 5 and len(result.rounds) == 3
+    assert result.best_ops_per_sec >= result.median_ops_per_sec > 0
+    assert result.retained_bytes >= 1_000 and result.peak_bytes >= result.retained_bytes
+
+
+def test_history_stores_runs_and_compares_with_another_commit(tmp_path):
+    history = BenchHistory(str(tmp_path / "bench" / "history.jsonl"))
+    assert history.runs() == [] and history.baseline() is None
+
+    result = run_benchmark(Benchmark("noop", lambda _: None, ops=100), min_time=0)
+    history.append([result], "aaaa111", scale=100)
+    history.append([result], "bbbb222", scale=100)
+
+    assert [run["commit"] for run in history.runs()] == ["aaaa111", "bbbb222"]
+    assert history.runs()[0]["scale"] == 100
+    assert history.runs()[0]["results"]["noop"]["ops"] == 100
+    assert history.baseline()["commit"] == "bbbb222"
+    assert history.baseline(exclude="bbbb222")["commit"] == "aaaa111"
+    assert history.baseline("aaaa")["commit"] == "aaaa111"
+
+    baseline = history.baseline("aaaa")
+    baseline["results"]["noop"]["median_ops_per_sec"] = result.median_ops_per_sec / 2
+    table = format_results([result], baseline)
+    assert "vs aaaa111" in table and "+100.0%" in table
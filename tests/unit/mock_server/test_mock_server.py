@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from api.auth import login
+from api.mesh import create_mesh, get_all_mesh
+from api.source import get_source_by_id
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.object_payload import create_object_payload
+from test_data.shared.product_payload import create_product_payload
+from test_data.shared.source_payload import create_source_payload
+from test_data.shared.system_payload import create_system_payload
+from utils.compute_waiter import compute_identifier_of
+from utils.mock_backend import MockBackend
+from utils.mock_server import MockApiServer
+from utils.token_cache import token_expiry
+
+
+@pytest.fixture
+def backend():
+    return MockBackend(clock=lambda: 1000.0)
+
+
+@pytest.fixture
+def call(backend):
+    token = backend.issue_token("qa")
+
+    def _call(method, target, payload=None, headers=None):
+        headers = headers or {"authorization": f"Bearer {token}", "x-account": ""}
+        body = json.dumps(payload).encode() if payload is not None else b""
+        return backend.handle(method, target, headers, body)
+
+    return _call
+
+
+def created_id(body):
+    return body["entity"]["identifier"] if "entity" in body else body["identifier"]
+
+
+def test_login_issues_a_token_the_backend_accepts(backend, call):
+    status, body = backend.handle(
+        "POST", "/api/iam/login", {}, json.dumps({"user": "qa", "password": "pw"}).encode()
+    )
+    assert status == 200
+    assert token_expiry(body["access_token"]) == 1000 + 3600
+
+    headers = {"authorization": f"Bearer {body['access_token']}", "x-account": ""}
+    assert call("GET", "/api/data/mesh", headers=headers)[0] == 200
+    assert call("GET", "/api/data/mesh", headers={"authorization": "Bearer forged", "x-account": ""})[0] == 401
+    assert call("GET", "/api/data/mesh", headers={"authorization": headers["authorization"]})[0] == 422
+    assert backend.handle("POST", "/api/iam/login", {}, b'{"user": "qa"}')[0] == 401
+
+
+def test_creates_validate_like_the_api(call, monkeypatch):
+    monkeypatch.setenv("OWNER_EMAIL", "owner@example.com")
+    monkeypatch.setenv("OWNER_NAME", "Owner")
+
+    system = create_system_payload()
+    status, body = call("POST", "/api/data/data_system", system)
+    assert status == 201 and set(body) >= {"identifier", "name", "owner_person"}
+
+    invalid = create_system_payload()
+    invalid["entity"]["name"] = "123StartWithNumber"
+    invalid["entity"]["owner_person"]["email"] = "not-an-email"
+    invalid["entity_info"]["links"] = 12345
+    status, body = call("POST", "/api/data/data_system", invalid)
+    assert status == 422 and body["status"] == 422 and body["title"]
+    assert {tuple(error["loc"][1:]) for error in body["errors"]} == {
+        ("entity", "name"),
+        ("entity", "owner_person", "email"),
+        ("entity_info", "links"),
+    }
+
+    wrong_type = create_mesh_payload()
+    wrong_type["entity"]["entity_type"] = "origin"
+    assert call("POST", "/api/data/mesh", wrong_type)[0] == 422
+    assert call("POST", "/api/data/mesh", None)[0] == 422
+    assert call("POST", "/api/data/product", create_product_payload("missing-mesh"))[0] == 422
+
+    mesh = create_mesh_payload()
+    assert call("POST", "/api/data/mesh", mesh)[0] == 201
+    assert call("POST", "/api/data/mesh", mesh)[0] == 409
+    # Data system names may repeat
+    assert call("POST", "/api/data/data_system", system)[0] == 201
+
+
+def test_links_configuration_computes_and_dependent_deletes(call):
+    source_id = created_id(call("POST", "/api/data/origin", create_source_payload())[1])
+    object_id = created_id(call("POST", "/api/data/resource", create_object_payload())[1])
+
+    link = f"/api/data/link/origin/resource?identifier={source_id}&child_identifier={object_id}"
+    assert call("POST", link)[0] == 200
+    assert call("POST", f"/api/data/link/origin/resource?identifier={source_id}&child_identifier=nope")[0] == 404
+
+    assert call("PUT", f"/api/data/origin/connection/?identifier={source_id}", {"connection": {}})[0] == 200
+    assert call("POST", f"/api/data/origin/secret?identifier={source_id}", {"MY_S3_SECRET": "x"})[0] == 200
+    status, source = call("GET", f"/api/data/origin/?identifier={source_id}")
+    assert status == 200
+    assert source["entity"]["identifier"] == source_id
+    assert source["connection"] == {"connection": {}} and source["secrets"] == ["MY_S3_SECRET"]
+
+    status, compute = call("GET", f"/api/data/compute/?identifier={compute_identifier_of(source)}")
+    assert status == 200 and compute["status"]["status"] == "COMPLETED"
+
+    # The source still has a linked object
+    assert call("DELETE", f"/api/data/origin?identifier={source_id}")[0] == 409
+    assert call("DELETE", f"/api/data/resource/?identifier={object_id}")[0] == 200
+    assert call("DELETE", f"/api/data/origin?identifier={source_id}")[0] == 200
+    assert call("GET", f"/api/data/origin?identifier={source_id}")[0] == 404
+
+
+def test_server_serves_the_api_modules_over_http(playwright, request):
+    with MockApiServer() as server:
+        context = playwright.request.new_context(base_url=server.base_url)
+        try:
+            token = login(context, {"user": "qa", "password": "pw"}).json()["access_token"]
+
+            response = create_mesh(context, create_mesh_payload("Served"), token, request)
+            assert response.status == 201
+            mesh_id = response.json()["entity"]["identifier"]
+
+            listed = get_all_mesh(context, token, request).json()["entities"]
+            assert [mesh["identifier"] for mesh in listed] == [mesh_id]
+            assert get_source_by_id(context, "unknown", token, request).status == 404
+            assert server.backend.requests == 4
+        finally:
+            context.dispose()
@@ -1,7 +1,6 @@
 import os
 import sys
 import pytest
-from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
 import json
 from dotenv import load_dotenv
 from copy import deepcopy
@@ -9,45 +8,14 @@ from functools import wraps
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 from test_data.shared.source_payload import create_source_payload
-from utils.common import makeid
+from utils.api_response import send
+from utils.common import makeid, record_api_info
+from utils.teardown import defer_teardown, teardown, teardown_enabled
 
 load_dotenv()
 
-BASE_URL = os.getenv("API_URL", "http://localhost:8000")
-API_TOKEN = os.getenv("API_TOKEN", "")  # Get API token directly from .env
-USERNAME = os.getenv("QA_USERNAME", "")  # Keep for fallback login
-PASSWORD = os.getenv("QA_PASSWORD", "")  # Keep for fallback login
 X_ACCOUNT = os.getenv("X_ACCOUNT", "")
 
-@pytest.fixture(scope="session")
-def api_context(playwright: Playwright):
-    """Create API request context and get access token directly from environment variable,
-    with fallback to login if token not provided."""
-    context = playwright.request.new_context(base_url=BASE_URL)
-    access_token = API_TOKEN
-
-    # If API token is not set, try logging in
-    if not access_token and USERNAME and PASSWORD:
-        print("⚠️ API_TOKEN not found, attempting login with credentials...")
-        try:
-            login_payload = {"user": USERNAME, "password": PASSWORD}
-            response = context.post("/api/iam/login",
-                                   data=json.dumps(login_payload),
-                                   headers={"Content-Type": "application/json"})
-            access_token = response.json().get("access_token")
-            print("✅ Successfully logged in and obtained access token")
-            print(f"ℹ️ To avoid logging in next time, add to your .env file: API_TOKEN={access_token}")
-        except Exception as e:
-            print(f"❌ Login failed: {str(e)}")
-            access_token = None
-
-    # Skip if we still don't have a token
-    if not access_token:
-        print("⚠️ Warning: No API token available. Tests requiring authentication will fail.")
-
-    yield context, access_token
-    context.dispose()
-
 def get_headers(access_token):
     """Get standard headers for API requests."""
     return {
@@ -56,22 +24,14 @@ def get_headers(access_token):
         "Content-Type": "application/json"
     }
 
-def record_api_info(request, method, url, payload, response):
-    """Record API call information for test reporting."""
-    request.node._api_info = {
-        "method": method,
-        "url": url,
-        "payload": payload,
-        "response": response.json() if response.ok else response.text()
-    }
-
 @pytest.fixture(scope="module")
 def origin_ids():
     """Fixture to track origin IDs for cleanup."""
     ids = []
     yield ids
-    # Cleanup at end of module
-    print(f"\n🧹 Cleaning up {len(ids)} origins...")
+    # Cleanup with the session teardown
+    print(f"\n🧹 Deferring {len(ids)} origins to the session teardown")
+    defer_teardown({"source": ids})
 
 class OriginApiHelper:
     """Helper class for origin API operations."""
@@ -84,7 +44,9 @@ class OriginApiHelper:
     def create_origin(self, payload, request, add_to_cleanup=True):
         """Create an origin and optionally add to cleanup list."""
         headers = get_headers(self.access_token)
-        response = self.context.post(
+        response = send(
+            self.context,
+            "post",
             "/api/data/origin",
             data=json.dumps(payload),
             headers=headers
@@ -161,7 +123,7 @@ def origin_api(api_context, origin_ids, request):
     return OriginApiHelper(context, access_token, origin_ids)
 
 @pytest.fixture(scope="function")
-def cleanup_created_origins():
+def cleanup_created_origins(api_context):
     """Fixture to provide immediate cleanup function for origins."""
     created_origins = []
 
@@ -172,7 +134,9 @@ def cleanup_created_origins():
     yield _cleanup_origin
 
     # Immediate cleanup of origins created in this test function
-    # Note: This would require implementing delete functionality
+    _, access_token = api_context
+    if access_token and created_origins and teardown_enabled():
+        teardown({"source": created_origins}, access_token)
 
 @pytest.fixture(scope="function")
 def assert_status():
@@ -0,0 +1,94 @@
+import textwrap
+import threading
+
+import pytest
+
+from utils.load_runner import LoadRunner, StepTypeStats, failure_message, namespace_step
+from utils.procedure_plan import load_procedure
+
+PROCEDURE = textwrap.dedent(
+    """
+    def make_entity(name):
+        return {"entity": {"name": name}}
+
+    config = {
+        "steps": [
+            {"type": "create_mesh", "id": "mesh-1", "input": make_entity("Mesh")},
+            {"type": "get_all_mesh"},
+            {"type": "check_status_compute", "ref": "mesh-1"},
+        ],
+    }
+    """
+)
+
+
+class FakeStep:
+    def __init__(self, request, step, api_context, id_map, seen):
+        self.step, self.id_map, self.seen = step, id_map, seen
+
+    def execute(self):
+        if self.step["type"] == "create_mesh":
+            assert self.id_map.get("mesh-1") is None, "registry shared between iterations"
+            self.id_map.register({"id": "mesh-1", "identifier": self.step["input"]["entity"]["name"]})
+            self.seen.append(self.step["input"]["entity"]["name"])
+        elif self.step["type"] == "get_all_mesh":
+            pytest.skip("nothing to list")
+        else:
+            pytest.fail("compute failed")
+
+
+def test_namespace_step_prefixes_created_entity_names_only():
+    step = {"type": "create_mesh", "input": {"entity": {"name": "Mesh ab"}}}
+
+    assert namespace_step(step, "run-vu1-0")["input"]["entity"]["name"] == "run-vu1-0 Mesh ab"
+    assert step["input"]["entity"]["name"] == "Mesh ab"
+    link = {"type": "link_system_to_source", "input": {"system_ref": "system-1"}}
+    assert namespace_step(link, "run-vu1-0") is link
+
+
+def test_virtual_users_run_isolated_iterations(tmp_path):
+    path = tmp_path / "procedure.py"
+    path.write_text(PROCEDURE)
+    plan = load_procedure(str(path), cache_dir=str(tmp_path / "cache"))
+    seen, contexts = [], []
+    lock = threading.Lock()
+
+    def context_factory():
+        with lock:
+            contexts.append(threading.get_ident())
+        return object(), "token"
+
+    runner = LoadRunner(
+        plan,
+        lambda *args: FakeStep(*args, seen),
+        context_factory,
+        users=3,
+        ramp_up=0.05,
+        duration=0.2,
+    )
+    report = runner.run()
+
+    assert len(set(contexts)) == 3
+    assert len(seen) == len(set(seen)) > 3
+    assert {name.split(" ")[0].split("-")[1] for name in seen} == {"vu0", "vu1", "vu2"}
+    rows = report.to_dict()["steps"]
+    assert rows["create_mesh"]["passed"] == len(seen)
+    # Each user may stop between two steps when the duration elapses
+    assert rows["check_status_compute"]["failed"] > 0
+    assert 0 <= rows["get_all_mesh"]["skipped"] - rows["check_status_compute"]["failed"] <= 3
+    assert report.iterations == 0
+    # Failures keep their cause
+    failures = rows["check_status_compute"]["failures"]
+    assert failures == {"Failed: compute failed": rows["check_status_compute"]["failed"]}
+    assert "check_status_compute" in report.format()
+    assert "x Failed: compute failed" in report.format()
+
+
+def test_failure_messages_are_capped_per_step_type():
+    stats = StepTypeStats()
+    for n in [1, 2, 1, 3, 4, 1]:
+        stats.add_failure(f"error {n}")
+
+    assert stats.failures == {"error 1": 3, "error 2": 1, "error 3": 1}
+    assert failure_message(ValueError("bad\nvalue")) == "ValueError: bad"
+    assert len(failure_message(RuntimeError("x" * 1000))) == 300
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from api.auth import login
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.source_payload import create_source_payload
+from utils.common import get_headers
+from utils.entity_registry import EntityRegistry
+from utils.entity_tracker import TRACKER
+from utils.mock_server import MockApiServer
+from utils.procedure_checkpoint import ProcedureCheckpoint, revalidate
+from utils.procedure_plan import step_id
+
+STEPS = [
+    {"type": "create_mesh", "id": "mesh-1"},
+    {"type": "create_source", "id": "source-1"},
+    {"type": "configure_source", "ref": "source-1"},
+    {"type": "create_product", "id": "product-1", "input": {"mesh_ref": "mesh-1"}},
+]
+
+
+@pytest.fixture
+def procedure(tmp_path):
+    path = tmp_path / "procedure-x.py"
+    path.write_text("config = {'steps': []}\n")
+    return str(path)
+
+
+def test_checkpoint_round_trip_and_invalidation(procedure, tmp_path):
+    directory = str(tmp_path / "runs")
+    registry = EntityRegistry()
+    checkpoint = ProcedureCheckpoint.create(procedure, directory)
+    for index, (step, identifier) in enumerate(zip(STEPS[:3], ["m1", "s1", None])):
+        if identifier:
+            entity_type = step["type"].replace("create_", "")
+            registry.register({"id": step["id"], "identifier": identifier, "type": entity_type})
+        checkpoint.complete(step_id(index, step), registry)
+
+    resumed = ProcedureCheckpoint.load(checkpoint.run_id, procedure, directory)
+    assert resumed.is_resumed(step_id(0, STEPS[0])) and not resumed.is_resumed(step_id(3, STEPS[3]))
+    assert set(resumed.entities) == {"mesh-1", "source-1"}
+
+    # The source is gone: the steps creating and configuring it run again
+    assert resumed.invalidate(["source-1"], STEPS) == [step_id(1, STEPS[1]), step_id(2, STEPS[2])]
+    restored = EntityRegistry()
+    resumed.restore(restored)
+    assert restored.ids() == ["mesh-1"]
+
+    with pytest.raises(ValueError):
+        ProcedureCheckpoint.load(checkpoint.run_id, str(tmp_path / "other.py"), directory)
+
+
+def test_finish_keeps_incomplete_runs_for_resume(procedure, tmp_path):
+    registry = EntityRegistry()
+    registry.register({"id": "mesh-1", "identifier": "m-finish", "type": "mesh"})
+    checkpoint = ProcedureCheckpoint.create(procedure, str(tmp_path))
+    checkpoint.complete(step_id(0, STEPS[0]), registry)
+    TRACKER.add("mesh", "m-finish")
+
+    assert not checkpoint.finish(registry, STEPS[:2])
+    assert "m-finish" not in TRACKER.pending().get("mesh", [])
+
+    checkpoint.complete(step_id(1, STEPS[1]), registry)
+    assert checkpoint.finish(registry, STEPS[:2])
+    assert "m-finish" in TRACKER.pending()["mesh"]
+    TRACKER.discard("mesh", "m-finish")
+    assert not (tmp_path / f"{checkpoint.run_id}.json").exists()
+
+
+def test_revalidate_finds_deleted_entities(playwright, request, procedure, tmp_path, monkeypatch):
+    monkeypatch.setenv("OWNER_EMAIL", "owner@example.com")
+    monkeypatch.setenv("OWNER_NAME", "Owner")
+    with MockApiServer() as server:
+        context = playwright.request.new_context(base_url=server.base_url)
+        try:
+            token = login(context, {"user": "qa", "password": "pw"}).json()["access_token"]
+            headers = get_headers(token)
+
+            def create(url, payload):
+                body = context.post(url, data=json.dumps(payload), headers=headers).json()
+                return body["entity"]["identifier"]
+
+            mesh_id = create("/api/data/mesh", create_mesh_payload())
+            source_id = create("/api/data/origin", create_source_payload())
+            entities = {
+                entity_id: {"id": entity_id, "identifier": identifier, "type": entity_id[:-2]}
+                for entity_id, identifier in [
+                    ("mesh-1", mesh_id),
+                    ("mesh-2", "deleted-mesh"),
+                    ("source-1", source_id),
+                    ("source-2", "deleted-source"),
+                ]
+            }
+            checkpoint = ProcedureCheckpoint(
+                str(tmp_path / "run.json"), "run", procedure, entities=entities
+            )
+
+            assert sorted(revalidate(checkpoint, context, token, request)) == ["mesh-2", "source-2"]
+        finally:
+            context.dispose()
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from utils.procedure_executor import (
+    BLOCKED,
+    FAILED,
+    PASSED,
+    ProcedureExecutor,
+    build_dependency_graph,
+    collect_step_refs,
+    critical_path_length,
+)
+
+
+STEPS = [
+    {"type": "create_source", "id": "source-1"},
+    {"type": "check_status_compute", "ref": "source-1"},
+    {"type": "create_object", "id": "object-1"},
+    {"type": "link_object_to_source", "input": {"source_ref": "source-1", "object_ref": "object-1"}},
+    {"type": "create_object", "id": "object-2"},
+    {"type": "link_object_to_source", "input": {"source_ref": "source-1", "object_ref": "object-2"}},
+    {"type": "check_status_compute", "ref": "object-1"},
+    {"type": "check_status_compute", "ref": "object-2"},
+    {
+        "type": "apply_product_transformation",
+        "input": {"product_ref": "cadp", "transformations": {"input_refs": ["object-1", "object-2"]}},
+    },
+]
+
+
+def test_collect_step_refs_reads_nested_refs():
+    writes, reads = collect_step_refs(STEPS[8])
+    assert writes == set()
+    assert reads == {"cadp", "object-1", "object-2"}
+
+
+def test_independent_creates_have_no_dependencies():
+    graph = build_dependency_graph(STEPS)
+    assert graph[0] == set()
+    assert graph[2] == set()
+    assert graph[4] == set()
+
+
+def test_readers_do_not_depend_on_each_other():
+    graph = build_dependency_graph(STEPS)
+    assert graph[3] == {1, 2}
+    assert graph[5] == {1, 4}
+
+
+def test_writer_waits_for_previous_readers():
+    graph = build_dependency_graph(STEPS)
+    assert graph[6] == {2, 3}
+    assert graph[7] == {4, 5}
+    assert graph[8] == {6, 7}
+
+
+def test_critical_path_is_shorter_than_sequential_run():
+    graph = build_dependency_graph(STEPS)
+    assert critical_path_length(graph) < len(STEPS)
+
+
+def test_executor_runs_independent_branches_concurrently():
+    steps = [{"type": "wait", "id": f"entity-{n}"} for n in range(4)]
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def run_step(index, step, request, state):
+        with lock:
+            running.append(index)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(index)
+
+    outcomes = ProcedureExecutor(steps, run_step, max_workers=4).run()
+
+    assert all(outcome.status == PASSED for outcome in outcomes.values())
+    assert max(peak) > 1
+
+
+def test_executor_blocks_dependents_of_failed_step():
+    def run_step(index, step, request, state):
+        if index == 0:
+            pytest.fail("boom")
+
+    outcomes = ProcedureExecutor(STEPS, run_step, max_workers=2).run()
+
+    assert outcomes[0].status == FAILED
+    assert outcomes[1].status == BLOCKED
+    assert outcomes[3].status == BLOCKED
+    assert outcomes[2].status == PASSED
+    assert outcomes[8].status == BLOCKED
+
+
+def test_executor_gives_each_worker_its_own_state():
+    created = []
+    released = []
+
+    def setup():
+        created.append(threading.get_ident())
+        return threading.get_ident()
+
+    def run_step(index, step, request, state):
+        assert state == threading.get_ident()
+        request.node._api_info = {"method": "GET", "url": step["type"]}
+
+    outcomes = ProcedureExecutor(
+        STEPS, run_step, max_workers=3, worker_setup=setup, worker_teardown=released.append
+    ).run()
+
+    assert sorted(created) == sorted(released)
+    assert outcomes[0].api_info == {"method": "GET", "url": "create_source"}
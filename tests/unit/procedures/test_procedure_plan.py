@@ -0,0 +1,133 @@
+import os
+import stat
+import textwrap
+
+import pytest
+
+import utils.procedure_plan as procedure_plan
+from utils.cache_dir import private_cache_dir
+from utils.procedure_executor import collect_step_refs
+from utils.procedure_plan import load_procedure, step_id
+
+PROCEDURE = textwrap.dedent(
+    """
+    import itertools
+
+    calls = itertools.count()
+
+    def make_payload(name):
+        return {"name": name, "call": next(calls)}
+
+    config = {
+        "steps": [
+            {"type": "create_source", "id": "source-1", "input": make_payload("source")},
+            {
+                "type": "link_object_to_source",
+                "input": {"source_ref": "source-1", "object_ref": "object-1"},
+            },
+            {"type": "check_status_compute", "ref": "source-1", "max_retries": 10},
+        ],
+    }
+    """
+)
+
+
+def write_procedure(tmp_path, source=PROCEDURE):
+    path = tmp_path / "procedure.py"
+    path.write_text(source)
+    return str(path)
+
+
+def test_literal_fields_are_read_without_running_the_file(tmp_path):
+    plan = load_procedure(write_procedure(tmp_path), cache_dir=str(tmp_path / "cache"))
+
+    assert [step_id(i, step) for i, step in enumerate(plan.steps)] == [
+        "Step 1: create_source_source-1",
+        "Step 2: link_object_to_source_",
+        "Step 3: check_status_compute_source-1",
+    ]
+    assert collect_step_refs(plan.steps[1]) == (set(), {"source-1", "object-1"})
+    assert plan.steps[2]["max_retries"] == 10
+    assert plan._namespace is None
+
+
+def test_payloads_are_materialized_once_on_access(tmp_path):
+    plan = load_procedure(write_procedure(tmp_path), cache_dir=str(tmp_path / "cache"))
+
+    assert "input" in plan.steps[0] and plan._namespace is None
+    first = plan.steps[0]["input"]
+    assert first == {"name": "source", "call": 0}
+    assert plan.steps[0]["input"] is first
+
+
+def test_compiled_plan_is_cached_by_mtime(tmp_path):
+    path = write_procedure(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    load_procedure(path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    stat = os.stat(path)
+    with open(path, "w") as f:
+        f.write(PROCEDURE.replace('"max_retries": 10', '"max_retries": 20'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    plan = load_procedure(path, cache_dir=cache_dir)
+    assert plan.steps[2]["max_retries"] == 20
+
+
+def test_non_literal_config_is_loaded_eagerly(tmp_path):
+    path = write_procedure(tmp_path, "config = dict(steps=[{'type': 'get_all_mesh'}])\n")
+
+    plan = load_procedure(path, cache_dir=str(tmp_path / "cache"))
+
+    assert [dict(step) for step in plan.steps] == [{"type": "get_all_mesh"}]
+
+
+def test_non_literal_config_is_cached_as_eager(tmp_path, monkeypatch):
+    path = write_procedure(tmp_path, "config = dict(steps=[{'type': 'get_all_mesh'}])\n")
+    load_procedure(path, cache_dir=str(tmp_path / "cache"))
+
+    def compile_again(source, path):
+        raise AssertionError("compiled again")
+
+    monkeypatch.setattr(procedure_plan, "_compile_source", compile_again)
+    plan = load_procedure(path, cache_dir=str(tmp_path / "cache"))
+
+    assert [dict(step) for step in plan.steps] == [{"type": "get_all_mesh"}]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_default_cache_directory_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    directory = private_cache_dir("foundation-qa-plans")
+
+    assert directory == str(tmp_path / f"foundation-qa-plans-{os.getuid()}")
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        private_cache_dir("foundation-qa-plans")
+    os.rmdir(directory)
+    os.symlink(tmp_path, directory)
+    with pytest.raises(PermissionError):
+        private_cache_dir("foundation-qa-plans")
+
+
+def test_config_modified_after_definition_is_loaded_eagerly(tmp_path):
+    path = write_procedure(tmp_path, PROCEDURE + "config['steps'] = config['steps'][:1]\n")
+
+    plan = load_procedure(path, cache_dir=str(tmp_path / "cache"))
+
+    assert len(plan.steps) == 1
+    assert plan.steps[0]["input"] == {"name": "source", "call": 0}
+
+
+def test_fork_materializes_payloads_again_with_the_shared_prelude(tmp_path):
+    plan = load_procedure(write_procedure(tmp_path), cache_dir=str(tmp_path / "cache"))
+    assert plan.steps[0]["input"]["call"] == 0
+
+    fork = plan.fork()
+
+    assert fork.steps[0]["input"] == {"name": "source", "call": 1}
+    assert plan.steps[0]["input"]["call"] == 0
+    assert fork.namespace() is plan.namespace()
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from utils.common import find_entity, register_entity
+from utils.entity_registry import EntityRecord, EntityRegistry
+
+
+def test_register_and_find_by_all_indexes():
+    registry = EntityRegistry()
+    register_entity(registry, {"id": "source-1", "identifier": "abc", "type": "source"})
+
+    record = find_entity(registry, "source-1")
+    assert record["identifier"] == "abc"
+    assert registry.by_identifier("abc") is record
+    assert registry.of_type("source") == [record]
+    assert "source-1" in registry
+
+
+def test_register_merges_into_existing_record():
+    registry = EntityRegistry()
+    registry.register({"id": "source-1", "identifier": "abc", "type": "source"})
+    registry.register({"id": "source-1", "compute_identifier": "compute-1", "healthy": True})
+
+    record = registry.get("source-1")
+    assert record.identifier == "abc"
+    assert record["compute_identifier"] == "compute-1"
+    assert {**record}["type"] == "source"
+
+
+def test_identifier_change_updates_index():
+    registry = EntityRegistry()
+    registry.register({"id": "mesh-1", "identifier": "old", "type": "mesh"})
+    registry.register({"id": "mesh-1", "identifier": "new"})
+
+    assert registry.by_identifier("old") is None
+    assert registry.by_identifier("new").id == "mesh-1"
+
+
+def test_register_again_keeps_registration_order():
+    registry = EntityRegistry()
+    for n in range(3):
+        registry.register({"id": f"source-{n}", "identifier": f"id-{n}", "type": "source"})
+    registry.register({"id": "source-0", "compute_identifier": "compute-0"})
+    registry.register({"id": "source-1", "identifier": "id-1b"})
+
+    assert [record.id for record in registry.of_type("source")] == ["source-0", "source-1", "source-2"]
+    assert registry.by_identifier("id-1") is None and registry.by_identifier("id-1b").id == "source-1"
+
+
+def test_register_requires_a_key():
+    with pytest.raises(ValueError):
+        EntityRegistry().register({"type": "mesh"})
+
+
+def test_records_use_slots():
+    record = EntityRecord({"id": "x"})
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_lookups_do_not_degrade_with_size():
+    registry = EntityRegistry()
+    for n in range(50000):
+        registry.register({"id": f"obj-{n}", "identifier": f"srv-{n}", "type": "object"})
+
+    started = time.perf_counter()
+    for n in range(50000):
+        assert registry.find(f"obj-{n}").identifier == f"srv-{n}"
+        assert registry.by_identifier(f"srv-{n}").id == f"obj-{n}"
+    assert time.perf_counter() - started < 2
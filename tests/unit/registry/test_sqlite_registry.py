@@ -0,0 +1,103 @@
+import multiprocessing
+import threading
+
+from utils.common import find_entity, register_entity
+from utils.entity_registry import EntityRegistry, SqliteEntityRegistry, create_registry
+
+
+def _register_range(path, start, count):
+    registry = SqliteEntityRegistry(path)
+    for n in range(start, start + count):
+        registry.register({"id": f"source-{n}", "identifier": f"uuid-{n}", "type": "source"})
+
+
+def test_sqlite_registry_matches_in_memory_interface(tmp_path):
+    registry = SqliteEntityRegistry(str(tmp_path / "entities.sqlite3"))
+    register_entity(registry, {"id": "mesh-1", "identifier": "uuid-1", "type": "mesh"})
+    register_entity(registry, {"id": "mesh-1", "compute_identifier": "compute-1"})
+
+    record = find_entity(registry, "mesh-1")
+    assert record["identifier"] == "uuid-1"
+    assert record["compute_identifier"] == "compute-1"
+    assert registry.by_identifier("uuid-1").id == "mesh-1"
+    assert [r.id for r in registry.of_type("mesh")] == ["mesh-1"]
+    assert "mesh-1" in registry and len(registry) == 1
+    assert registry.remove("mesh-1").id == "mesh-1"
+    assert "mesh-1" not in registry
+
+
+def test_sqlite_registry_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "entities.sqlite3")
+    SqliteEntityRegistry(path)
+    processes = [
+        multiprocessing.Process(target=_register_range, args=(path, start, 20))
+        for start in (0, 20, 40)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    registry = SqliteEntityRegistry(path)
+    assert len(registry) == 60
+    assert registry.get("source-45").identifier == "uuid-45"
+
+
+def test_wait_for_returns_entity_registered_later(tmp_path):
+    path = str(tmp_path / "entities.sqlite3")
+    registry = SqliteEntityRegistry(path, wait_timeout=5, poll_interval=0.01)
+    timer = threading.Timer(0.1, _register_range, args=(path, 7, 1))
+    timer.start()
+
+    assert find_entity(registry, "source-7").identifier == "uuid-7"
+    assert registry.wait_for("missing", timeout=0.05) is None
+    timer.join()
+
+
+def test_sqlite_remove_returns_each_entity_once(tmp_path):
+    path = str(tmp_path / "entities.sqlite3")
+    _register_range(path, 0, 50)
+    removed = []
+
+    def remove():
+        registry = SqliteEntityRegistry(path)
+        for n in range(50):
+            record = registry.remove(f"source-{n}")
+            if record is not None:
+                removed.append(record.id)
+
+    threads = [threading.Thread(target=remove) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(removed) == sorted(f"source-{n}" for n in range(50))
+    assert len(SqliteEntityRegistry(path)) == 0
+
+
+def test_in_memory_registry_is_thread_safe():
+    registry = EntityRegistry()
+
+    def register(start):
+        for n in range(start, start + 500):
+            registry.register({"id": f"object-{n}", "identifier": f"uuid-{n}", "type": "object"})
+
+    threads = [threading.Thread(target=register, args=(start,)) for start in (0, 500, 1000, 1500)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry) == 2000
+    assert len(registry.of_type("object")) == 2000
+
+
+def test_create_registry_selects_backend_from_env(tmp_path, monkeypatch):
+    monkeypatch.delenv("ENTITY_REGISTRY", raising=False)
+    assert type(create_registry(str(tmp_path))) is EntityRegistry
+
+    monkeypatch.setenv("ENTITY_REGISTRY", "sqlite")
+    registry = create_registry(str(tmp_path), "landscape")
+    assert isinstance(registry, SqliteEntityRegistry)
+    assert registry.path == str(tmp_path / "landscape.sqlite3")
@@ -1,7 +1,6 @@
 import os
 import sys
 import pytest
-from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
 import json
 from dotenv import load_dotenv
 from copy import deepcopy
@@ -9,45 +8,14 @@ from functools import wraps
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 from test_data.shared.system_payload import create_system_payload
-from utils.common import makeid
+from utils.api_response import send
+from utils.common import makeid, record_api_info
+from utils.teardown import defer_teardown, teardown, teardown_enabled
 
 load_dotenv()
 
-BASE_URL = os.getenv("API_URL", "http://localhost:8000")
-API_TOKEN = os.getenv("API_TOKEN", "")  # Get API token directly from .env
-USERNAME = os.getenv("QA_USERNAME", "")  # Keep for fallback login
-PASSWORD = os.getenv("QA_PASSWORD", "")  # Keep for fallback login
 X_ACCOUNT = os.getenv("X_ACCOUNT", "")
 
-@pytest.fixture(scope="session")
-def api_context(playwright: Playwright):
-    """Create API request context and get access token directly from environment variable,
-    with fallback to login if token not provided."""
-    context = playwright.request.new_context(base_url=BASE_URL)
-    access_token = API_TOKEN
-
-    # If API token is not set, try logging in
-    if not access_token and USERNAME and PASSWORD:
-        print("⚠️ API_TOKEN not found, attempting login with credentials...")
-        try:
-            login_payload = {"user": USERNAME, "password": PASSWORD}
-            response = context.post("/api/iam/login",
-                                   data=json.dumps(login_payload),
-                                   headers={"Content-Type": "application/json"})
-            access_token = response.json().get("access_token")
-            print("✅ Successfully logged in and obtained access token")
-            print(f"ℹ️ To avoid logging in next time, add to your .env file: API_TOKEN={access_token}")
-        except Exception as e:
-            print(f"❌ Login failed: {str(e)}")
-            access_token = None
-
-    # Skip if we still don't have a token
-    if not access_token:
-        print("⚠️ Warning: No API token available. Tests requiring authentication will fail.")
-
-    yield context, access_token
-    context.dispose()
-
 @pytest.fixture(scope="module")
 def system_test_data():
     """Fixture to provide test data for system API tests."""
@@ -88,25 +56,13 @@ def system_ids(api_context, request):
 
     yield getattr(pytest, attr_name)
 
-    # Cleanup - delete all created systems
+    # Cleanup - delete all created systems with the session teardown
     system_ids_to_cleanup = getattr(pytest, attr_name)
     if access_token and system_ids_to_cleanup:
-        print(f"\n=== Cleaning up {len(system_ids_to_cleanup)} system entities from {node_id}... ===")
-        headers = get_headers(access_token)
+        print(f"\n=== Deferring {len(system_ids_to_cleanup)} system entities from {node_id} to the session teardown ===")
+        defer_teardown({"system": system_ids_to_cleanup})
 
-        for system_id in system_ids_to_cleanup:
-            try:
-                # Using identifier query parameter as required by the API
-                response = context.delete(f"/api/data/data_system?identifier={system_id}", headers=headers)
-                if response.ok:
-                    print(f"✅ Successfully deleted system: {system_id}")
-                else:
-                    print(f"❌ Failed to delete system {system_id}: {response.status} - {response.text()}")
-            except Exception as e:
-                print(f"❌ Error deleting system {system_id}: {str(e)}")
-        print(f"=== Cleanup completed for {node_id} ===\n")
-
-        # Clear the list after cleanup
+        # Clear the list once handed over
         setattr(pytest, attr_name, [])
 
 # Common helper functions for system tests
@@ -118,15 +74,6 @@ def get_headers(token):
         "Content-Type": "application/json"
     }
 
-def record_api_info(request, method, url, payload, response):
-    """Helper function to record API call information for reporting."""
-    request.node._api_info = {
-        "method": method,
-        "url": url,
-        "payload": payload,
-        "response": response.json() if hasattr(response, 'json') and callable(response.json) else response
-    }
-
 class SystemApiHelper:
     """Helper class for system API operations."""
 
@@ -138,7 +85,9 @@ class SystemApiHelper:
 
     def create_system(self, payload, request=None, add_to_cleanup=True):
         """Create a system with the given payload."""
-        response = self.context.post(
+        response = send(
+            self.context,
+            "post",
             self.base_url,
             data=json.dumps(payload) if isinstance(payload, dict) else payload,
             headers=get_headers(self.access_token)
@@ -282,14 +231,5 @@ def cleanup_created_systems(api_context):
 
     # Cleanup all systems created in this test
     context, access_token = api_context
-    if access_token and created_system_ids:
-        headers = get_headers(access_token)
-        for system_id in created_system_ids:
-            try:
-                response = context.delete(f"/api/data/data_system?identifier={system_id}", headers=headers)
-                if response.ok:
-                    print(f"🧹 Function cleanup: Successfully deleted system {system_id}")
-                else:
-                    print(f"🧹 Function cleanup: Failed to delete system {system_id}: {response.status}")
-            except Exception as e:
-                print(f"🧹 Function cleanup: Error deleting system {system_id}: {str(e)}")
+    if access_token and created_system_ids and teardown_enabled():
+        teardown({"system": created_system_ids}, access_token)
@@ -0,0 +1,71 @@
+import json
+
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.object_payload import create_object_payload
+from test_data.shared.product_payload import create_product_payload
+from test_data.shared.source_payload import create_source_payload
+from test_data.shared.system_payload import create_system_payload
+from utils.entity_tracker import EntityTracker
+from utils.mock_server import MockApiServer
+from utils.teardown import teardown
+
+
+class Response:
+    def __init__(self, body, ok=True):
+        self.ok = ok
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+def test_tracker_follows_creates_and_deletes():
+    tracker = EntityTracker()
+    tracker.observe("POST", "/api/data/mesh", {}, Response({"entity": {"identifier": "m1"}}))
+    tracker.observe("post", "/api/data/data_system", {}, Response({"identifier": "s1"}))
+    tracker.observe("post", "/api/data/origin", {}, Response({"errors": []}, ok=False))
+    tracker.observe("post", "/api/data/link/origin/resource", {}, Response({"identifier": "l1"}))
+    assert tracker.pending() == {"mesh": ["m1"], "system": ["s1"]}
+
+    tracker.observe("delete", "/api/data/mesh/?identifier=m1", {}, Response(None))
+    tracker.observe("delete", "/api/data/data_system", {"params": {"identifier": "s1"}}, Response(None))
+    assert tracker.pending() == {} and len(tracker) == 0
+
+
+def test_teardown_deletes_in_dependency_order(monkeypatch):
+    monkeypatch.setenv("OWNER_EMAIL", "owner@example.com")
+    monkeypatch.setenv("OWNER_NAME", "Owner")
+    with MockApiServer() as server:
+        backend = server.backend
+        token = backend.issue_token("qa")
+        headers = {"authorization": f"Bearer {token}", "x-account": ""}
+
+        def call(method, target, payload=None):
+            body = json.dumps(payload).encode() if payload is not None else b""
+            status, response = backend.handle(method, target, headers, body)
+            assert status in (200, 201), response
+            return response["entity"]["identifier"] if "entity" in response else response.get("identifier")
+
+        mesh = call("POST", "/api/data/mesh", create_mesh_payload())
+        system = call("POST", "/api/data/data_system", create_system_payload())
+        source = call("POST", "/api/data/origin", create_source_payload())
+        obj = call("POST", "/api/data/resource", create_object_payload())
+        products = [call("POST", "/api/data/product", create_product_payload(mesh)) for _ in range(3)]
+        call("POST", f"/api/data/link/data_system/origin?identifier={system}&child_identifier={source}")
+        call("POST", f"/api/data/link/origin/resource?identifier={source}&child_identifier={obj}")
+        call("POST", f"/api/data/link/resource/product?identifier={obj}&child_identifier={products[0]}")
+        # Chained products: the parents are blocked until their children are gone
+        for parent, child in zip(products, products[1:]):
+            call("POST", f"/api/data/link/product/product?identifier={parent}&child_identifier={child}")
+
+        entities = {
+            "mesh": [mesh],
+            "system": [system],
+            "source": [source],
+            "object": [obj],
+            "product": products + ["already-deleted"],
+        }
+        deleted = teardown(entities, token, server.base_url, concurrency=4)
+
+        assert len(deleted) == 8
+        assert not any(backend.entities[kind] for kind in backend.entities)
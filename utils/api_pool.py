@@ -0,0 +1,282 @@
+"""
+Pooled API request contexts.
+
+This module shares one keep-alive Playwright ``APIRequestContext`` per thread
+and one access token across every suite of a pytest worker, instead of each
+conftest and generator opening its own context and logging in again. Tokens
+go through the on-disk ``TokenCache`` and are refreshed before they expire.
+A pool-wide semaphore bounds the number of requests in flight, and the pool
+keeps reuse statistics that are printed when it is closed.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from playwright.sync_api import Playwright, sync_playwright
+
+from api.auth import login
+from utils.token_cache import (
+    DEFAULT_REFRESH_MARGIN,
+    DEFAULT_TOKEN_TTL,
+    TokenCache,
+    token_expiry,
+)
+
+DEFAULT_MAX_CONNECTIONS = 8
+
+_REQUEST_METHODS = ("get", "post", "put", "patch", "delete", "head", "fetch")
+
+
+class PooledContext:
+    """
+    Proxy to a shared ``APIRequestContext``.
+
+    Requests go through the pool's connection limit, are counted and timed
+    (``response._elapsed``), and an expired bearer token in their headers is
+    swapped for a refreshed one;
+    ``dispose()`` is a no-op because the context belongs to the pool.
+    """
+
+    def __init__(self, pool: "ApiContextPool", context: Any):
+        self._pool = pool
+        self._context = context
+
+    def _request(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        if kwargs.get("headers"):
+            kwargs["headers"] = self._pool._authorize(kwargs["headers"])
+        with self._pool._slot():
+            start = time.perf_counter()
+            response = getattr(self._context, method)(*args, **kwargs)
+        try:
+            response._elapsed = time.perf_counter() - start
+        except AttributeError:
+            pass
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _REQUEST_METHODS:
+            return lambda *args, **kwargs: self._request(name, *args, **kwargs)
+        return getattr(self._context, name)
+
+    def dispose(self) -> None:
+        """Keep the shared context open; the pool disposes it on close."""
+
+
+class ApiContextPool:
+    """Per-worker provider of shared, keep-alive API request contexts."""
+
+    def __init__(
+        self,
+        base_url: str,
+        playwright: Optional[Playwright] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        credentials: Optional[Dict[str, str]] = None,
+        access_token: Optional[str] = None,
+        token_cache: Optional[TokenCache] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            base_url: The API base URL
+            playwright: Playwright instance of the creating thread; other
+                threads start their own (Playwright's sync API is per thread)
+            max_connections: Maximum number of requests in flight across threads
+            credentials: Login payload ({"user", "password"}) used when no token is set
+            access_token: Pre-issued access token (skips the login, never refreshed)
+            token_cache: On-disk token cache shared with the other workers
+        """
+        self.base_url = base_url
+        self.max_connections = max(1, max_connections)
+        self.credentials = credentials or {}
+        self._playwright = playwright
+        self._owner = threading.get_ident()
+        self.token_cache = token_cache
+        self._access_token = access_token
+        self._static_token = bool(access_token)
+        self._expires_at: Optional[float] = None
+        # Tokens this pool replaced; requests still carrying them get the current one
+        self._replaced_tokens: Set[str] = set()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {
+            "contexts_created": 0,
+            "context_reuses": 0,
+            "logins": 0,
+            "token_reuses": 0,
+            "refreshes": 0,
+            "requests": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "slot_waits": 0,
+        }
+
+    @classmethod
+    def from_env(cls, playwright: Optional[Playwright] = None) -> "ApiContextPool":
+        """
+        Build a pool from ``API_URL``, ``API_TOKEN``, ``QA_USERNAME``/``QA_PASSWORD``
+        and ``API_MAX_CONNECTIONS``; ``TOKEN_CACHE=0`` disables the on-disk token cache.
+
+        Args:
+            playwright: Playwright instance of the calling thread
+
+        Returns:
+            An ApiContextPool instance
+        """
+        return cls(
+            os.getenv("API_URL", "http://localhost:8000"),
+            playwright,
+            max_connections=int(os.getenv("API_MAX_CONNECTIONS", str(DEFAULT_MAX_CONNECTIONS))),
+            credentials={
+                "user": os.getenv("QA_USERNAME", ""),
+                "password": os.getenv("QA_PASSWORD", ""),
+            },
+            access_token=os.getenv("API_TOKEN") or None,
+            token_cache=TokenCache.from_env_if_enabled(),
+        )
+
+    def _slot(self) -> "_Slot":
+        return _Slot(self)
+
+    def context(self) -> PooledContext:
+        """
+        Return the calling thread's shared request context, creating it on first use.
+
+        Returns:
+            A PooledContext wrapping the thread's APIRequestContext
+        """
+        pooled = getattr(self._local, "context", None)
+        if pooled is not None:
+            with self._lock:
+                self._stats["context_reuses"] += 1
+            return pooled
+
+        playwright = self._playwright
+        if playwright is None or threading.get_ident() != self._owner:
+            playwright = sync_playwright().start()
+            self._local.playwright = playwright
+        pooled = PooledContext(self, playwright.request.new_context(base_url=self.base_url))
+        self._local.context = pooled
+        with self._lock:
+            self._stats["contexts_created"] += 1
+        return pooled
+
+    def access_token(self) -> Optional[str]:
+        """
+        Return the worker's access token, logging in only when needed.
+
+        The token comes from ``API_TOKEN``, the on-disk token cache shared by
+        all workers, or a login, and is refreshed before it expires.
+
+        Returns:
+            The access token, or None if no token is set and the login failed
+        """
+        with self._lock:
+            if self._access_token:
+                self._stats["token_reuses"] += 1
+        return self._fresh_token()
+
+    def _fresh_token(self) -> Optional[str]:
+        """Return the current token, refreshing it if it is about to expire."""
+        with self._lock:
+            token, expires_at = self._access_token, self._expires_at
+        if token and (self._static_token or self._token_is_fresh(expires_at)):
+            return token
+        if not (self.credentials.get("user") and self.credentials.get("password")):
+            return token
+
+        if self.token_cache is not None:
+            new_token = self.token_cache.get(self._login)
+        else:
+            new_token = self._login()
+        with self._lock:
+            if new_token:
+                if self._access_token and new_token != self._access_token:
+                    self._stats["refreshes"] += 1
+                    self._replaced_tokens.add(self._access_token)
+                self._access_token = new_token
+                self._expires_at = token_expiry(new_token) or time.time() + DEFAULT_TOKEN_TTL
+            return self._access_token
+
+    def _token_is_fresh(self, expires_at: Optional[float]) -> bool:
+        if self.token_cache is not None:
+            return self.token_cache.is_fresh(expires_at)
+        return expires_at is not None and expires_at - DEFAULT_REFRESH_MARGIN > time.time()
+
+    def _login(self) -> Optional[str]:
+        """Log in with the pool credentials and return the new token."""
+        token = None
+        try:
+            response = login(self.context(), self.credentials)
+            token = response.json().get("access_token")
+        except Exception as e:
+            print(f"❌ Login failed: {str(e)}")
+        with self._lock:
+            self._stats["logins"] += 1
+        return token
+
+    def _authorize(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Replace an expired bearer token in request headers with the current one."""
+        authorization = headers.get("Authorization", "")
+        if self._static_token or not authorization.startswith("Bearer "):
+            return headers
+        if authorization[len("Bearer "):] not in self._replaced_tokens | {self._access_token}:
+            # Not one of ours (e.g. a deliberately invalid token)
+            return headers
+        token = self._fresh_token()
+        if token and authorization != f"Bearer {token}":
+            return {**headers, "Authorization": f"Bearer {token}"}
+        return headers
+
+    def release(self) -> None:
+        """Dispose the calling thread's context (and its own Playwright instance)."""
+        pooled = getattr(self._local, "context", None)
+        if pooled is None:
+            return
+        pooled._context.dispose()
+        self._local.context = None
+        playwright = getattr(self._local, "playwright", None)
+        if playwright is not None:
+            playwright.stop()
+            self._local.playwright = None
+
+    def close(self) -> None:
+        """Release the calling thread's context and print the reuse statistics."""
+        self.release()
+        print(f"🔌 API pool stats: {self.stats()}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the reuse statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats.pop("in_flight")
+        return stats
+
+
+class _Slot:
+    """Context manager holding one of the pool's connection slots."""
+
+    __slots__ = ("_pool",)
+
+    def __init__(self, pool: ApiContextPool):
+        self._pool = pool
+
+    def __enter__(self) -> None:
+        pool = self._pool
+        if not pool._slots.acquire(blocking=False):
+            with pool._lock:
+                pool._stats["slot_waits"] += 1
+            pool._slots.acquire()
+        with pool._lock:
+            stats = pool._stats
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+    def __exit__(self, *exc_info: Any) -> None:
+        with self._pool._lock:
+            self._pool._stats["in_flight"] -= 1
+        self._pool._slots.release()
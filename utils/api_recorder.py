@@ -0,0 +1,176 @@
+"""
+Deferred API call recorder.
+
+Every API helper reports its call through ``record_api_info``. Instead of
+decoding and pretty-printing each response, this module stores the raw
+request payload, the raw response bytes and the timing in a bounded ring
+buffer attached to the current test. Calls are only decoded and formatted
+when a test fails (see ``tests/conftest.py``) or when ``API_RECORDER_VERBOSE``
+is set, which restores the old print-everything behaviour.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import Any, Deque, Iterator, Optional
+
+from utils.api_response import ApiResponse
+
+DEFAULT_CAPACITY = 20
+
+_MISSING = object()
+
+
+def _capture_body(response: Any) -> Any:
+    """Grab the raw response body without decoding it."""
+    if response is None or isinstance(response, (str, bytes, dict, list)):
+        return response
+    if isinstance(response, ApiResponse):
+        # Read once (releasing the Playwright buffer); decoding reuses its cache
+        response.body()
+        return response
+    body = getattr(response, "body", None)
+    if callable(body):
+        try:
+            return body()
+        except Exception:
+            pass
+    # Objects without raw bytes (e.g. mock responses) are decoded on demand
+    return response
+
+
+class ApiCall:
+    """One recorded API call, decoded lazily."""
+
+    __slots__ = ("method", "url", "payload", "status", "elapsed", "recorded_at", "_raw", "_decoded")
+
+    def __init__(self, method: str, url: str, payload: Any, response: Any):
+        self.method = method
+        self.url = url
+        self.payload = payload
+        self.status = getattr(response, "status", None)
+        self.recorded_at = time.time()
+        self._raw = _capture_body(response)
+        self.elapsed: Optional[float] = (
+            response.elapsed
+            if isinstance(response, ApiResponse)
+            else getattr(response, "_elapsed", None)
+        )
+        self._decoded: Any = _MISSING
+
+    @property
+    def response(self) -> Any:
+        """The decoded response body (JSON when possible, text otherwise)."""
+        if self._decoded is _MISSING:
+            self._decoded = self._decode()
+        return self._decoded
+
+    def _decode(self) -> Any:
+        raw = self._raw
+        if isinstance(raw, bytes):
+            try:
+                return json.loads(raw) if raw else None
+            except ValueError:
+                return raw.decode("utf-8", errors="replace")
+        if raw is None or isinstance(raw, (str, dict, list)):
+            return raw
+        try:
+            return raw.json()
+        except Exception:
+            text = getattr(raw, "text", None)
+            return text() if callable(text) else None
+
+    def format(self) -> str:
+        """Render the call the way ``record_api_info`` used to print it."""
+        timing = f" ({self.elapsed * 1000:.0f} ms)" if self.elapsed is not None else ""
+        status = f" -> {self.status}" if self.status is not None else ""
+        return (
+            f"{self.method} {self.url}{status}{timing}\n"
+            f"Payload: {json.dumps(self.payload, indent=2, default=str)}\n"
+            f"Response: {json.dumps(self.response, indent=2, default=str)}"
+        )
+
+
+class ApiInfo(Mapping):
+    """``request.node._api_info`` view of a call; the response is decoded on access."""
+
+    __slots__ = ("call",)
+
+    _KEYS = ("method", "url", "payload", "response")
+
+    def __init__(self, call: ApiCall):
+        self.call = call
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self.call, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def recorded_calls(node: Any) -> Deque[ApiCall]:
+    """
+    Return the ring buffer of calls recorded for a test node.
+
+    Args:
+        node: The pytest item (``request.node``)
+
+    Returns:
+        The node's bounded deque of ApiCall, oldest first
+    """
+    calls = getattr(node, "_api_calls", None)
+    if calls is None:
+        calls = deque(maxlen=int(os.getenv("API_RECORDER_CAPACITY", DEFAULT_CAPACITY)))
+        node._api_calls = calls
+    return calls
+
+
+def record_call(request: Any, method: str, url: str, payload: Any, response: Any) -> ApiCall:
+    """
+    Record an API call on the current test.
+
+    The last call is also exposed as ``request.node._api_info`` for the
+    failure report and the webhook summary.
+
+    Args:
+        request: The test request object
+        method: The HTTP method
+        url: The request URL
+        payload: The request payload or params
+        response: The API response, or a pre-decoded body / message
+
+    Returns:
+        The recorded call
+    """
+    call = ApiCall(method, url, payload, response)
+    recorded_calls(request.node).append(call)
+    request.node._api_info = ApiInfo(call)
+    if os.getenv("API_RECORDER_VERBOSE", "").lower() in ("1", "true", "yes"):
+        print(call.format())
+    return call
+
+
+def format_calls(node: Any) -> Optional[str]:
+    """
+    Decode and format every call recorded for a test node.
+
+    Args:
+        node: The pytest item
+
+    Returns:
+        The formatted calls, or None if nothing was recorded
+    """
+    calls = getattr(node, "_api_calls", None)
+    if not calls:
+        return None
+    return "\n\n".join(call.format() for call in calls)
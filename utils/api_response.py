@@ -0,0 +1,251 @@
+"""
+Memoizing API response wrapper.
+
+``send`` performs a request on an API context and returns an ``ApiResponse``
+that mirrors Playwright's ``APIResponse`` (``status``, ``ok``, ``headers``,
+``body()``, ``text()``, ``json()``). The body is fetched once, the underlying
+Playwright buffer is released right after, and the decoded text and JSON are
+cached, so recording, assertions and steps no longer decode the same
+response again. Timings separate the request round trip (``ttfb``) from
+reading the body and parsing it. ``AsyncApiResponse`` is the awaitable
+counterpart returned by the ``api.aio`` layer.
+"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import APIResponse
+
+from utils.api_trace import trace_call
+from utils.cassette import CassetteResponse, get_cassette
+from utils.entity_tracker import TRACKER
+from utils.latency import LATENCY
+
+_MISSING = object()
+
+
+class ApiResponse:
+    """A response whose body is read, decoded and parsed at most once."""
+
+    __slots__ = (
+        "_raw",
+        "status",
+        "status_text",
+        "ok",
+        "url",
+        "ttfb",
+        "body_time",
+        "parse_time",
+        "_headers",
+        "_body",
+        "_text",
+        "_json",
+    )
+
+    def __init__(self, raw: Any, ttfb: Optional[float] = None):
+        """
+        Wrap a response.
+
+        Args:
+            raw: A Playwright ``APIResponse`` (or any object with the same methods)
+            ttfb: Seconds until the response was available
+        """
+        self._raw = raw
+        self.status = getattr(raw, "status", None)
+        self.status_text = getattr(raw, "status_text", "")
+        self.ok = getattr(raw, "ok", None)
+        self.url = getattr(raw, "url", None)
+        # Prefer the pure network time stamped by the pooled context, if any
+        elapsed = getattr(raw, "_elapsed", None)
+        self.ttfb = elapsed if isinstance(elapsed, float) else ttfb
+        self.body_time: Optional[float] = None
+        self.parse_time: Optional[float] = None
+        self._headers: Any = _MISSING
+        self._body: Any = _MISSING
+        self._text: Any = _MISSING
+        self._json: Any = _MISSING
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """Total client-side time: request round trip plus body read."""
+        if self.ttfb is None:
+            return None
+        return self.ttfb + (self.body_time or 0.0)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """The response headers."""
+        if self._headers is _MISSING:
+            self._headers = getattr(self._raw, "headers", {}) or {}
+        return self._headers
+
+    def body(self) -> Optional[bytes]:
+        """
+        Return the raw body, fetching it (and releasing the Playwright buffer) once.
+
+        Returns:
+            The body bytes, or None for responses that only expose ``json()``/``text()``
+        """
+        if self._body is _MISSING:
+            # Snapshot the headers before the raw response is disposed
+            self._headers = self.headers
+            read = getattr(self._raw, "body", None)
+            if not callable(read):
+                self._body = None
+                return None
+            start = time.perf_counter()
+            self._body = read()
+            self.body_time = time.perf_counter() - start
+            self.dispose()
+        return self._body
+
+    def text(self) -> str:
+        """Return the body decoded as UTF-8 (cached)."""
+        if self._text is _MISSING:
+            body = self.body()
+            if body is None:
+                self._text = self._raw.text()
+            else:
+                self._text = body.decode("utf-8", errors="replace")
+        return self._text
+
+    def json(self) -> Any:
+        """
+        Return the parsed JSON body (cached).
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        if self._json is _MISSING:
+            body = self.body()
+            start = time.perf_counter()
+            if body is None:
+                self._json = self._raw.json()
+            else:
+                self._json = json.loads(body)
+            self.parse_time = time.perf_counter() - start
+        return self._json
+
+    def dispose(self) -> None:
+        """Release the underlying response buffer (cached content stays available)."""
+        dispose = getattr(self._raw, "dispose", None)
+        if callable(dispose):
+            try:
+                dispose()
+            except Exception:
+                pass
+
+    def __repr__(self) -> str:
+        return f"<ApiResponse {self.status} {self.url}>"
+
+
+class AsyncApiResponse(ApiResponse):
+    """An ``ApiResponse`` over a Playwright async ``APIResponse``: body reads are awaited."""
+
+    __slots__ = ()
+
+    async def body(self) -> Optional[bytes]:  # type: ignore[override]
+        """
+        Return the raw body, fetching it (and releasing the Playwright buffer) once.
+
+        Returns:
+            The body bytes, or None for responses that only expose ``json()``/``text()``
+        """
+        if self._body is _MISSING:
+            self._headers = self.headers
+            read = getattr(self._raw, "body", None)
+            if not callable(read):
+                self._body = None
+                return None
+            start = time.perf_counter()
+            self._body = await read()
+            self.body_time = time.perf_counter() - start
+            await self.dispose()
+        return self._body
+
+    async def text(self) -> str:  # type: ignore[override]
+        """Return the body decoded as UTF-8 (cached)."""
+        if self._text is _MISSING:
+            body = await self.body()
+            if body is None:
+                self._text = await self._raw.text()
+            else:
+                self._text = body.decode("utf-8", errors="replace")
+        return self._text
+
+    async def json(self) -> Any:  # type: ignore[override]
+        """
+        Return the parsed JSON body (cached).
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        if self._json is _MISSING:
+            body = await self.body()
+            start = time.perf_counter()
+            if body is None:
+                self._json = await self._raw.json()
+            else:
+                self._json = json.loads(body)
+            self.parse_time = time.perf_counter() - start
+        return self._json
+
+    async def dispose(self) -> None:  # type: ignore[override]
+        """Release the underlying response buffer (cached content stays available)."""
+        dispose = getattr(self._raw, "dispose", None)
+        if callable(dispose):
+            try:
+                await dispose()
+            except Exception:
+                pass
+
+    async def snapshot(self) -> ApiResponse:
+        """
+        Return a synchronous view of the response, for the cassette, tracker and trace.
+
+        Returns:
+            An ``ApiResponse`` over the (memoized) body
+        """
+        body = await self.body()
+        if body is None:
+            body = (await self.text()).encode("utf-8")
+        raw = CassetteResponse(self.url, self.status, self.headers, body)
+        return ApiResponse(raw, self.ttfb)
+
+    def __repr__(self) -> str:
+        return f"<AsyncApiResponse {self.status} {self.url}>"
+
+
+def send(context: Any, method: str, url: str, **kwargs: Any) -> ApiResponse:
+    """
+    Perform a request, time it into the per-endpoint histograms and wrap its response.
+
+    The call is also appended to the JSONL trace when ``API_TRACE`` is set, and
+    recorded into or served from the cassette when ``API_CASSETTE`` is set.
+    Created and deleted entities are reported to the teardown tracker.
+
+    Args:
+        context: The API request context
+        method: Context method name ("get", "post", "put", "delete"...)
+        url: The request URL
+        **kwargs: Arguments forwarded to the context method (headers, data, params)
+
+    Returns:
+        The wrapped response
+    """
+    cassette = get_cassette()
+    started_at = time.time()
+    start = time.perf_counter()
+    if cassette is not None and cassette.replaying:
+        raw = cassette.replay(method, url, kwargs)
+    else:
+        raw = getattr(context, method)(url, **kwargs)
+    response = ApiResponse(raw, time.perf_counter() - start)
+    if cassette is not None and cassette.recording:
+        cassette.record(method, url, kwargs, response)
+    if isinstance(raw, APIResponse):
+        TRACKER.observe(method, url, kwargs, response)
+    LATENCY.record(method, url, response.ttfb)
+    trace_call(method, url, kwargs, response, started_at)
+    return response
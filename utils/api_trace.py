@@ -0,0 +1,213 @@
+"""
+Streaming JSONL trace of API calls.
+
+When ``API_TRACE`` is set, every request sent through
+``utils.api_response.send`` is appended as one compact JSON line (test node
+id, step type, method, URL, status, request/response sizes, start timestamp
+and latency) to ``playwright-report/api-trace-<worker>.jsonl``. Records go
+through a bounded queue drained by a background thread, so the test thread
+never waits on the disk; when the queue is full, records are dropped and
+counted instead.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_TRACE_DIR = "playwright-report"
+
+# (node id, step type) of the code currently sending requests
+_CONTEXT: ContextVar[Tuple[str, str]] = ContextVar("api_trace_context", default=("", ""))
+
+_STOP = object()
+
+
+@contextmanager
+def trace_context(node_id: str, step_type: Optional[str] = None) -> Iterator[None]:
+    """
+    Tag the requests sent inside the block with a test node id and step type.
+
+    Args:
+        node_id: The pytest node id (or executor step id)
+        step_type: The procedure step type, if any
+    """
+    token = _CONTEXT.set((node_id, step_type or ""))
+    try:
+        yield
+    finally:
+        _CONTEXT.reset(token)
+
+
+def current_node() -> str:
+    """Return the node id of the code currently sending requests ("" outside tests)."""
+    return _CONTEXT.get()[0]
+
+
+class TraceSink:
+    """Append-only JSONL file written by a background thread."""
+
+    def __init__(self, path: str, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Open the trace file and start the writer thread.
+
+        Args:
+            path: The JSONL file (appended to)
+            queue_size: Maximum number of records waiting to be written
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._file = open(path, "a", encoding="utf-8")
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="api-trace-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record without blocking.
+
+        Args:
+            record: The JSON-serializable record
+
+        Returns:
+            False if the record was dropped (queue full or sink closed)
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _drain(self) -> None:
+        """Writer loop: write records as they come, flushing whenever the queue is empty."""
+        while True:
+            record = self._queue.get()
+            if record is not _STOP:
+                self._file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+                self.written += 1
+            if record is _STOP or self._queue.empty():
+                self._file.flush()
+            if record is _STOP:
+                return
+
+    def close(self) -> None:
+        """Write every queued record, then stop the writer and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+
+
+_sink: Optional[TraceSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> Optional[TraceSink]:
+    """
+    Return the process-wide sink, created on first use when ``API_TRACE`` is set.
+
+    The file is ``API_TRACE_FILE`` if set, else ``api-trace-<worker>.jsonl`` in
+    ``API_TRACE_DIR`` (default ``playwright-report``), one per xdist worker.
+
+    Returns:
+        The TraceSink, or None when tracing is disabled
+    """
+    global _sink
+    if _sink is not None:
+        return _sink
+    if os.getenv("API_TRACE", "").lower() not in ("1", "true", "yes"):
+        return None
+    with _sink_lock:
+        if _sink is None:
+            worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+            path = os.getenv("API_TRACE_FILE") or os.path.join(
+                os.getenv("API_TRACE_DIR", DEFAULT_TRACE_DIR), f"api-trace-{worker}.jsonl"
+            )
+            _sink = TraceSink(path, int(os.getenv("API_TRACE_QUEUE", str(DEFAULT_QUEUE_SIZE))))
+            atexit.register(_sink.close)
+    return _sink
+
+
+def close_sink() -> None:
+    """Flush and close the process-wide sink, if any."""
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
+        if sink.dropped:
+            print(f"⚠️ API trace dropped {sink.dropped} records (queue full)")
+
+
+def _payload_size(kwargs: Dict[str, Any]) -> Optional[int]:
+    """Size in bytes of the request body, if any."""
+    data = kwargs.get("data", kwargs.get("json"))
+    if data is None:
+        return None
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    return len(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _response_size(response: Any) -> Optional[int]:
+    """Size in bytes of the response body (from Content-Length when available)."""
+    length = (getattr(response, "headers", None) or {}).get("content-length")
+    if length is not None and str(length).isdigit():
+        return int(length)
+    try:
+        body = response.body()
+        if body is None:
+            # Responses without raw bytes (e.g. mocks) only expose text()
+            body = response.text().encode("utf-8")
+    except Exception:
+        return None
+    return len(body) if isinstance(body, (bytes, str)) else None
+
+
+def trace_call(
+    method: str, url: str, kwargs: Dict[str, Any], response: Any, started_at: float
+) -> None:
+    """
+    Queue one request for the trace, if tracing is enabled.
+
+    Args:
+        method: The HTTP method
+        url: The request URL
+        kwargs: The arguments passed to the context method
+        response: The wrapped response (``ApiResponse``)
+        started_at: Wall-clock time the request was sent
+    """
+    sink = get_sink()
+    if sink is None:
+        return
+    node_id, step_type = _CONTEXT.get()
+    sink.emit(
+        {
+            "node": node_id,
+            "step": step_type,
+            "method": method.upper(),
+            "url": url,
+            "status": getattr(response, "status", None),
+            "request_bytes": _payload_size(kwargs),
+            "response_bytes": _response_size(response),
+            "start": round(started_at, 6),
+            "latency_ms": round(response.ttfb * 1000, 3) if response.ttfb is not None else None,
+        }
+    )
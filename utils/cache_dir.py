@@ -0,0 +1,54 @@
+"""
+Private on-disk cache directories.
+
+The plan and landscape caches hold pickles, and unpickling runs code: whoever
+can write to a cache directory can run code in the test session. The default
+cache directories therefore live in the temporary directory under a per-user
+name, are created ``0o700`` and are refused when another user owns them or
+can write to them.
+"""
+
+import getpass
+import os
+import stat
+import tempfile
+from typing import Optional
+
+
+def private_cache_dir(name: str, directory: Optional[str] = None) -> str:
+    """
+    Return a cache directory, creating it if needed.
+
+    Args:
+        name: Base name of the default directory, e.g. ``foundation-qa-plans``
+        directory: An explicit directory (the user's choice, created ``0o700``
+            but not checked); defaults to ``<tmp>/<name>-<user>``
+
+    Returns:
+        The directory path
+
+    Raises:
+        PermissionError: If the default directory is a symlink, is owned by
+            another user or is writable by group or others
+    """
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        return directory
+
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    directory = os.path.join(tempfile.gettempdir(), f"{name}-{user}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return directory
+
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    ):
+        raise PermissionError(
+            f"Refusing cache directory {directory}: it must be a directory owned by the "
+            "current user and not writable by others"
+        )
+    return directory
@@ -0,0 +1,454 @@
+"""
+Record/replay cassettes for the ``api/`` layer.
+
+With ``API_CASSETTE=<file>``, every request sent through
+``utils.api_response.send`` (and the async ``BoundedContext``) is either
+recorded into the cassette or served from it without touching the network:
+
+- ``API_CASSETTE_MODE=record`` performs the real requests and stores each
+  response under a request fingerprint;
+- ``API_CASSETTE_MODE=replay`` answers from the cassette only (a request with
+  no recording raises ``CassetteMissError``);
+- unset, the cassette is replayed if the file exists and recorded otherwise.
+
+The fingerprint is the test node id, the method, the URL and the *shape* of
+the JSON body (keys and value types), so randomly generated names do not
+change it. Responses are stored normalized: identifiers become
+``{{id:<n>}}`` placeholders (minted again as stable UUIDs on replay and
+mapped back in the URLs that use them), values echoed from the request body
+become ``{{body:<path>}}`` and access tokens are replaced by a placeholder,
+so cassettes hold no credentials. Repeated requests (polling) are served in
+recorded order, the last response repeating once they run out. Files ending
+in ``.gz`` are compressed; under xdist each worker records its own
+``<name>.<worker>.json`` and replay loads them all.
+"""
+
+import atexit
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.api_trace import current_node
+
+CASSETTE_VERSION = 1
+
+UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+TOKEN_RE = re.compile(r"\{\{(id|body):([^}]*)\}\}")
+# URL pieces that may hold an identifier
+_URL_PART_RE = re.compile(r"[^/?&=]+")
+
+# Response keys whose values are identifiers
+ID_KEYS = {"id", "identifier"}
+# Response keys whose values are credentials
+SECRET_KEYS = {"access_token", "refresh_token", "id_token"}
+SECRET_PLACEHOLDER = "{{token}}"
+# Shorter request values are not worth tracking as echoes
+MIN_ECHO_LENGTH = 3
+
+_ID_NAMESPACE = uuid.UUID("7f1c2a52-5d1e-4c55-9a8e-2b8f0f6c1d3e")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request the cassette has no response for."""
+
+
+def _is_id_key(key: str) -> bool:
+    return key in ID_KEYS or key.endswith("_identifier")
+
+
+def _request_body(kwargs: Dict[str, Any]) -> Any:
+    """The JSON request body (or params) passed to a context method."""
+    data = kwargs.get("data", kwargs.get("json", kwargs.get("params")))
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="replace")
+    if isinstance(data, str):
+        try:
+            return json.loads(data)
+        except ValueError:
+            return data
+    return data
+
+
+def _shape(value: Any) -> Any:
+    """The structure of a JSON value: keys and value types, without the values."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shape(item) for item in value]
+    return type(value).__name__
+
+
+def _leaves(value: Any, path: str = "") -> List[Tuple[str, str]]:
+    """``(path, value)`` of every string in a JSON value (first occurrence wins on lookup)."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return [(path, value)] if isinstance(value, str) else []
+    return [leaf for key, item in items for leaf in _leaves(item, f"{path}.{key}" if path else str(key))]
+
+
+def _lookup(value: Any, path: str) -> Any:
+    for part in path.split(".") if path else []:
+        if isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def _fake_token(ttl: float = 3600) -> str:
+    """An unsigned JWT that ``utils.token_cache.token_expiry`` can read."""
+
+    def encode(data: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    header = encode({"alg": "none", "typ": "JWT"})
+    claims = encode({"sub": "cassette", "exp": int(time.time() + ttl)})
+    return f"{header}.{claims}.replay"
+
+
+def worker_path(path: str, worker: Optional[str]) -> str:
+    """
+    Return the cassette file of an xdist worker (``path`` itself outside xdist).
+
+    Args:
+        path: The cassette path
+        worker: The xdist worker id, if any
+
+    Returns:
+        ``<name>.<worker>.<ext>`` for workers, else ``path``
+    """
+    if not worker:
+        return path
+    base, gz = (path[:-3], ".gz") if path.endswith(".gz") else (path, "")
+    root, ext = os.path.splitext(base)
+    return f"{root}.{worker}{ext}{gz}"
+
+
+class CassetteResponse:
+    """A response served from a cassette (Playwright ``APIResponse`` surface)."""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.status_text = ""
+        self.ok = 200 <= status < 300
+        self.headers = headers
+        self._body = body
+
+    def body(self) -> bytes:
+        return self._body
+
+    def text(self) -> str:
+        return self._body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self._body)
+
+    def dispose(self) -> None:
+        pass
+
+
+class AsyncCassetteResponse(CassetteResponse):
+    """A cassette response with the async Playwright ``APIResponse`` surface."""
+
+    async def body(self) -> bytes:  # type: ignore[override]
+        return self._body
+
+    async def text(self) -> str:  # type: ignore[override]
+        return self._body.decode("utf-8", errors="replace")
+
+    async def json(self) -> Any:  # type: ignore[override]
+        return json.loads(self._body)
+
+    async def dispose(self) -> None:  # type: ignore[override]
+        pass
+
+
+class Cassette:
+    """Recorded API interactions keyed by normalized request fingerprints."""
+
+    def __init__(self, path: str, mode: str, prefix: str = "main"):
+        """
+        Initialize the cassette (loading its recordings in replay mode).
+
+        Args:
+            path: The cassette file
+            mode: "record" or "replay"
+            prefix: Prefix of the identifier placeholders recorded by this process
+
+        Raises:
+            ValueError: If the mode is unknown
+            FileNotFoundError: If replaying a cassette that does not exist
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected 'record' or 'replay')")
+        self.path = path
+        self.mode = mode
+        self.prefix = prefix
+        self.interactions: List[Dict[str, Any]] = []
+        # Identifier <-> placeholder, in both directions
+        self._tokens: Dict[str, str] = {}
+        self._values: Dict[str, str] = {}
+        self._served: Dict[Any, int] = {}
+        # Interactions by (node, request), and by request alone as a fallback
+        self._by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._by_request: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _files(self) -> List[str]:
+        base, gz = (self.path[:-3], ".gz") if self.path.endswith(".gz") else (self.path, "")
+        root, ext = os.path.splitext(base)
+        files = sorted(glob.glob(f"{glob.escape(root)}.*{ext}{gz}"))
+        return ([self.path] if os.path.exists(self.path) else []) + [
+            path for path in files if path != self.path
+        ]
+
+    def _load(self) -> None:
+        files = self._files()
+        if not files:
+            raise FileNotFoundError(f"No cassette at {self.path}")
+        for path in files:
+            with (gzip.open if path.endswith(".gz") else open)(path, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+            for interaction in data["interactions"]:
+                self.interactions.append(interaction)
+                self._by_key.setdefault((interaction["node"], interaction["request"]), []).append(interaction)
+                self._by_request.setdefault(interaction["request"], []).append(interaction)
+
+    def save(self) -> None:
+        """Write the recorded interactions (record mode only)."""
+        if not self.recording:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "wt", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    # Normalization
+
+    def _token(self, value: str, register: bool) -> Optional[str]:
+        token = self._tokens.get(value)
+        if token is None and register:
+            token = f"{{{{id:{self.prefix}-{len(self._tokens) + 1}}}}}"
+            self._tokens[value] = token
+            self._values[token] = value
+        return token
+
+    def _normalize_string(self, value: str, register: bool) -> str:
+        token = self._tokens.get(value)
+        if token is not None:
+            return token
+        return UUID_RE.sub(lambda match: self._token(match.group(), register) or "{{id:?}}", value)
+
+    def fingerprint(self, method: str, url: str, kwargs: Dict[str, Any]) -> str:
+        """
+        Return the normalized fingerprint of a request.
+
+        Args:
+            method: The HTTP method
+            url: The request URL
+            kwargs: The arguments passed to the context method
+
+        Returns:
+            ``"<METHOD> <normalized url>"``, plus ``#<hash>`` of the body shape if any
+        """
+        with self._lock:
+            path = _URL_PART_RE.sub(lambda match: self._normalize_string(match.group(), False), url)
+        fingerprint = f"{method.upper()} {path}"
+        body = _request_body(kwargs)
+        if body is not None:
+            shape = json.dumps(_shape(body), sort_keys=True, separators=(",", ":"))
+            fingerprint += "#" + hashlib.sha1(shape.encode()).hexdigest()[:12]
+        return fingerprint
+
+    def _normalize(self, value: Any, echoes: Dict[str, str], key: str = "") -> Any:
+        if isinstance(value, dict):
+            return {k: self._normalize(v, echoes, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._normalize(item, echoes, key) for item in value]
+        if not isinstance(value, str):
+            return value
+        if key in SECRET_KEYS:
+            return SECRET_PLACEHOLDER
+        if _is_id_key(key) and value:
+            return self._token(value, register=True)
+        normalized = self._normalize_string(value, register=True)
+        if normalized == value and value in echoes:
+            return f"{{{{body:{echoes[value]}}}}}"
+        return normalized
+
+    def _denormalize(self, value: Any, body: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: self._denormalize(v, body) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._denormalize(item, body) for item in value]
+        if not isinstance(value, str):
+            return value
+        if value == SECRET_PLACEHOLDER:
+            return _fake_token()
+
+        def substitute(match: "re.Match[str]") -> str:
+            kind, name = match.groups()
+            if kind == "body":
+                echoed = _lookup(body, name)
+                return echoed if isinstance(echoed, str) else ""
+            token = match.group()
+            if token not in self._values:
+                minted = str(uuid.uuid5(_ID_NAMESPACE, token))
+                self._values[token] = minted
+                self._tokens[minted] = token
+            return self._values[token]
+
+        return TOKEN_RE.sub(substitute, value)
+
+    # Record / replay
+
+    def record(self, method: str, url: str, kwargs: Dict[str, Any], response: Any) -> None:
+        """
+        Store a response under the request's fingerprint.
+
+        Args:
+            method: The HTTP method
+            url: The request URL
+            kwargs: The arguments passed to the context method
+            response: The response (``ApiResponse`` or anything with ``status`` and ``body()``)
+        """
+        request = self.fingerprint(method, url, kwargs)
+        raw = response.body()
+        if raw is None:
+            raw = response.text().encode("utf-8")
+        try:
+            body, is_json = json.loads(raw) if raw else None, True
+        except ValueError:
+            body, is_json = raw.decode("utf-8", errors="replace"), False
+        echoes = {}
+        for path, value in reversed(_leaves(_request_body(kwargs))):
+            if len(value) >= MIN_ECHO_LENGTH:
+                echoes[value] = path
+        with self._lock:
+            interaction = {
+                "node": current_node(),
+                "request": request,
+                "status": response.status,
+                "content_type": (response.headers or {}).get("content-type", "application/json"),
+                "json": is_json,
+                "body": self._normalize(body, echoes) if is_json else body,
+            }
+            self.interactions.append(interaction)
+
+    def replay(
+        self, method: str, url: str, kwargs: Dict[str, Any], response_class: type = CassetteResponse
+    ) -> Any:
+        """
+        Serve the recorded response of a request.
+
+        Args:
+            method: The HTTP method
+            url: The request URL
+            kwargs: The arguments passed to the context method
+            response_class: The response type to build
+
+        Returns:
+            A CassetteResponse (or ``response_class``) instance
+
+        Raises:
+            CassetteMissError: If the cassette has no response for the request
+        """
+        request = self.fingerprint(method, url, kwargs)
+        node = current_node()
+        key: Any = (node, request)
+        with self._lock:
+            interactions = self._by_key.get(key)
+            if interactions is None:
+                # Tests that ran elsewhere when recording (e.g. another worker's fixtures)
+                key = request
+                interactions = self._by_request.get(key)
+            if not interactions:
+                raise CassetteMissError(
+                    f"No recorded response for {request} (test {node or '-'}) in {self.path}"
+                )
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            interaction = interactions[min(served, len(interactions) - 1)]
+            body = interaction["body"]
+            if interaction["json"]:
+                body = self._denormalize(body, _request_body(kwargs))
+        if interaction["json"]:
+            raw = b"" if body is None else json.dumps(body).encode()
+        else:
+            raw = (body or "").encode()
+        return response_class(url, interaction["status"], {"content-type": interaction["content_type"]}, raw)
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+_loaded = False
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Return the process-wide cassette, created on first use when ``API_CASSETTE`` is set.
+
+    Returns:
+        The Cassette, or None when cassettes are disabled
+    """
+    global _cassette, _loaded
+    if _loaded:
+        return _cassette
+    with _cassette_lock:
+        if not _loaded:
+            path = os.getenv("API_CASSETTE")
+            if path:
+                worker = os.getenv("PYTEST_XDIST_WORKER")
+                mode = os.getenv("API_CASSETTE_MODE") or (
+                    "replay" if os.path.exists(path) or glob.glob(worker_path(path, "*")) else "record"
+                )
+                if mode == "record":
+                    path = worker_path(path, worker)
+                _cassette = Cassette(path, mode.lower(), prefix=worker or "main")
+                atexit.register(_cassette.save)
+            _loaded = True
+    return _cassette
+
+
+def replaying() -> bool:
+    """Whether requests are served from a cassette."""
+    cassette = get_cassette()
+    return cassette is not None and cassette.replaying
+
+
+def close_cassette() -> None:
+    """Save the process-wide cassette (when recording) and forget it."""
+    global _cassette, _loaded
+    with _cassette_lock:
+        cassette, _cassette, _loaded = _cassette, None, False
+    if cassette is not None:
+        cassette.save()
+        atexit.unregister(cassette.save)
@@ -1,9 +1,11 @@
 import random
 import string
-import json
 import os
 import pytest
 
+from utils.api_recorder import record_call
+from utils.entity_registry import EntityRegistry
+
 X_ACCOUNT = os.getenv("X_ACCOUNT", "")
 
 
@@ -20,6 +22,8 @@ def get_headers(token):
 
 
 def register_entity(id_map, entity):
+    if isinstance(id_map, EntityRegistry):
+        return id_map.register(entity)
     key = entity.get("id") or entity.get("identifier")
     if key is not None:
         if key in id_map:
@@ -31,20 +35,13 @@ def register_entity(id_map, entity):
 
 
 def find_entity(id_map, entity_id):
+    if isinstance(id_map, EntityRegistry):
+        return id_map.find(entity_id)
     return id_map.get(entity_id)
 
 
 def record_api_info(request, method, url, payload, response):
-    response_result = response if isinstance(response, str) else response.json() if response else None
-    request.node._api_info = {
-        "method": method,
-        "url": url,
-        "payload": payload,
-        "response": response_result,
-    }
-    print(method, url)
-    print('Payload:', json.dumps(payload, indent = 2))
-    print('Response:', json.dumps(response_result, indent = 2))
+    record_call(request, method, url, payload, response)
 
 
 def skip_if_no_token(access_token: str) -> None:
@@ -0,0 +1,196 @@
+"""
+Batched compute poller.
+
+This module watches many compute identifiers from a single polling loop.
+Each identifier keeps its own backoff schedule and deadline, and resolves its
+own future as soon as it reaches a terminal state, so waiting on N computes
+costs roughly as long as the slowest one instead of the sum of all of them.
+"""
+
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from config.status_check_compute import StatusCheckCompute
+from utils.compute_waiter import (
+    FAILED_STATES,
+    BackoffPolicy,
+    ComputeFailedError,
+    ComputeTimeoutError,
+    compute_identifier_of,
+    fetch_compute_status,
+)
+
+
+class _Watch:
+    """Polling state of a single compute identifier."""
+
+    __slots__ = ("identifier", "future", "deadline", "delays", "next_poll", "attempts", "status")
+
+    def __init__(self, identifier: str, policy: BackoffPolicy, now: float):
+        self.identifier = identifier
+        self.future: Future = Future()
+        self.deadline = now + policy.timeout
+        self.delays = policy.delays()
+        self.next_poll = now
+        self.attempts = 0
+        self.status: Optional[str] = None
+
+
+class ComputePoller:
+    """Poll a set of compute identifiers round-robin from one loop."""
+
+    def __init__(
+        self,
+        fetch_status: Callable[[str], Optional[str]],
+        policy: Optional[BackoffPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            fetch_status: Callable returning the current state of an identifier
+            policy: Backoff policy applied to every identifier
+            sleep: Sleep function (injectable for tests and virtual time)
+            clock: Monotonic clock function
+        """
+        self.fetch_status = fetch_status
+        self.policy = policy or BackoffPolicy()
+        self.sleep = sleep
+        self.clock = clock
+        self._watches: Dict[str, _Watch] = {}
+
+    def watch(self, identifier: str) -> Future:
+        """
+        Start watching a compute identifier.
+
+        Watching the same identifier twice returns the same future.
+
+        Args:
+            identifier: The compute identifier
+
+        Returns:
+            A future resolved with the ``COMPLETED`` state, or with a
+            ``ComputeWaitError`` if the compute fails or times out
+        """
+        if identifier not in self._watches:
+            self._watches[identifier] = _Watch(identifier, self.policy, self.clock())
+        return self._watches[identifier].future
+
+    def pending(self) -> int:
+        """Return the number of identifiers not yet resolved."""
+        return sum(1 for watch in self._watches.values() if not watch.future.done())
+
+    def poll_once(self) -> None:
+        """Poll every identifier that is due, in round-robin order."""
+        for watch in list(self._watches.values()):
+            if watch.future.done() or watch.next_poll > self.clock():
+                continue
+            self._poll(watch)
+
+    def run(self) -> Dict[str, Future]:
+        """
+        Poll until every watched identifier is resolved.
+
+        Returns:
+            Mapping of compute identifier to its (resolved) future
+        """
+        while self.pending():
+            self.poll_once()
+            upcoming = [
+                watch.next_poll for watch in self._watches.values() if not watch.future.done()
+            ]
+            if upcoming:
+                delay = min(upcoming) - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+        return {identifier: watch.future for identifier, watch in self._watches.items()}
+
+    def _poll(self, watch: _Watch) -> None:
+        """Poll one identifier and resolve or reschedule it."""
+        watch.attempts += 1
+        try:
+            watch.status = self.fetch_status(watch.identifier)
+        except Exception as e:
+            watch.future.set_exception(e)
+            return
+        print(f"[compute_poller] {watch.identifier} attempt {watch.attempts}: {watch.status}")
+
+        if watch.status == StatusCheckCompute.COMPLETED.value:
+            watch.future.set_result(watch.status)
+        elif watch.status in FAILED_STATES:
+            watch.future.set_exception(
+                ComputeFailedError(
+                    f"Compute {watch.identifier} ended in state {watch.status}",
+                    watch.identifier,
+                    watch.status,
+                )
+            )
+        else:
+            now = self.clock()
+            if now >= watch.deadline:
+                watch.future.set_exception(
+                    ComputeTimeoutError(
+                        f"Compute {watch.identifier} still {watch.status} after "
+                        f"{self.policy.timeout}s ({watch.attempts} polls)",
+                        watch.identifier,
+                        watch.status,
+                    )
+                )
+            else:
+                watch.next_poll = min(now + next(watch.delays), watch.deadline)
+
+
+def compute_identifiers_of(entities: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Collect compute identifiers from registered entities.
+
+    Args:
+        entities: Registered entities or ``get_*_by_id`` response bodies
+
+    Returns:
+        Mapping of entity id to compute identifier (entities without one are skipped)
+    """
+    identifiers = {}
+    for entity in entities:
+        identifier = compute_identifier_of(entity)
+        if identifier:
+            identifiers[entity.get("id") or identifier] = identifier
+    return identifiers
+
+
+def wait_for_computes(
+    context: Any,
+    compute_identifiers: Iterable[str],
+    access_token: str,
+    request: Any,
+    policy: Optional[BackoffPolicy] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> Dict[str, Future]:
+    """
+    Wait for several computes at once via the compute status endpoint.
+
+    Args:
+        context: The API request context
+        compute_identifiers: The compute identifiers to watch
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        policy: Backoff policy applied to every identifier
+        sleep: Sleep function
+        clock: Monotonic clock function
+
+    Returns:
+        Mapping of compute identifier to its resolved future
+    """
+    poller = ComputePoller(
+        lambda identifier: fetch_compute_status(context, identifier, access_token, request),
+        policy,
+        sleep,
+        clock,
+    )
+    for identifier in compute_identifiers:
+        poller.watch(identifier)
+    return poller.run()
@@ -0,0 +1,260 @@
+"""
+Compute lifecycle simulator and virtual clock for the mock backends.
+
+``ComputeSimulator`` walks every compute it starts through the
+``StatusCheckCompute`` states, ``SCHEDULED -> STARTING_UP -> RUNNING ->
+COMPLETED`` (or ``FAILED``), spending a sampled duration in each phase. Paired
+with a ``VirtualClock``, the waiters' sleeps advance virtual time instead of
+blocking, so the real polling and backoff logic runs against realistic
+compute durations in milliseconds.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.status_check_compute import StatusCheckCompute
+from utils.cassette import replaying
+
+# A duration distribution: random generator -> seconds
+Duration = Callable[[random.Random], float]
+
+PHASES = (
+    StatusCheckCompute.SCHEDULED.value,
+    StatusCheckCompute.STARTING_UP.value,
+    StatusCheckCompute.RUNNING.value,
+)
+
+
+def fixed(seconds: float) -> Duration:
+    """Always ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Duration:
+    """Uniformly distributed between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean: float) -> Duration:
+    """Exponentially distributed with the given mean, in seconds."""
+    return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+
+
+# Phase durations modelled on the real computes
+DEFAULT_DURATIONS: Dict[str, Duration] = {
+    StatusCheckCompute.SCHEDULED.value: uniform(1, 5),
+    StatusCheckCompute.STARTING_UP.value: uniform(5, 15),
+    StatusCheckCompute.RUNNING.value: uniform(10, 60),
+}
+
+# Computes that complete as soon as they start
+INSTANT_DURATIONS: Dict[str, Duration] = {phase: fixed(0) for phase in PHASES}
+
+
+def parse_duration(spec: str) -> Duration:
+    """
+    Parse a duration distribution.
+
+    Args:
+        spec: ``"<seconds>"``, ``"<low>:<high>"`` (uniform) or ``"exp:<mean>"``
+
+    Returns:
+        The duration distribution
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    kind, _, value = spec.partition(":")
+    if kind == "exp":
+        return exponential(float(value))
+    if value:
+        return uniform(float(kind), float(value))
+    return fixed(float(kind))
+
+
+def parse_durations(spec: str) -> Dict[str, Duration]:
+    """
+    Parse per-phase durations, e.g. ``"SCHEDULED=1:5,STARTING_UP=5,RUNNING=exp:30"``.
+
+    Phases that are not listed take no time.
+
+    Args:
+        spec: Comma-separated ``<phase>=<duration>`` pairs (see ``parse_duration``)
+
+    Returns:
+        Durations keyed by phase
+
+    Raises:
+        ValueError: If a phase is unknown or a duration is malformed
+    """
+    durations = dict(INSTANT_DURATIONS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        phase, _, duration = item.partition("=")
+        phase = phase.strip().upper()
+        if phase not in PHASES:
+            raise ValueError(f"Unknown compute phase '{phase}' (expected one of {PHASES})")
+        durations[phase] = parse_duration(duration.strip())
+    return durations
+
+
+class VirtualClock:
+    """
+    Monotonic clock whose ``sleep`` advances time instead of blocking.
+
+    Every thread has its own virtual time, so that concurrent waiters do not
+    add their sleeps onto each other's deadlines. A thread starts at, and
+    ``sync`` moves it up to, the latest time any thread has reached.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._latest = start
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self) -> float:
+        """Return the current virtual time of the calling thread, in seconds."""
+        now = getattr(self._local, "now", None)
+        if now is None:
+            now = self._local.now = self._latest
+        return now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the calling thread's virtual time by ``seconds``."""
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """Move the calling thread's clock forward by ``seconds`` (negative values are ignored)."""
+        with self._lock:
+            self._local.now = self() + max(0.0, seconds)
+            self._latest = max(self._latest, self._local.now)
+
+    def sync(self) -> None:
+        """Move the calling thread's clock up to the latest time reached by any thread."""
+        with self._lock:
+            self._local.now = max(self(), self._latest)
+
+
+class ComputeSimulator:
+    """Walk computes through their lifecycle states over (virtual) time."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        durations: Optional[Dict[str, Duration]] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the simulator.
+
+        Args:
+            clock: Clock the lifecycles follow (e.g. a ``VirtualClock``)
+            durations: Duration distribution per phase (``DEFAULT_DURATIONS`` if None)
+            failure_rate: Probability that a compute ends in ``FAILED``
+            seed: Seed of the random generator, for reproducible runs
+        """
+        self.clock = clock
+        self.durations = {
+            **INSTANT_DURATIONS,
+            **(DEFAULT_DURATIONS if durations is None else durations),
+        }
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # Compute identifier -> [(phase end time, phase state)] and final state
+        self._schedules: Dict[str, Tuple[List[Tuple[float, str]], str]] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        clock: Callable[[], float] = time.monotonic,
+        durations: Optional[Dict[str, Duration]] = None,
+    ) -> "ComputeSimulator":
+        """
+        Build a simulator from ``COMPUTE_SIM_DURATIONS`` (see ``parse_durations``),
+        ``COMPUTE_SIM_FAILURE_RATE`` and ``COMPUTE_SIM_SEED``.
+
+        Args:
+            clock: Clock the lifecycles follow
+            durations: Durations used when ``COMPUTE_SIM_DURATIONS`` is not set
+
+        Returns:
+            A ComputeSimulator instance
+        """
+        spec = os.getenv("COMPUTE_SIM_DURATIONS")
+        seed = os.getenv("COMPUTE_SIM_SEED")
+        return cls(
+            clock,
+            parse_durations(spec) if spec else durations,
+            failure_rate=float(os.getenv("COMPUTE_SIM_FAILURE_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+    def start(self, identifier: str) -> None:
+        """
+        Start (or restart) a compute now.
+
+        Args:
+            identifier: The compute identifier
+        """
+        with self._lock:
+            phases = []
+            end = self.clock()
+            for phase in PHASES:
+                end += max(0.0, self.durations[phase](self._rng))
+                phases.append((end, phase))
+            failed = self._rng.random() < self.failure_rate
+            final = StatusCheckCompute.FAILED if failed else StatusCheckCompute.COMPLETED
+            self._schedules[identifier] = (phases, final.value)
+
+    def status(self, identifier: str) -> Optional[str]:
+        """
+        Return the current state of a compute.
+
+        Args:
+            identifier: The compute identifier
+
+        Returns:
+            The ``StatusCheckCompute`` value, or None for an unknown compute
+        """
+        schedule = self._schedules.get(identifier)
+        if schedule is None:
+            return None
+        phases, final = schedule
+        now = self.clock()
+        for end, phase in phases:
+            if now < end:
+                return phase
+        return final
+
+    def forget(self, identifier: str) -> None:
+        """Drop a compute (e.g. when its entity is deleted)."""
+        with self._lock:
+            self._schedules.pop(identifier, None)
+
+
+def time_functions(context: Any) -> Dict[str, Callable]:
+    """
+    Return the ``sleep``/``clock`` keyword arguments for waiters polling ``context``.
+
+    Mock contexts carrying a ``virtual_clock`` and cassette replays make waits
+    advance virtual time; real contexts use the default (wall clock) functions.
+    The calling thread's virtual clock is synced first, so computes started by
+    other threads are not in the waiter's future.
+
+    Args:
+        context: The API request context
+
+    Returns:
+        ``{"sleep": ..., "clock": ...}``, or an empty dict for real contexts
+    """
+    clock = getattr(context, "virtual_clock", None)
+    if not isinstance(clock, VirtualClock):
+        if not replaying():
+            return {}
+        clock = VirtualClock()
+    clock.sync()
+    return {"sleep": clock.sleep, "clock": clock}
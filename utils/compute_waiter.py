@@ -0,0 +1,254 @@
+"""
+Compute status waiter.
+
+This module polls the compute status endpoint with an immediate first poll,
+exponential backoff with jitter and a total deadline, returning as soon as
+the compute reaches a terminal state.
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from api.check_compute import check_status_compute
+from config.status_check_compute import StatusCheckCompute
+
+FAILED_STATES = {StatusCheckCompute.FAILED.value, StatusCheckCompute.UNSCHEDULED.value}
+TERMINAL_STATES = FAILED_STATES | {StatusCheckCompute.COMPLETED.value}
+
+
+class ComputeWaitError(Exception):
+    """Base error raised when a compute does not complete."""
+
+    def __init__(self, message: str, identifier: Optional[str] = None, status: Optional[str] = None):
+        super().__init__(message)
+        self.identifier = identifier
+        self.status = status
+
+
+class ComputeFailedError(ComputeWaitError):
+    """Raised when a compute reaches a failed terminal state."""
+
+
+class ComputeTimeoutError(ComputeWaitError):
+    """Raised when a compute is still running after the deadline."""
+
+
+class BackoffPolicy:
+    """Exponential backoff with jitter bounded by a total deadline."""
+
+    def __init__(
+        self,
+        timeout: float = 600,
+        initial_delay: float = 2,
+        max_delay: float = 30,
+        multiplier: float = 2,
+        jitter: float = 0.2,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            timeout: Total time budget in seconds
+            initial_delay: Delay after the first (immediate) poll
+            max_delay: Upper bound for a single delay
+            multiplier: Growth factor between consecutive delays
+            jitter: Relative random spread applied to each delay (0.2 = ±20%)
+        """
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    @classmethod
+    def from_step(cls, step: Dict[str, Any]) -> "BackoffPolicy":
+        """
+        Build a policy from a ``check_status_compute`` step configuration.
+
+        ``timeout`` sets the deadline directly; otherwise the legacy
+        ``max_retries`` x ``retry_interval`` budget is used as the deadline and
+        ``retry_interval`` becomes the maximum delay.
+
+        Args:
+            step: The step configuration
+
+        Returns:
+            A BackoffPolicy instance
+        """
+        retry_interval = step.get("retry_interval", 60)
+        timeout = step.get("timeout", step.get("max_retries", 5) * retry_interval)
+        return cls(
+            timeout=timeout,
+            initial_delay=min(step.get("initial_delay", 2), retry_interval),
+            max_delay=retry_interval,
+        )
+
+    def delays(self) -> Iterator[float]:
+        """Yield successive (jittered) delays between polls."""
+        delay = self.initial_delay
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, min(self.max_delay, delay + random.uniform(-spread, spread)))
+            delay = min(self.max_delay, delay * self.multiplier)
+
+
+def compute_identifier_of(entity: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract the compute identifier of a registered entity.
+
+    Products expose it as ``compute.identifier``; sources and objects as
+    ``compute_identifier``, either at the top level or under ``entity``.
+
+    Args:
+        entity: The registered entity or a ``get_*_by_id`` response body
+
+    Returns:
+        The compute identifier, or None if not present
+    """
+    for data in (entity, entity.get("entity") or {}):
+        if entity.get("type") == "product" or "compute" in data:
+            identifier = (data.get("compute") or {}).get("identifier")
+            if identifier:
+                return identifier
+        if data.get("compute_identifier"):
+            return data["compute_identifier"]
+    return None
+
+
+def compute_status(response: Any) -> Optional[str]:
+    """
+    Extract the compute state from a compute status response.
+
+    Args:
+        response: The API response from ``check_status_compute``
+
+    Returns:
+        The status string (see ``StatusCheckCompute``), or None
+    """
+    status = response.json().get("status")
+    if isinstance(status, dict):
+        return status.get("status")
+    return status
+
+
+def fetch_compute_status(
+    context: Any, compute_identifier: str, access_token: str, request: Any
+) -> str:
+    """
+    Fetch the current state of a compute.
+
+    Args:
+        context: The API request context
+        compute_identifier: The compute identifier
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        The status string (see ``StatusCheckCompute``)
+
+    Raises:
+        ComputeWaitError: If the request fails or the response has no status
+    """
+    response = check_status_compute(context, compute_identifier, access_token, request)
+    if not response.ok:
+        raise ComputeWaitError(
+            f"Compute status request failed: {response.status} - {response.text()}",
+            compute_identifier,
+        )
+    status = compute_status(response)
+    if status is None:
+        raise ComputeWaitError(
+            f"Compute status missing in response for {compute_identifier}",
+            compute_identifier,
+        )
+    return status
+
+
+def wait_for_status(
+    fetch_status: Callable[[], Optional[str]],
+    policy: BackoffPolicy,
+    identifier: Optional[str] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> str:
+    """
+    Poll ``fetch_status`` until a terminal state or the deadline.
+
+    Args:
+        fetch_status: Callable returning the current compute state
+        policy: The backoff policy
+        identifier: Compute identifier used in error messages
+        sleep: Sleep function (injectable for tests and virtual time)
+        clock: Monotonic clock function
+
+    Returns:
+        The ``COMPLETED`` state
+
+    Raises:
+        ComputeFailedError: If the compute reaches FAILED or UNSCHEDULED
+        ComputeTimeoutError: If the deadline passes first
+    """
+    deadline = clock() + policy.timeout
+    delays = policy.delays()
+    attempt = 0
+    status = None
+
+    while True:
+        attempt += 1
+        status = fetch_status()
+        print(f"[compute_waiter] {identifier} attempt {attempt}: {status}")
+
+        if status == StatusCheckCompute.COMPLETED.value:
+            return status
+        if status in FAILED_STATES:
+            raise ComputeFailedError(
+                f"Compute {identifier} ended in state {status}", identifier, status
+            )
+
+        remaining = deadline - clock()
+        if remaining <= 0:
+            break
+        sleep(min(next(delays), remaining))
+
+    raise ComputeTimeoutError(
+        f"Compute {identifier} still {status} after {policy.timeout}s ({attempt} polls)",
+        identifier,
+        status,
+    )
+
+
+def wait_for_compute(
+    context: Any,
+    compute_identifier: str,
+    access_token: str,
+    request: Any,
+    policy: Optional[BackoffPolicy] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> str:
+    """
+    Wait for a compute to complete via the compute status endpoint.
+
+    Args:
+        context: The API request context
+        compute_identifier: The compute identifier to watch
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        policy: The backoff policy (defaults to ``BackoffPolicy()``)
+        sleep: Sleep function
+        clock: Monotonic clock function
+
+    Returns:
+        The ``COMPLETED`` state
+
+    Raises:
+        ComputeWaitError: If the compute fails, times out or cannot be polled
+    """
+    return wait_for_status(
+        lambda: fetch_compute_status(context, compute_identifier, access_token, request),
+        policy or BackoffPolicy(),
+        compute_identifier,
+        sleep,
+        clock,
+    )
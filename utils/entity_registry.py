@@ -0,0 +1,372 @@
+"""
+Indexed registry of entities created during a test session.
+
+Entities are stored as ``EntityRecord`` mappings and indexed by landscape id,
+by server identifier and by entity type, so every lookup is O(1) regardless
+of the size of the landscape. ``SqliteEntityRegistry`` offers the same
+interface backed by a SQLite file that several xdist workers can share.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class EntityRecord(Mapping):
+    """
+    A registered entity.
+
+    ``id``, ``identifier`` and ``type`` are kept as slots for fast access; any
+    other field returned by the API (``compute_identifier``, ``compute``,
+    ``entity``...) lives in the underlying data and is reachable through the
+    usual mapping interface (``record["identifier"]``, ``record.get(...)``).
+    """
+
+    __slots__ = ("id", "identifier", "type", "_data")
+
+    def __init__(self, data: Mapping):
+        self._data: Dict[str, Any] = {}
+        self.id = None
+        self.identifier = None
+        self.type = None
+        self._merge(data)
+
+    def _merge(self, data: Mapping) -> None:
+        self._data.update(data)
+        self.id = self._data.get("id")
+        self.identifier = self._data.get("identifier")
+        self.type = self._data.get("type")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a shallow copy of the record data as a plain dict."""
+        return dict(self._data)
+
+    def __repr__(self) -> str:
+        return f"EntityRecord({self._data!r})"
+
+
+def entity_key(entity: Mapping) -> str:
+    """
+    Return the registry key of an entity: its landscape ``id``, else its ``identifier``.
+
+    Raises:
+        ValueError: If the entity has neither 'id' nor 'identifier'
+    """
+    key = entity.get("id") or entity.get("identifier")
+    if key is None:
+        raise ValueError("Entity must have 'id' or 'identifier'")
+    return key
+
+
+class EntityRegistry:
+    """Registry of entities indexed by landscape id, server identifier and type."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_id: Dict[str, EntityRecord] = {}
+        self._by_identifier: Dict[str, EntityRecord] = {}
+        self._by_type: Dict[str, Dict[str, EntityRecord]] = {}
+
+    def register(self, entity: Mapping) -> EntityRecord:
+        """
+        Register an entity, merging it into an existing record with the same key.
+
+        The key is the landscape ``id``, falling back to the server ``identifier``.
+
+        Args:
+            entity: The entity data
+
+        Returns:
+            The registered record
+
+        Raises:
+            ValueError: If the entity has neither 'id' nor 'identifier'
+        """
+        key = entity_key(entity)
+        with self._lock:
+            record = self._by_id.get(key)
+            if record is None:
+                record = EntityRecord(entity)
+                self._by_id[key] = record
+            else:
+                identifier, entity_type = record.identifier, record.type
+                record._merge(entity)
+                # Update the indexes in place, so the record keeps its registration order
+                if identifier is not None and identifier != record.identifier:
+                    self._by_identifier.pop(identifier, None)
+                if entity_type is not None and entity_type != record.type:
+                    self._by_type.get(entity_type, {}).pop(key, None)
+            self._index(key, record)
+        return record
+
+    def _index(self, key: str, record: EntityRecord) -> None:
+        if record.identifier is not None:
+            self._by_identifier[record.identifier] = record
+        if record.type is not None:
+            self._by_type.setdefault(record.type, {})[key] = record
+
+    def _unindex(self, key: str, record: EntityRecord) -> None:
+        if record.identifier is not None:
+            self._by_identifier.pop(record.identifier, None)
+        if record.type is not None:
+            self._by_type.get(record.type, {}).pop(key, None)
+
+    def get(self, entity_id: str, default: Any = None) -> Optional[EntityRecord]:
+        """Return the record registered under a landscape id."""
+        return self._by_id.get(entity_id, default)
+
+    def find(self, entity_id: str) -> Optional[EntityRecord]:
+        """Return the record registered under a landscape id, or None (used for refs)."""
+        return self._by_id.get(entity_id)
+
+    def by_identifier(self, identifier: str) -> Optional[EntityRecord]:
+        """Return the record with the given server identifier, or None."""
+        return self._by_identifier.get(identifier)
+
+    def of_type(self, entity_type: str) -> List[EntityRecord]:
+        """Return every record of the given type, in registration order."""
+        return list(self._by_type.get(entity_type, {}).values())
+
+    def remove(self, entity_id: str) -> Optional[EntityRecord]:
+        """Remove and return the record registered under a landscape id."""
+        with self._lock:
+            record = self._by_id.pop(entity_id, None)
+            if record is not None:
+                self._unindex(entity_id, record)
+        return record
+
+    def ids(self) -> List[str]:
+        """Return every registered landscape id."""
+        return list(self._by_id)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the registry as a plain ``{id: entity}`` dict."""
+        return {key: record.to_dict() for key, record in self._by_id.items()}
+
+    def __getitem__(self, entity_id: str) -> EntityRecord:
+        return self._by_id[entity_id]
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._by_id
+
+    def __iter__(self) -> Iterator[EntityRecord]:
+        """Iterate over the registered records (not the keys)."""
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __repr__(self) -> str:
+        return f"EntityRegistry({self.to_dict()!r})"
+
+
+class SqliteEntityRegistry(EntityRegistry):
+    """
+    Entity registry stored in a SQLite file shared between processes.
+
+    Every xdist worker opening the same path sees the same entities, so one
+    landscape can be built by several workers (``--dist=load``): a worker
+    needing a ref created elsewhere waits for it via ``find``/``wait_for``.
+    Records returned are snapshots; register again to update an entity.
+    """
+
+    def __init__(self, path: str, wait_timeout: float = 0, poll_interval: float = 0.2):
+        """
+        Open (or create) a shared registry.
+
+        Args:
+            path: Path of the SQLite database file
+            wait_timeout: Seconds ``find`` waits for a missing entity (0 = no wait)
+            poll_interval: Seconds between lookups while waiting
+        """
+        super().__init__()
+        self.path = path
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entities (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT UNIQUE NOT NULL,
+                    identifier TEXT,
+                    type TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entities_identifier ON entities (identifier);
+                CREATE INDEX IF NOT EXISTS entities_type ON entities (type);
+                """
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection (sqlite connections are per thread)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a read-modify-write as one write transaction.
+
+        ``BEGIN IMMEDIATE`` takes the database write lock up front, so that
+        no other worker can write between the read and the write.
+        """
+        connection = self._connection()
+        with self._lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, params: tuple = ()) -> List[EntityRecord]:
+        rows = self._connection().execute(sql, params).fetchall()
+        return [EntityRecord(json.loads(row[0])) for row in rows]
+
+    def register(self, entity: Mapping) -> EntityRecord:
+        key = entity_key(entity)
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT data FROM entities WHERE key = ?", (key,)
+            ).fetchone()
+            record = EntityRecord(json.loads(row[0]) if row else {})
+            record._merge(entity)
+            connection.execute(
+                "INSERT INTO entities (key, identifier, type, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET identifier = excluded.identifier, "
+                "type = excluded.type, data = excluded.data",
+                (key, record.identifier, record.type, json.dumps(record.to_dict())),
+            )
+        return record
+
+    def get(self, entity_id: str, default: Any = None) -> Optional[EntityRecord]:
+        records = self._query("SELECT data FROM entities WHERE key = ?", (entity_id,))
+        return records[0] if records else default
+
+    def find(self, entity_id: str) -> Optional[EntityRecord]:
+        return self.wait_for(entity_id, self.wait_timeout)
+
+    def wait_for(self, entity_id: str, timeout: float) -> Optional[EntityRecord]:
+        """
+        Wait until an entity is registered (possibly by another worker).
+
+        Args:
+            entity_id: The landscape id
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            The record, or None if it did not appear in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            record = self.get(entity_id)
+            if record is not None or time.monotonic() >= deadline:
+                return record
+            time.sleep(self.poll_interval)
+
+    def by_identifier(self, identifier: str) -> Optional[EntityRecord]:
+        records = self._query(
+            "SELECT data FROM entities WHERE identifier = ? LIMIT 1", (identifier,)
+        )
+        return records[0] if records else None
+
+    def of_type(self, entity_type: str) -> List[EntityRecord]:
+        return self._query("SELECT data FROM entities WHERE type = ? ORDER BY seq", (entity_type,))
+
+    def remove(self, entity_id: str) -> Optional[EntityRecord]:
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT data FROM entities WHERE key = ?", (entity_id,)
+            ).fetchone()
+            connection.execute("DELETE FROM entities WHERE key = ?", (entity_id,))
+        return EntityRecord(json.loads(row[0])) if row else None
+
+    def ids(self) -> List[str]:
+        rows = self._connection().execute("SELECT key FROM entities ORDER BY seq").fetchall()
+        return [row[0] for row in rows]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {record_key: record.to_dict() for record_key, record in self._items()}
+
+    def _items(self) -> List[tuple]:
+        rows = self._connection().execute(
+            "SELECT key, data FROM entities ORDER BY seq"
+        ).fetchall()
+        return [(row[0], EntityRecord(json.loads(row[1]))) for row in rows]
+
+    def __getitem__(self, entity_id: str) -> EntityRecord:
+        record = self.get(entity_id)
+        if record is None:
+            raise KeyError(entity_id)
+        return record
+
+    def __contains__(self, entity_id: object) -> bool:
+        row = self._connection().execute(
+            "SELECT 1 FROM entities WHERE key = ?", (entity_id,)
+        ).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[EntityRecord]:
+        return iter([record for _, record in self._items()])
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def create_registry(shared_dir: Optional[str] = None, name: str = "entities") -> EntityRegistry:
+    """
+    Create the entity registry selected by the ``ENTITY_REGISTRY`` env variable.
+
+    ``ENTITY_REGISTRY=sqlite`` returns a ``SqliteEntityRegistry`` stored in
+    ``shared_dir`` (waiting up to ``ENTITY_REGISTRY_WAIT`` seconds for missing
+    refs); anything else returns an in-memory ``EntityRegistry``.
+
+    ``pytest.ini`` distributes whole files (``--dist=loadfile``), so every
+    worker builds its own entities. With the SQLite registry, the tests of
+    one file can also be spread over workers, one worker waiting for the refs
+    another registers:
+
+        ENTITY_REGISTRY=sqlite pytest --dist=load tests/e2e/landscape/test_landscape_generator.py
+
+    Args:
+        shared_dir: Directory shared by every worker of the run
+        name: Registry name, used as the database file name
+
+    Returns:
+        An entity registry
+    """
+    if os.getenv("ENTITY_REGISTRY", "memory").lower() != "sqlite" or shared_dir is None:
+        return EntityRegistry()
+    return SqliteEntityRegistry(
+        os.path.join(shared_dir, f"{name}.sqlite3"),
+        wait_timeout=float(os.getenv("ENTITY_REGISTRY_WAIT", "60")),
+    )
@@ -0,0 +1,124 @@
+"""
+Tracker of the entities created through the API layer.
+
+``utils.api_response.send`` and the async ``BoundedContext`` report every
+request answered by a server (a Playwright ``APIResponse``; mocks, fakes and
+cassette replays created nothing) to ``TRACKER``: successful creates of
+meshes, systems, sources, objects and products are remembered, and
+successful deletes forget them, so ``utils.teardown`` knows exactly what a
+run left behind.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from config import API_ENDPOINTS
+
+# Create endpoint path -> entity type
+ENTITY_ENDPOINTS = {
+    API_ENDPOINTS["MESH"]: "mesh",
+    API_ENDPOINTS["SYSTEM"]: "system",
+    API_ENDPOINTS["SOURCE"]: "source",
+    API_ENDPOINTS["OBJECT"]: "object",
+    API_ENDPOINTS["PRODUCT"]: "product",
+}
+
+
+def created_identifier(body: Any) -> Optional[str]:
+    """
+    Extract the identifier of a created entity from a response body.
+
+    Args:
+        body: The decoded response body
+
+    Returns:
+        The identifier (``entity.identifier`` or top-level ``identifier``), or None
+    """
+    if not isinstance(body, dict):
+        return None
+    entity = body.get("entity")
+    if isinstance(entity, dict) and entity.get("identifier"):
+        return entity["identifier"]
+    return body.get("identifier")
+
+
+def entity_type_of(url: str) -> Optional[str]:
+    """
+    Return the entity type an entity endpoint URL refers to.
+
+    Args:
+        url: The request URL (relative or absolute)
+
+    Returns:
+        The entity type, or None for other endpoints (links, configuration...)
+    """
+    path = urlsplit(url).path.rstrip("/")
+    return ENTITY_ENDPOINTS.get(path)
+
+
+class EntityTracker:
+    """Thread-safe record of the entities created and not deleted yet."""
+
+    def __init__(self):
+        # Entity type -> identifiers, in creation order
+        self._entities: Dict[str, Dict[str, None]] = {
+            kind: {} for kind in ENTITY_ENDPOINTS.values()
+        }
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, url: str, kwargs: Dict[str, Any], response: Any) -> None:
+        """
+        Track a create or forget a delete, if ``response`` is a successful one.
+
+        Args:
+            method: The HTTP method
+            url: The request URL
+            kwargs: The arguments passed to the context method (for ``params``)
+            response: The response (``status``/``ok`` and ``json()``)
+        """
+        method = method.lower()
+        if method not in ("post", "delete") or not getattr(response, "ok", False):
+            return
+        kind = entity_type_of(url)
+        if kind is None:
+            return
+        if method == "post":
+            try:
+                identifier = created_identifier(response.json())
+            except ValueError:
+                return
+            if identifier:
+                self.add(kind, identifier)
+            return
+        params = kwargs.get("params") or {}
+        query = parse_qs(urlsplit(url).query)
+        identifier = params.get("identifier") or query.get("identifier", [None])[0]
+        if identifier:
+            self.discard(kind, identifier)
+
+    def add(self, kind: str, identifier: str) -> None:
+        """Track an entity."""
+        with self._lock:
+            self._entities[kind][identifier] = None
+
+    def discard(self, kind: str, identifier: str) -> None:
+        """Forget an entity (deleted or handed over)."""
+        with self._lock:
+            self._entities[kind].pop(identifier, None)
+
+    def pending(self) -> Dict[str, List[str]]:
+        """Return the tracked identifiers by entity type, in creation order."""
+        with self._lock:
+            return {
+                kind: list(identifiers)
+                for kind, identifiers in self._entities.items()
+                if identifiers
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(identifiers) for identifiers in self._entities.values())
+
+
+TRACKER = EntityTracker()
@@ -0,0 +1,259 @@
+"""
+Compiled landscape model.
+
+``load_landscape`` parses a landscape YAML once, validates it and compiles it
+into a ``Landscape``: the references of sources (``system``), objects
+(``source``) and products (``mesh``, ``input``) are checked, product-to-product
+inputs are checked for cycles, and the dependency graph, its topological
+layers and the links are computed. Compiled landscapes are cached on disk
+(pickled, keyed by the SHA-256 of the file content, in a private per-user
+directory, see ``utils.cache_dir``), so that every xdist worker and every
+later run skips parsing and validation.
+
+A ``Landscape`` is a read-only mapping of its sections, so it can be passed
+wherever the raw configuration dict was used.
+"""
+
+import hashlib
+import os
+import pickle
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+from utils.cache_dir import private_cache_dir
+
+# Bump when the compiled format changes to invalidate on-disk caches
+LANDSCAPE_FORMAT = 2
+
+# Landscape section -> entity type, in creation order
+SECTIONS = {
+    "mesh": "mesh",
+    "systems": "system",
+    "sources": "source",
+    "objects": "object",
+    "products": "product",
+}
+
+# libyaml's loader parses large landscapes several times faster, when available
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Section -> (field, sections it may reference), for single references
+REFERENCES = {
+    "sources": ("system", ("systems",)),
+    "objects": ("source", ("sources",)),
+    "products": ("mesh", ("mesh",)),
+}
+
+
+class LandscapeError(ValueError):
+    """A landscape has invalid ids, references or a dependency cycle."""
+
+    def __init__(self, path: str, problems: List[str]):
+        super().__init__(f"Invalid landscape {path}:\n- " + "\n- ".join(problems))
+        self.problems = problems
+
+
+class Landscape(Mapping):
+    """A validated landscape with its dependency graph."""
+
+    def __init__(self, path: str, digest: str, config: Dict[str, Any]):
+        """
+        Compile a landscape configuration.
+
+        Args:
+            path: The landscape file
+            digest: SHA-256 of the file content
+            config: The parsed YAML
+
+        Raises:
+            LandscapeError: If ids, references or product inputs are invalid
+        """
+        self.path = path
+        self.digest = digest
+        self._sections: Dict[str, List[Dict[str, Any]]] = {
+            section: list(items or []) for section, items in (config or {}).items()
+        }
+        # Landscape id -> item / entity type / ids it depends on
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.types: Dict[str, str] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        # (link kind, parent id, child id), in declaration order
+        self.links: List[Tuple[str, str, str]] = []
+        problems = self._index()
+        problems += self._resolve()
+        if problems:
+            raise LandscapeError(path, problems)
+        self.layers: List[List[str]] = self._layer()
+
+    def _index(self) -> List[str]:
+        problems = []
+        for section, kind in SECTIONS.items():
+            for position, item in enumerate(self._sections.get(section, [])):
+                item_id = item.get("id") if isinstance(item, dict) else None
+                if not isinstance(item_id, str) or not item_id:
+                    problems.append(f"{section}[{position}] has no id")
+                elif item_id in self.entities:
+                    problems.append(f"Duplicate id '{item_id}' in {section}")
+                else:
+                    self.entities[item_id] = item
+                    self.types[item_id] = kind
+                    self.dependencies[item_id] = set()
+        return problems
+
+    def _resolve(self) -> List[str]:
+        problems = []
+        for section, (field, targets) in REFERENCES.items():
+            allowed = {SECTIONS[target] for target in targets}
+            for item in self._sections.get(section, []):
+                if item.get("id") not in self.entities:
+                    continue
+                ref = item.get(field)
+                if self.types.get(ref) not in allowed:
+                    problems.append(f"{item['id']}: unknown {field} '{ref}'")
+                    continue
+                self.dependencies[item["id"]].add(ref)
+                if field == "system":
+                    self.links.append(("system_source", ref, item["id"]))
+                elif field == "source":
+                    self.links.append(("source_object", ref, item["id"]))
+
+        for product in self._sections.get("products", []):
+            if product.get("id") not in self.entities:
+                continue
+            inputs = product.get("input", [])
+            if not isinstance(inputs, list):
+                problems.append(f"{product['id']}: input must be a list")
+                continue
+            for input_id in inputs:
+                kind = self.types.get(input_id)
+                if kind not in ("object", "product"):
+                    problems.append(f"{product['id']}: unknown input '{input_id}'")
+                    continue
+                self.dependencies[product["id"]].add(input_id)
+                self.links.append((f"{kind}_product", input_id, product["id"]))
+        if not problems:
+            problems += [f"Product input cycle: {' -> '.join(cycle)}" for cycle in self._cycles()]
+        return problems
+
+    def _cycles(self) -> List[List[str]]:
+        """Return one cycle per strongly connected group of product inputs."""
+        cycles: List[List[str]] = []
+        state: Dict[str, int] = {}  # 1: on the current path, 2: done
+        for start in self.of_type("product"):
+            if start in state:
+                continue
+            path: List[str] = []
+            stack: List[Tuple[str, Iterator[str]]] = [
+                (start, iter(sorted(self.dependencies[start])))
+            ]
+            state[start] = 1
+            path.append(start)
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    path.pop()
+                    state[node] = 2
+                elif self.types[child] != "product" or state.get(child) == 2:
+                    continue
+                elif state.get(child) == 1:
+                    # Inputs point upstream: report the cycle in data-flow order
+                    cycle = path[path.index(child):] + [child]
+                    cycles.append(cycle[::-1])
+                else:
+                    state[child] = 1
+                    path.append(child)
+                    stack.append((child, iter(sorted(self.dependencies[child]))))
+        return cycles
+
+    def _layer(self) -> List[List[str]]:
+        """Group the ids in topological layers (each layer only depends on earlier ones)."""
+        remaining = {item_id: len(deps) for item_id, deps in self.dependencies.items()}
+        dependents: Dict[str, List[str]] = {item_id: [] for item_id in self.entities}
+        for item_id, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(item_id)
+        layer = [item_id for item_id, count in remaining.items() if count == 0]
+        layers = []
+        while layer:
+            layers.append(layer)
+            following = []
+            for item_id in layer:
+                for dependent in dependents[item_id]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        following.append(dependent)
+            layer = following
+        return layers
+
+    def ids(self, section: str) -> List[str]:
+        """Return the ids of a section, in declaration order."""
+        return [item["id"] for item in self._sections.get(section, [])]
+
+    def of_type(self, entity_type: str) -> List[str]:
+        """Return the ids of every item of an entity type, in declaration order."""
+        return [item_id for item_id, kind in self.types.items() if kind == entity_type]
+
+    def layer_of(self, item_id: str) -> int:
+        """Return the index of the topological layer of an item."""
+        return next(index for index, layer in enumerate(self.layers) if item_id in layer)
+
+    def __getitem__(self, section: str) -> List[Dict[str, Any]]:
+        return self._sections[section]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __repr__(self) -> str:
+        return f"Landscape({self.path!r}, {len(self.entities)} items, {len(self.layers)} layers)"
+
+
+def _cache_path(digest: str, directory: Optional[str]) -> str:
+    directory = private_cache_dir("foundation-qa-landscapes", directory)
+    return os.path.join(directory, f"landscape-{digest[:16]}.pickle")
+
+
+def load_landscape(path: str, cache_dir: Optional[str] = None) -> Landscape:
+    """
+    Load a compiled landscape, using the on-disk cache when the content is known.
+
+    Args:
+        path: The landscape YAML file
+        cache_dir: Landscape cache directory (``LANDSCAPE_CACHE`` env, else a private tmp dir)
+
+    Returns:
+        The compiled Landscape
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        LandscapeError: If the landscape is invalid
+        PermissionError: If the default cache directory is not private
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Config file not found: {path}")
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    cache_file = _cache_path(digest, cache_dir or os.getenv("LANDSCAPE_CACHE"))
+
+    try:
+        with open(cache_file, "rb") as f:
+            cached_format, landscape = pickle.load(f)
+        if cached_format == LANDSCAPE_FORMAT and landscape.digest == digest:
+            landscape.path = path
+            return landscape
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+        pass
+
+    landscape = Landscape(path, digest, yaml.load(content.decode("utf-8"), Loader=_SafeLoader))
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump((LANDSCAPE_FORMAT, landscape), f)
+    os.replace(tmp_file, cache_file)
+    return landscape
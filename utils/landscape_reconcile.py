@@ -0,0 +1,358 @@
+"""
+Incremental reconciliation of a landscape against the server.
+
+In reconcile mode (``LANDSCAPE_RECONCILE=1``) every landscape entity gets a
+stable name built from the landscape key and its YAML id instead of a random
+suffix. ``fetch_state`` reads the current meshes, systems, sources, objects
+and products with the ``get_all_*`` functions and ``plan_reconcile`` matches
+them to the YAML by that name: only the missing entities are created.
+
+``fetch_details`` reads the existing sources, objects and products back, and
+their configuration (connection, secret names, object config, product
+schema) is issued again when it differs from the payload. The API does not
+expose links, so the links applied to a landscape are recorded in a file
+(``links_path``): a YAML relation missing from the record, e.g. a new product
+input, is linked again. Without a record, the relations of two existing
+entities are assumed to be in place and the plan warns about it.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from api.mesh import get_all_mesh
+from api.object import get_all_object, get_object_by_id
+from api.product import get_all_product, get_product_by_id
+from api.source import get_all_source, get_source_by_id
+from api.system import get_all_system
+from utils.cache_dir import private_cache_dir
+from utils.landscape import SECTIONS
+
+FETCHERS = {
+    "mesh": get_all_mesh,
+    "system": get_all_system,
+    "source": get_all_source,
+    "object": get_all_object,
+    "product": get_all_product,
+}
+
+# Entity types whose configuration is read back by ``fetch_details``
+DETAIL_FETCHERS = {
+    "source": get_source_by_id,
+    "object": get_object_by_id,
+    "product": get_product_by_id,
+}
+
+MAX_NAME_LENGTH = 250
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_\- ]")
+
+
+def reconcile_enabled() -> bool:
+    """Whether landscapes are reconciled with the server (``LANDSCAPE_RECONCILE``, default off)."""
+    return os.getenv("LANDSCAPE_RECONCILE", "").lower() in ("1", "true", "yes")
+
+
+def landscape_key(path: str) -> str:
+    """
+    Return the key that scopes a landscape's entity names.
+
+    Args:
+        path: The landscape YAML file
+
+    Returns:
+        ``LANDSCAPE_KEY`` if set, else the file name without extension
+    """
+    return os.getenv("LANDSCAPE_KEY") or Path(path).stem
+
+
+def stable_name(key: str, item: Mapping[str, Any]) -> str:
+    """
+    Return the name of a landscape item that is the same on every run.
+
+    The name is the item's YAML name followed by the landscape key and the
+    YAML id, restricted to the characters entity names accept.
+
+    Args:
+        key: The landscape key
+        item: The YAML item (``id`` and optional ``name``)
+
+    Returns:
+        The stable entity name
+    """
+    suffix = _INVALID_NAME_CHARS.sub("-", f" {key} {item['id']}")
+    base = _INVALID_NAME_CHARS.sub("-", str(item.get("name") or item["id"]))
+    if not re.match(r"[a-zA-Z_]", base):
+        base = f"_{base}"
+    return base[: MAX_NAME_LENGTH - len(suffix)] + suffix
+
+
+def fetch_state(context: Any, access_token: str, request: Any) -> Dict[str, Dict[str, str]]:
+    """
+    Read the entities that exist on the server.
+
+    Args:
+        context: The API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        Identifiers by entity type and name (the first entity listed wins)
+
+    Raises:
+        RuntimeError: If a listing fails
+    """
+    state: Dict[str, Dict[str, str]] = {}
+    for kind, fetch in FETCHERS.items():
+        response = fetch(context, access_token, request)
+        if not response.ok:
+            raise RuntimeError(f"Cannot list {kind} entities: {response.status} - {response.text()}")
+        body = response.json()
+        items = body.get("entities", []) if isinstance(body, dict) else body
+        names = state.setdefault(kind, {})
+        for item in items or []:
+            entity = item.get("entity", item)
+            if entity.get("name") and entity.get("identifier"):
+                names.setdefault(entity["name"], entity["identifier"])
+    return state
+
+
+def links_path(key: str, directory: Optional[str] = None) -> str:
+    """
+    Return the file recording the links applied to a landscape on the current ``API_URL``.
+
+    Args:
+        key: The landscape key
+        directory: Record directory (``LANDSCAPE_CACHE`` env, else a private tmp dir)
+
+    Returns:
+        The record file path
+    """
+    directory = private_cache_dir(
+        "foundation-qa-landscapes", directory or os.getenv("LANDSCAPE_CACHE")
+    )
+    scope = f"{os.getenv('API_URL', 'http://localhost:8000')}|{key}"
+    return os.path.join(directory, f"links-{hashlib.sha256(scope.encode()).hexdigest()[:16]}.json")
+
+
+def _load_links(path: str) -> Optional[Set[Tuple[str, str]]]:
+    try:
+        with open(path) as f:
+            return {tuple(link) for link in json.load(f)}
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def fetch_details(
+    context: Any, access_token: str, request: Any, plan: "ReconcilePlan"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Read back the existing sources, objects and products of a plan.
+
+    Args:
+        context: The API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+        plan: The reconcile plan
+
+    Returns:
+        The entity bodies by YAML id
+
+    Raises:
+        RuntimeError: If a read fails
+    """
+    details = {}
+    for item_id, kind in plan.existing_of(*DETAIL_FETCHERS):
+        identifier = plan.identifier(item_id)
+        response = DETAIL_FETCHERS[kind](context, identifier, access_token, request)
+        if not response.ok:
+            raise RuntimeError(
+                f"Cannot read {kind} {identifier}: {response.status} - {response.text()}"
+            )
+        details[item_id] = response.json()
+    return details
+
+
+class ReconcilePlan:
+    """The entities of a landscape that exist already and those to create."""
+
+    def __init__(
+        self,
+        key: str,
+        names: Dict[str, str],
+        existing: Dict[str, str],
+        types: Dict[str, str],
+        relations: Optional[List[Tuple[str, str]]] = None,
+        links: Optional[Set[Tuple[str, str]]] = None,
+        links_file: Optional[str] = None,
+    ):
+        self.key = key
+        # YAML id -> stable name / server identifier of the existing entity / entity type
+        self._names = names
+        self._existing = existing
+        self._types = types
+        # (parent, child) YAML ids of the landscape links
+        self._relations = relations or []
+        # (parent, child) identifiers of the recorded links, None without a record
+        self._links = links
+        self._links_file = links_file
+        self._applied: Set[Tuple[str, str]] = set()
+        self._reconfigured: Set[str] = set()
+        # YAML id -> body of the existing entity (see ``fetch_details``)
+        self.details: Dict[str, Dict[str, Any]] = {}
+
+    def name(self, item_id: str) -> str:
+        """Return the stable name of a landscape item."""
+        return self._names[item_id]
+
+    def identifier(self, item_id: str) -> Optional[str]:
+        """Return the identifier of the existing entity for an item, or None if it is missing."""
+        return self._existing.get(item_id)
+
+    def is_new(self, item_id: str) -> bool:
+        """Whether the entity for an item has to be created."""
+        return item_id not in self._existing
+
+    def existing_of(self, *kinds: str) -> List[Tuple[str, str]]:
+        """Return the (YAML id, entity type) of the existing entities of the given types."""
+        return [
+            (item_id, self._types[item_id])
+            for item_id in self._existing
+            if self._types[item_id] in kinds
+        ]
+
+    def needs_link(self, parent_id: str, child_id: str) -> bool:
+        """
+        Whether the link between two items has to be issued.
+
+        It does when either end is created or, for two existing entities,
+        when the link is missing from the record.
+        """
+        if self.is_new(parent_id) or self.is_new(child_id):
+            return True
+        if self._links is None:
+            return False
+        return (self._existing[parent_id], self._existing[child_id]) not in self._links
+
+    def link_applied(self, parent_identifier: str, child_identifier: str) -> None:
+        """Record a link issued during this run."""
+        self._applied.add((parent_identifier, child_identifier))
+
+    def needs_config(self, item_id: str, field: str, payload: Mapping[str, Any]) -> bool:
+        """Whether a configuration payload has to be issued (new entity, or ``field`` differs)."""
+        if self.is_new(item_id):
+            return True
+        return self.details.get(item_id, {}).get(field) != payload
+
+    def needs_secrets(self, item_id: str, payload: Mapping[str, Any]) -> bool:
+        """Whether secrets have to be set (new entity, or a secret name is missing)."""
+        if self.is_new(item_id):
+            return True
+        return not set(payload) <= set(self.details.get(item_id, {}).get("secrets") or [])
+
+    def config_applied(self, item_id: str) -> None:
+        """Record that an existing entity was configured again (and restarted its compute)."""
+        if not self.is_new(item_id):
+            self._reconfigured.add(item_id)
+
+    def is_settled(self, item_id: str) -> bool:
+        """Whether an item's entity existed and was not configured again in this run."""
+        return not self.is_new(item_id) and item_id not in self._reconfigured
+
+    def to_create(self) -> Dict[str, List[str]]:
+        """Return the YAML ids of the entities to create, by entity type."""
+        missing: Dict[str, List[str]] = {}
+        for item_id, kind in self._types.items():
+            if self.is_new(item_id):
+                missing.setdefault(kind, []).append(item_id)
+        return missing
+
+    def summary(self) -> str:
+        """Return a one-line description of the plan."""
+        created = sum(len(ids) for ids in self.to_create().values())
+        links = sum(1 for parent, child in self._relations if self.needs_link(parent, child))
+        return (
+            f"Landscape '{self.key}': {len(self._existing)} existing, {created} to create, "
+            f"{links} links to issue"
+        )
+
+    def warning(self) -> Optional[str]:
+        """Return a warning if the links of existing entities cannot be checked."""
+        if self._links is not None:
+            return None
+        assumed = self._existing_relations()
+        if not assumed:
+            return None
+        return (
+            f"No link record for landscape '{self.key}': {len(assumed)} links between existing "
+            "entities are assumed to be in place; YAML changes to them are not applied"
+        )
+
+    def _existing_relations(self) -> List[Tuple[str, str]]:
+        """Return the landscape links between two existing entities."""
+        return [
+            (parent, child)
+            for parent, child in self._relations
+            if not self.is_new(parent) and not self.is_new(child)
+        ]
+
+    def save_links(self) -> None:
+        """
+        Write the link record: the recorded links, the links applied in this
+        run and, without a previous record, the links assumed to be in place.
+        """
+        if self._links_file is None:
+            return
+        links = set(self._links or ()) | self._applied
+        if self._links is None:
+            links |= {
+                (self._existing[parent], self._existing[child])
+                for parent, child in self._existing_relations()
+            }
+        tmp_path = f"{self._links_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sorted(links), f)
+        os.replace(tmp_path, self._links_file)
+
+
+def plan_reconcile(
+    landscape: Mapping[str, Any],
+    key: str,
+    state: Dict[str, Dict[str, str]],
+    links_file: Optional[str] = None,
+) -> ReconcilePlan:
+    """
+    Match the items of a landscape to the existing entities.
+
+    Args:
+        landscape: The loaded landscape YAML
+        key: The landscape key (see ``landscape_key``)
+        state: The server state returned by ``fetch_state``
+        links_file: The link record (see ``links_path``); None to assume the
+            links of existing entities are in place
+
+    Returns:
+        The reconcile plan
+    """
+    names: Dict[str, str] = {}
+    existing: Dict[str, str] = {}
+    types: Dict[str, str] = {}
+    for section, kind in SECTIONS.items():
+        for item in landscape.get(section) or []:
+            name = stable_name(key, item)
+            names[item["id"]] = name
+            types[item["id"]] = kind
+            identifier = state.get(kind, {}).get(name)
+            if identifier:
+                existing[item["id"]] = identifier
+    relations = [(source["system"], source["id"]) for source in landscape.get("sources") or []]
+    relations += [(item["source"], item["id"]) for item in landscape.get("objects") or []]
+    relations += [
+        (input_id, product["id"])
+        for product in landscape.get("products") or []
+        for input_id in product.get("input") or []
+    ]
+    links = _load_links(links_file) if links_file else None
+    return ReconcilePlan(key, names, existing, types, relations, links, links_file)
@@ -0,0 +1,177 @@
+"""
+Synthetic landscapes for scale testing.
+
+``LandscapeShape`` describes a landscape by its parameters (systems, sources
+per system, objects per source, products per chain level, product fan-in and
+chain depth) and ``generate_landscape`` streams it as landscape YAML, the
+schema ``utils.landscape.load_landscape`` reads. Items are emitted one at a
+time and identified by their position, so memory use does not grow with the
+size of the landscape; the same shape and seed always produce the same file.
+
+Products form ``chain_depth`` levels of ``products`` products each. A
+first-level product reads ``fan_in`` objects drawn at random; a product of
+level ``k`` reads the product at the same position on level ``k - 1`` plus
+``fan_in - 1`` other products of that level, so chains are exactly
+``chain_depth`` products deep.
+"""
+
+import random
+from typing import IO, Iterator, List
+
+
+class LandscapeShape:
+    """The parameters of a synthetic landscape."""
+
+    def __init__(
+        self,
+        systems: int = 10,
+        sources_per_system: int = 2,
+        objects_per_source: int = 5,
+        products: int = 10,
+        fan_in: int = 2,
+        chain_depth: int = 1,
+        meshes: int = 1,
+        seed: int = 0,
+    ):
+        """
+        Initialize the shape.
+
+        Args:
+            systems: Number of systems
+            sources_per_system: Sources linked to each system
+            objects_per_source: Objects linked to each source
+            products: Products on each chain level
+            fan_in: Inputs of each product (capped by what the level below offers)
+            chain_depth: Number of product levels
+            meshes: Number of meshes, products being spread over them
+            seed: Seed of the input draws
+
+        Raises:
+            ValueError: If a count is negative, or products have nothing to read
+        """
+        counts = {
+            "systems": systems,
+            "sources_per_system": sources_per_system,
+            "objects_per_source": objects_per_source,
+            "products": products,
+            "chain_depth": chain_depth,
+        }
+        for name, value in counts.items():
+            if value < 0:
+                raise ValueError(f"{name} must be >= 0, got {value}")
+        if meshes < 1:
+            raise ValueError(f"meshes must be >= 1, got {meshes}")
+        if fan_in < 1:
+            raise ValueError(f"fan_in must be >= 1, got {fan_in}")
+        self.systems = systems
+        self.sources_per_system = sources_per_system
+        self.objects_per_source = objects_per_source
+        self.products = products
+        self.fan_in = fan_in
+        self.chain_depth = chain_depth
+        self.meshes = meshes
+        self.seed = seed
+        if self.product_count and not self.object_count:
+            raise ValueError("Products need objects to read: set systems, sources and objects")
+
+    @property
+    def source_count(self) -> int:
+        return self.systems * self.sources_per_system
+
+    @property
+    def object_count(self) -> int:
+        return self.source_count * self.objects_per_source
+
+    @property
+    def product_count(self) -> int:
+        return self.products * self.chain_depth
+
+    @property
+    def entity_count(self) -> int:
+        """Total number of entities of the landscape."""
+        return (
+            self.meshes + self.systems + self.source_count + self.object_count + self.product_count
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"LandscapeShape(systems={self.systems}, sources_per_system={self.sources_per_system}, "
+            f"objects_per_source={self.objects_per_source}, products={self.products}, "
+            f"fan_in={self.fan_in}, chain_depth={self.chain_depth}, meshes={self.meshes}, "
+            f"seed={self.seed})"
+        )
+
+
+def _item(item_id: str, name: str, **refs: str) -> str:
+    lines = [f"  - id: {item_id}"]
+    lines += [f"    {key}: {value}" for key, value in refs.items()]
+    lines.append(f"    name: {name}")
+    return "\n".join(lines) + "\n"
+
+
+def _product_inputs(shape: LandscapeShape, rng: random.Random, level: int, index: int) -> List[str]:
+    if level == 1:
+        count = min(shape.fan_in, shape.object_count)
+        return [f"obj{n + 1}" for n in sorted(rng.sample(range(shape.object_count), count))]
+    others = rng.sample(range(shape.products - 1), min(shape.fan_in, shape.products) - 1)
+    # Skip the product at the same position, always read first
+    picks = [n if n < index else n + 1 for n in sorted(others)]
+    return [f"prod{level - 1}_{n + 1}" for n in [index, *picks]]
+
+
+def generate_landscape(shape: LandscapeShape) -> Iterator[str]:
+    """
+    Stream the YAML of a synthetic landscape.
+
+    Args:
+        shape: The landscape parameters
+
+    Yields:
+        Chunks of YAML text, one per item or section header
+    """
+    rng = random.Random(shape.seed)
+    yield f"# Synthetic landscape: {shape!r}\n"
+    yield "mesh:\n"
+    for n in range(1, shape.meshes + 1):
+        yield _item(f"mesh{n}", f"Synthetic Mesh {n}")
+
+    yield "\nsystems:" + ("\n" if shape.systems else " []\n")
+    for n in range(1, shape.systems + 1):
+        yield _item(f"sys{n}", f"Synthetic System {n}")
+
+    yield "\nsources:" + ("\n" if shape.source_count else " []\n")
+    for n in range(shape.source_count):
+        system = n // shape.sources_per_system + 1
+        yield _item(f"src{n + 1}", f"Synthetic Source {n + 1}", system=f"sys{system}")
+
+    yield "\nobjects:" + ("\n" if shape.object_count else " []\n")
+    for n in range(shape.object_count):
+        source = n // shape.objects_per_source + 1
+        yield _item(f"obj{n + 1}", f"Synthetic Object {n + 1}", source=f"src{source}")
+
+    yield "\nproducts:" + ("\n" if shape.product_count else " []\n")
+    for level in range(1, shape.chain_depth + 1):
+        for index in range(shape.products):
+            inputs = ", ".join(_product_inputs(shape, rng, level, index))
+            yield _item(
+                f"prod{level}_{index + 1}",
+                f"Synthetic Product {level}-{index + 1}",
+                input=f"[{inputs}]",
+                mesh=f"mesh{(index % shape.meshes) + 1}",
+            )
+
+
+def write_landscape(shape: LandscapeShape, stream: IO[str]) -> int:
+    """
+    Write a synthetic landscape to a text stream.
+
+    Args:
+        shape: The landscape parameters
+        stream: The output stream
+
+    Returns:
+        The number of entities written
+    """
+    for chunk in generate_landscape(shape):
+        stream.write(chunk)
+    return shape.entity_count
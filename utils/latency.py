@@ -0,0 +1,219 @@
+"""
+Per-endpoint latency histograms.
+
+Every request sent through ``utils.api_response.send`` is timed into a
+log-linear (HDR-style) histogram keyed by method and templated endpoint, e.g.
+``GET /api/data/product?identifier={identifier}``. Histograms have a bounded
+relative error (~1.5%) and constant memory per endpoint, and they merge by
+adding bucket counts, which is how xdist workers report to the controller.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from config import API_ENDPOINTS
+
+# Values below SUB_BUCKETS microseconds are exact; above, each power of two is
+# split into HALF linear buckets
+SUB_BUCKETS = 128
+HALF = SUB_BUCKETS // 2
+SHIFT_BASE = SUB_BUCKETS.bit_length() - 1
+
+_KNOWN_PATHS = {path.rstrip("/") for path in API_ENDPOINTS.values()}
+_ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-fA-F-]{16,}|[A-Za-z0-9_-]*\d[A-Za-z0-9_-]{11,})$")
+
+
+def _bucket(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SHIFT_BASE
+    return (shift + 1) * HALF + (value >> shift) - HALF
+
+
+def _bucket_value(bucket: int) -> int:
+    """Return the midpoint (in microseconds) of a bucket."""
+    if bucket < SUB_BUCKETS:
+        return bucket
+    shift = bucket // HALF - 1
+    mantissa = bucket % HALF + HALF
+    return (mantissa << shift) + (1 << shift) // 2
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations, stored sparsely in microseconds."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration (in seconds)."""
+        value = max(0, int(seconds * 1_000_000))
+        bucket = _bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return the value at a percentile, in seconds.
+
+        Args:
+            percent: The percentile (0-100)
+
+        Returns:
+            The duration in seconds (0 if the histogram is empty)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(_bucket_value(bucket), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add every sample of another histogram."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for transport between xdist workers."""
+        return {
+            "counts": [[bucket, count] for bucket, count in self.counts.items()],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram serialized with ``to_dict``."""
+        histogram = cls()
+        histogram.counts = {int(bucket): count for bucket, count in data["counts"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Turn a request URL into a low-cardinality endpoint name.
+
+    Query values and id-like path segments are replaced by placeholders, and
+    trailing slashes are dropped so ``/api/data/product/?identifier=x`` and
+    ``/api/data/product?identifier=y`` share one histogram.
+
+    Args:
+        url: The request URL (absolute or relative)
+
+    Returns:
+        The templated endpoint
+    """
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    if path not in _KNOWN_PATHS:
+        path = "/".join(
+            "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+        )
+    keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    if keys:
+        path += "?" + "&".join(f"{key}={{{key}}}" for key in keys)
+    return path
+
+
+class LatencyRecorder:
+    """Thread-safe collection of histograms keyed by (method, endpoint)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, method: str, url: str, seconds: float) -> None:
+        """
+        Time one request.
+
+        Args:
+            method: The HTTP method
+            url: The request URL
+            seconds: The request duration
+        """
+        key = (method.upper(), endpoint_template(url))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Serialize every histogram (for ``workeroutput``)."""
+        with self._lock:
+            return [
+                {"method": method, "endpoint": endpoint, "histogram": histogram.to_dict()}
+                for (method, endpoint), histogram in self._histograms.items()
+            ]
+
+    def merge(self, snapshot: List[Dict[str, Any]]) -> None:
+        """Add histograms serialized with ``snapshot`` (e.g. from a worker)."""
+        with self._lock:
+            for entry in snapshot:
+                key = (entry["method"], entry["endpoint"])
+                incoming = LatencyHistogram.from_dict(entry["histogram"])
+                if key in self._histograms:
+                    self._histograms[key].merge(incoming)
+                else:
+                    self._histograms[key] = incoming
+
+    def histograms(self) -> Dict[Tuple[str, str], LatencyHistogram]:
+        """Return a copy of the histograms keyed by (method, endpoint)."""
+        with self._lock:
+            return dict(self._histograms)
+
+    def format_summary(self) -> str:
+        """
+        Render p50/p95/p99/max per endpoint, slowest p95 first.
+
+        Returns:
+            The formatted table, or an empty string if nothing was recorded
+        """
+        rows = sorted(
+            self.histograms().items(), key=lambda item: item[1].percentile(95), reverse=True
+        )
+        if not rows:
+            return ""
+        lines = ["⏱ **API Latency (ms)** — p50 / p95 / p99 / max (count)"]
+        for (method, endpoint), histogram in rows:
+            p50, p95, p99 = (histogram.percentile(p) * 1000 for p in (50, 95, 99))
+            lines.append(
+                f"- `{method} {endpoint}`: {p50:.1f} / {p95:.1f} / {p99:.1f} / "
+                f"{histogram.max / 1000:.1f} ({histogram.count})"
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide recorder fed by ``utils.api_response.send``
+LATENCY = LatencyRecorder()
@@ -0,0 +1,286 @@
+"""
+Virtual-user load runner for procedures.
+
+Replays a procedure (``test_data/procedures/*.py``) with N concurrent virtual
+users. Each user runs the procedure's steps in order, over and over until the
+run duration elapses, with its own entity registry and its own name
+namespace (created entities are named ``<run>-vu<N>-<iteration> <name>``), so
+users never resolve or collide with each other's entities. Users start
+evenly spread over the ramp-up period. Step durations are aggregated per
+step type into throughput and latency percentiles.
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+
+from utils.api_trace import trace_context
+from utils.entity_registry import EntityRegistry
+from utils.latency import LatencyHistogram
+from utils.procedure_executor import FAILED, PASSED, SKIPPED, StepRequest
+from utils.procedure_plan import ProcedurePlan
+
+# (request, step, api_context, id_map) -> object with an ``execute()`` method
+StepFactory = Callable[[Any, Dict[str, Any], tuple, EntityRegistry], Any]
+
+# Distinct failure messages kept per step type (later ones are only counted)
+MAX_FAILURE_MESSAGES = 3
+
+
+def failure_message(exc: BaseException, limit: int = 300) -> str:
+    """Return the first line of an exception, prefixed with its type and truncated."""
+    lines = str(exc).strip().splitlines()
+    message = f"{type(exc).__name__}: {lines[0] if lines else ''}".rstrip(": ")
+    return message if len(message) <= limit else message[: limit - 1] + "…"
+
+
+class StepTypeStats:
+    """Outcomes, duration histogram and first failure messages of one step type."""
+
+    __slots__ = ("passed", "failed", "skipped", "histogram", "failures")
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.histogram = LatencyHistogram()
+        # Failure message -> occurrences, for the first MAX_FAILURE_MESSAGES messages
+        self.failures: Dict[str, int] = {}
+
+    def add_failure(self, message: str) -> None:
+        """Count a failure message, keeping at most ``MAX_FAILURE_MESSAGES`` distinct ones."""
+        if message in self.failures or len(self.failures) < MAX_FAILURE_MESSAGES:
+            self.failures[message] = self.failures.get(message, 0) + 1
+
+    @property
+    def count(self) -> int:
+        """Number of executed steps, whatever their outcome."""
+        return self.passed + self.failed + self.skipped
+
+
+class LoadReport:
+    """Aggregated results of a load run."""
+
+    def __init__(
+        self, users: int, elapsed: float, iterations: int, stats: Dict[str, StepTypeStats]
+    ):
+        """
+        Initialize the report.
+
+        Args:
+            users: Number of virtual users
+            elapsed: Wall time of the run in seconds
+            iterations: Number of completed procedure iterations
+            stats: Statistics keyed by step type
+        """
+        self.users = users
+        self.elapsed = elapsed
+        self.iterations = iterations
+        self.stats = stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as JSON-serializable data (durations in ms)."""
+        steps = {}
+        for step_type, stats in self.stats.items():
+            histogram = stats.histogram
+            steps[step_type] = {
+                "count": stats.count,
+                "passed": stats.passed,
+                "failed": stats.failed,
+                "skipped": stats.skipped,
+                "throughput": stats.count / self.elapsed if self.elapsed else 0.0,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p95_ms": histogram.percentile(95) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+                "max_ms": histogram.max / 1000,
+                "failures": dict(stats.failures),
+            }
+        return {
+            "users": self.users,
+            "elapsed": self.elapsed,
+            "iterations": self.iterations,
+            "steps": steps,
+        }
+
+    def format(self) -> str:
+        """Render the per-step-type table."""
+        lines = [
+            f"👥 {self.users} users, {self.iterations} iterations in {self.elapsed:.1f}s",
+            f"{'step type':<32} {'count':>7} {'fail':>5} {'skip':>5} {'ops/s':>8} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+        ]
+        for step_type, row in self.to_dict()["steps"].items():
+            lines.append(
+                f"{step_type:<32} {row['count']:>7} {row['failed']:>5} {row['skipped']:>5} "
+                f"{row['throughput']:>8.2f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+            )
+        failed = {step_type: stats for step_type, stats in self.stats.items() if stats.failures}
+        if failed:
+            lines.append("")
+            lines.append("❌ Failures (first messages per step type)")
+            for step_type, stats in failed.items():
+                lines.append(f"- {step_type} ({stats.failed} failed):")
+                for message, count in stats.failures.items():
+                    lines.append(f"    {count:>5} x {message}")
+        return "\n".join(lines)
+
+
+def namespace_step(step: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+    """
+    Prefix the name of the entity a step creates.
+
+    Args:
+        step: The materialized step
+        prefix: The virtual user's namespace
+
+    Returns:
+        The step, copied with ``input.entity.name`` prefixed when present
+    """
+    payload = step.get("input")
+    entity = payload.get("entity") if isinstance(payload, dict) else None
+    if not isinstance(entity, dict) or not isinstance(entity.get("name"), str):
+        return step
+    named = {**entity, "name": f"{prefix} {entity['name']}"}
+    return {**step, "input": {**payload, "entity": named}}
+
+
+class LoadRunner:
+    """Run a procedure with concurrent virtual users."""
+
+    def __init__(
+        self,
+        plan: ProcedurePlan,
+        step_factory: StepFactory,
+        context_factory: Callable[[], tuple],
+        users: int = 1,
+        ramp_up: float = 0.0,
+        duration: float = 60.0,
+        think_time: float = 0.0,
+        context_release: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            plan: The procedure plan to replay
+            step_factory: Callable building a step, like ``get_step_instance``
+            context_factory: Callable returning ``(context, access_token)`` for the
+                calling thread
+            users: Number of virtual users
+            ramp_up: Seconds over which user start times are spread
+            duration: Seconds after which users stop starting steps
+            think_time: Pause between two steps of a user, in seconds
+            context_release: Optional callable releasing the calling thread's context
+        """
+        self.plan = plan
+        self.step_factory = step_factory
+        self.context_factory = context_factory
+        self.context_release = context_release
+        self.users = max(1, users)
+        self.ramp_up = max(0.0, ramp_up)
+        self.duration = duration
+        self.think_time = think_time
+        # Names must start with a letter
+        self.run_id = f"run{uuid.uuid4().hex[:6]}"
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StepTypeStats] = {}
+        self._iterations = 0
+
+    def run(self) -> LoadReport:
+        """
+        Start every virtual user and wait until the run duration elapses.
+
+        Returns:
+            The aggregated LoadReport
+        """
+        # Import the payload factories once; every iteration forks the plan
+        self.plan.namespace()
+        started = time.perf_counter()
+        deadline = started + self.duration
+        users = [
+            threading.Thread(
+                target=self._user,
+                args=(index, started + index * self.ramp_up / self.users, deadline),
+                name=f"virtual-user-{index}",
+                daemon=True,
+            )
+            for index in range(self.users)
+        ]
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        return LoadReport(self.users, time.perf_counter() - started, self._iterations, self._stats)
+
+    def _user(self, index: int, start_at: float, deadline: float) -> None:
+        """Virtual user loop: run procedure iterations until the deadline."""
+        time.sleep(max(0.0, start_at - time.perf_counter()))
+        if time.perf_counter() >= deadline:
+            return
+        try:
+            api_context = self.context_factory()
+        except Exception as exc:
+            print(f"❌ Virtual user {index} could not get an API context: {exc}")
+            return
+        try:
+            iteration = 0
+            while time.perf_counter() < deadline:
+                if self._iteration(index, iteration, api_context, deadline):
+                    with self._lock:
+                        self._iterations += 1
+                iteration += 1
+        finally:
+            if self.context_release:
+                self.context_release()
+
+    def _iteration(self, index: int, iteration: int, api_context: tuple, deadline: float) -> bool:
+        """
+        Run the procedure once with a fresh registry and freshly generated payloads.
+
+        Returns:
+            True if every step passed
+        """
+        plan = self.plan.fork()
+        id_map = EntityRegistry()
+        prefix = f"{self.run_id}-vu{index}-{iteration}"
+        for position, lazy_step in enumerate(plan.steps):
+            if time.perf_counter() >= deadline:
+                return False
+            step = namespace_step(lazy_step.to_dict(), prefix)
+            step_type = step.get("type", "unknown")
+            request = StepRequest(nodeid=f"vu-{index}:{iteration}:step-{position + 1}")
+            status, error = PASSED, None
+            started = time.perf_counter()
+            try:
+                with trace_context(request.node.nodeid, step_type):
+                    self.step_factory(request, step, api_context, id_map).execute()
+            except pytest.skip.Exception:
+                status = SKIPPED
+            except BaseException as exc:  # pytest.fail raises a BaseException subclass
+                if isinstance(exc, (KeyboardInterrupt, SystemExit)):
+                    raise
+                status, error = FAILED, failure_message(exc)
+            self._record(step_type, status, time.perf_counter() - started, error)
+            if status == FAILED:
+                # Later steps depend on the entities this one should have created
+                return False
+            if self.think_time:
+                time.sleep(self.think_time)
+        return True
+
+    def _record(
+        self, step_type: str, status: str, seconds: float, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get(step_type)
+            if stats is None:
+                stats = self._stats[step_type] = StepTypeStats()
+            setattr(stats, status, getattr(stats, status) + 1)
+            stats.histogram.record(seconds)
+            if error is not None:
+                stats.add_failure(error)
+
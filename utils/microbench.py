@@ -0,0 +1,259 @@
+"""
+Micro-benchmarks of the harness itself.
+
+A ``Benchmark`` times a callable over several rounds (``setup`` runs outside
+the timed region, e.g. to build fresh steps) and reports the best and median
+throughput in operations per second. A separate, untimed round runs under
+``tracemalloc`` to measure the memory allocated per operation (peak) and the
+memory still held afterwards (retained), so that allocation tracking does
+not distort the timings.
+
+Results are appended to a JSON Lines history (``BENCH_HISTORY``, default
+``.benchmarks/history.jsonl``) tagged with the git commit, so that a run can
+be compared with an earlier commit.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_HISTORY = os.path.join(".benchmarks", "history.jsonl")
+
+
+class Benchmark:
+    """A hot path to measure."""
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[Any], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        ops: int = 1,
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            name: The benchmark name
+            function: Callable run once per call, receiving the setup's result
+            setup: Optional callable preparing the state of one call (not timed)
+            ops: Number of operations one call performs
+        """
+        self.name = name
+        self.function = function
+        self.setup = setup
+        self.ops = ops
+
+    def _call(self) -> float:
+        state = self.setup() if self.setup else None
+        start = time.perf_counter()
+        self.function(state)
+        return time.perf_counter() - start
+
+
+class BenchResult:
+    """Throughput and allocations of a benchmark."""
+
+    def __init__(
+        self,
+        name: str,
+        ops: int,
+        rounds: List[float],
+        peak_bytes: float,
+        retained_bytes: float,
+    ):
+        """
+        Initialize the result.
+
+        Args:
+            name: The benchmark name
+            ops: Operations per call
+            rounds: Seconds per call of every timed round
+            peak_bytes: Peak memory allocated during a call, per operation
+            retained_bytes: Memory still allocated after a call, per operation
+        """
+        self.name = name
+        self.ops = ops
+        self.rounds = rounds
+        self.peak_bytes = peak_bytes
+        self.retained_bytes = retained_bytes
+
+    @property
+    def best_ops_per_sec(self) -> float:
+        return self.ops / min(self.rounds)
+
+    @property
+    def median_ops_per_sec(self) -> float:
+        return self.ops / statistics.median(self.rounds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-serializable dict."""
+        return {
+            "ops": self.ops,
+            "rounds": len(self.rounds),
+            "best_ops_per_sec": round(self.best_ops_per_sec, 1),
+            "median_ops_per_sec": round(self.median_ops_per_sec, 1),
+            "peak_bytes_per_op": round(self.peak_bytes, 1),
+            "retained_bytes_per_op": round(self.retained_bytes, 1),
+        }
+
+
+def run_benchmark(benchmark: Benchmark, min_time: float = 1.0, min_rounds: int = 3) -> BenchResult:
+    """
+    Measure a benchmark.
+
+    Args:
+        benchmark: The benchmark
+        min_time: Minimum total seconds of timed calls
+        min_rounds: Minimum number of timed calls
+
+    Returns:
+        The result
+    """
+    # Warm-up: imports, caches and lazy initializations are not measured
+    benchmark._call()
+    rounds: List[float] = []
+    gc.collect()
+    while len(rounds) < min_rounds or sum(rounds) < min_time:
+        rounds.append(benchmark._call())
+
+    state = benchmark.setup() if benchmark.setup else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        benchmark.function(state)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchResult(
+        benchmark.name,
+        benchmark.ops,
+        rounds,
+        (peak - before) / benchmark.ops,
+        max(after - before, 0) / benchmark.ops,
+    )
+
+
+def current_commit() -> str:
+    """Return the short git commit of the working tree, with ``+dirty`` if modified."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}+dirty" if dirty else commit
+
+
+class BenchHistory:
+    """JSON Lines history of benchmark runs."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the history.
+
+        Args:
+            path: The history file (``BENCH_HISTORY`` env, else ``.benchmarks/history.jsonl``)
+        """
+        self.path = path or os.getenv("BENCH_HISTORY") or DEFAULT_HISTORY
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Return every stored run, oldest first."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def append(
+        self, results: List[BenchResult], commit: Optional[str] = None, **meta: Any
+    ) -> Dict[str, Any]:
+        """
+        Store a run.
+
+        Args:
+            results: The results of the run
+            commit: The commit measured (``current_commit()`` if None)
+            **meta: Extra fields to store (parameters of the run)
+
+        Returns:
+            The stored run
+        """
+        run = {
+            "commit": commit or current_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            **meta,
+            "results": {result.name: result.to_dict() for result in results},
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        return run
+
+    def baseline(
+        self, commit: Optional[str] = None, exclude: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the run to compare with.
+
+        Args:
+            commit: A commit prefix to look for (the latest run of it wins)
+            exclude: A commit whose runs are ignored (the one being measured)
+
+        Returns:
+            The latest matching run, or None
+        """
+        for run in reversed(self.runs()):
+            if exclude and run["commit"] == exclude:
+                continue
+            if commit is None or run["commit"].startswith(commit):
+                return run
+        return None
+
+
+def format_results(results: List[BenchResult], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Format results as a table, with the change of median throughput against a baseline.
+
+    Args:
+        results: The results
+        baseline: A stored run to compare with
+
+    Returns:
+        The formatted table
+    """
+    header = (
+        f"{'benchmark':<28} {'ops/s (median)':>15} {'ops/s (best)':>13} "
+        f"{'peak B/op':>11} {'kept B/op':>10}"
+    )
+    if baseline:
+        header += f"  vs {baseline['commit']}"
+    lines = [header, "-" * len(header)]
+    previous = (baseline or {}).get("results", {})
+    for result in results:
+        line = (
+            f"{result.name:<28} {result.median_ops_per_sec:>15,.0f} "
+            f"{result.best_ops_per_sec:>13,.0f} {result.peak_bytes:>11,.0f} "
+            f"{result.retained_bytes:>10,.0f}"
+        )
+        before = previous.get(result.name, {}).get("median_ops_per_sec")
+        if before:
+            line += f"  {(result.median_ops_per_sec / before - 1) * 100:+.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
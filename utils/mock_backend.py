@@ -0,0 +1,530 @@
+"""
+Stateful in-memory stand-in for the data API.
+
+``MockBackend`` implements every route of ``config.API_ENDPOINTS`` on plain
+dictionaries: logins hand out signed JWTs, creates validate their payload
+like the real API (422 with an ``errors`` list) and store the entity under a
+fresh identifier, links are kept in per-route link tables and configuration
+calls are stored on the entity. Sources, objects and products get a compute
+whose lifecycle is played by a ``ComputeSimulator`` and served by the compute
+endpoint. The backend is transport agnostic; ``utils.mock_server`` serves it
+over HTTP.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config import API_ENDPOINTS
+from config.status_check_compute import StatusCheckCompute
+from utils.compute_simulator import INSTANT_DURATIONS, ComputeSimulator
+
+DEFAULT_TOKEN_TTL = 3600
+NAME_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_\- ]{2,249}$")
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+NOT_BLANK_PATTERN = re.compile(r"\s*\S")
+MAX_DESCRIPTION_LENGTH = 1000
+MAX_LABEL_LENGTH = 250
+
+# Route -> entity kind
+ENTITY_ROUTES = {
+    API_ENDPOINTS["MESH"]: "mesh",
+    API_ENDPOINTS["SYSTEM"]: "system",
+    API_ENDPOINTS["SOURCE"]: "source",
+    API_ENDPOINTS["OBJECT"]: "object",
+    API_ENDPOINTS["PRODUCT"]: "product",
+}
+
+# Entity kind -> expected ``entity.entity_type``
+ENTITY_TYPES = {
+    "mesh": "mesh",
+    "system": "data_system",
+    "source": "origin",
+    "object": "resource",
+    "product": "product",
+}
+
+# Route -> (parent kind, child kind); ``identifier`` is the parent
+LINK_ROUTES = {
+    API_ENDPOINTS["LINK_SYSTEM_TO_SOURCE"]: ("system", "source"),
+    API_ENDPOINTS["LINK_OBJECT_TO_SOURCE"]: ("source", "object"),
+    API_ENDPOINTS["LINK_PRODUCT_TO_OBJECT"]: ("object", "product"),
+    API_ENDPOINTS["LINK_PRODUCT_TO_PRODUCT"]: ("product", "product"),
+}
+
+# Route -> (method, entity kind, field storing the payload)
+CONFIG_ROUTES = {
+    API_ENDPOINTS["CONFIG_CONNECTION_DETAIL_SOURCE"]: ("PUT", "source", "connection"),
+    API_ENDPOINTS["CONFIG_OBJECT"]: ("PUT", "object", "config"),
+    API_ENDPOINTS["SET_CONNECTION_SECRET"]: ("POST", "source", "secrets"),
+    API_ENDPOINTS["SCHEMA_PRODUCT"]: ("PUT", "product", "schema"),
+    API_ENDPOINTS["TRANSFORMATION_BUILDER"]: ("PUT", "product", "builder"),
+}
+
+# Kinds that run a compute
+COMPUTE_KINDS = {"source", "object", "product"}
+
+# Kinds whose names are unique (data systems are only identified by id)
+UNIQUE_NAME_KINDS = {"mesh", "source", "object", "product"}
+
+_REASONS = {
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+Response = Tuple[int, Any]
+
+
+class ValidationError(Exception):
+    """Raised while validating a request; rendered as a 422 response."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def error_body(status: int, errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build an error body in the API's format.
+
+    Args:
+        status: The HTTP status code
+        errors: Error items with ``loc``, ``type`` and ``detail``
+
+    Returns:
+        The error response body
+    """
+    return {"errors": errors, "status": status, "title": _REASONS.get(status, "Error")}
+
+
+def _error(status: int, detail: str, loc: Optional[List[str]] = None, kind: str = "error") -> Response:
+    return status, error_body(status, [{"loc": loc or [], "type": kind, "detail": detail}])
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _Validator:
+    """Collects validation errors of one payload."""
+
+    def __init__(self):
+        self.errors: List[Dict[str, Any]] = []
+
+    def fail(self, loc: List[str], kind: str, detail: str) -> None:
+        self.errors.append({"loc": ["body", *loc], "type": kind, "detail": detail})
+
+    def string(
+        self,
+        data: Dict[str, Any],
+        loc: List[str],
+        required: bool = True,
+        pattern: Optional["re.Pattern[str]"] = None,
+        max_length: Optional[int] = None,
+    ) -> None:
+        value = data.get(loc[-1])
+        if value is None:
+            if required:
+                self.fail(loc, "missing", "Field required")
+        elif not isinstance(value, str):
+            self.fail(loc, "string_type", "Input should be a valid string")
+        elif pattern is not None and not pattern.match(value):
+            self.fail(loc, "string_pattern_mismatch", f"String should match pattern '{pattern.pattern}'")
+        elif max_length is not None and len(value) > max_length:
+            self.fail(loc, "string_too_long", f"String should have at most {max_length} characters")
+
+    def email(self, data: Dict[str, Any], loc: List[str], required: bool = True) -> None:
+        value = data.get(loc[-1])
+        if value in (None, "") and not required:
+            return
+        self.string(data, loc)
+        if isinstance(value, str) and not EMAIL_PATTERN.match(value):
+            self.fail(loc, "value_error", "value is not a valid email address")
+
+    def array(self, data: Dict[str, Any], loc: List[str]) -> None:
+        if data.get(loc[-1]) is not None and not isinstance(data[loc[-1]], list):
+            self.fail(loc, "list_type", "Input should be a valid list")
+
+    def mapping(self, data: Dict[str, Any], loc: List[str], required: bool = True) -> Dict[str, Any]:
+        value = data.get(loc[-1])
+        if isinstance(value, dict):
+            return value
+        if value is not None or required:
+            self.fail(loc, "dict_type" if value is not None else "missing", "Input should be a valid object")
+        return {}
+
+
+class MockBackend:
+    """In-memory implementation of the API routes."""
+
+    def __init__(
+        self,
+        users: Optional[Dict[str, str]] = None,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        clock: Callable[[], float] = time.time,
+        simulator: Optional[ComputeSimulator] = None,
+    ):
+        """
+        Initialize an empty backend.
+
+        Args:
+            users: Accepted ``user -> password`` pairs; any non-empty
+                credentials are accepted when None
+            token_ttl: Lifetime of issued tokens in seconds
+            clock: Wall clock used for token expiry (injectable for tests)
+            simulator: Compute lifecycle simulator (computes complete
+                instantly if None)
+        """
+        self.users = users
+        self.token_ttl = token_ttl
+        self.clock = clock
+        self.requests = 0
+        self.entities: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in ENTITY_TYPES}
+        self.links: Dict[str, Set[Tuple[str, str]]] = {route: set() for route in LINK_ROUTES}
+        self.simulator = simulator or ComputeSimulator(durations=INSTANT_DURATIONS)
+        # Compute identifier -> owning entity identifier
+        self.computes: Dict[str, str] = {}
+        self._names: Dict[str, Dict[str, str]] = {kind: {} for kind in ENTITY_TYPES}
+        self._secret = secrets.token_bytes(32)
+        self._lock = threading.RLock()
+
+    def issue_token(self, user: str) -> str:
+        """
+        Issue a signed JWT (HS256) for a user.
+
+        Args:
+            user: The user name (``sub`` claim)
+
+        Returns:
+            The encoded token
+        """
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        claims = _b64(json.dumps({"sub": user, "exp": int(self.clock() + self.token_ttl)}).encode())
+        signature = hmac.new(self._secret, f"{header}.{claims}".encode(), hashlib.sha256).digest()
+        return f"{header}.{claims}.{_b64(signature)}"
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        """Check the Bearer token signature and expiry."""
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        parts = token.split(".")
+        if scheme.lower() != "bearer" or len(parts) != 3:
+            return False
+        expected = hmac.new(
+            self._secret, f"{parts[0]}.{parts[1]}".encode(), hashlib.sha256
+        ).digest()
+        if not hmac.compare_digest(_b64(expected), parts[2]):
+            return False
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return claims["exp"] > self.clock()
+
+    def _login(self, body: Any) -> Response:
+        if not isinstance(body, dict):
+            return _error(422, "Input should be a valid object", ["body"], "dict_type")
+        user, password = body.get("user"), body.get("password")
+        if not user or not password:
+            return _error(401, "Invalid credentials")
+        if self.users is not None and self.users.get(user) != password:
+            return _error(401, "Invalid credentials")
+        return 200, {"access_token": self.issue_token(user), "token_type": "bearer"}
+
+    def handle(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes = b""
+    ) -> Response:
+        """
+        Handle one request.
+
+        Args:
+            method: The HTTP method
+            target: The request target (path and query string)
+            headers: Request headers with lower-case names
+            body: The raw request body
+
+        Returns:
+            Tuple of (status code, JSON-serializable body or None)
+        """
+        method = method.upper()
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        with self._lock:
+            self.requests += 1
+
+        if body and "json" not in headers.get("content-type", "application/json"):
+            return _error(500, "Unsupported content type")
+        payload: Any = None
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError as exc:
+                return _error(422, f"JSON decode error: {exc}", ["body"], "json_invalid")
+
+        if path == API_ENDPOINTS["LOGIN"]:
+            if method != "POST":
+                return _error(405, "Method Not Allowed")
+            return self._login(payload)
+        if not self._authorized(headers):
+            return _error(401, "Not authenticated")
+        if "x-account" not in headers:
+            return _error(422, "Field required", ["header", "x-account"], "missing")
+
+        with self._lock:
+            return self._route(method, path, query, payload)
+
+    def _route(self, method: str, path: str, query: Dict[str, str], payload: Any) -> Response:
+        identifier = query.get("identifier")
+        if path.endswith("/list") and path[: -len("/list")] in ENTITY_ROUTES and method == "GET":
+            return 200, self._list(ENTITY_ROUTES[path[: -len("/list")]])
+        if path in ENTITY_ROUTES:
+            kind = ENTITY_ROUTES[path]
+            if method == "GET":
+                return self._get(kind, identifier) if identifier else (200, self._list(kind))
+            if method == "POST":
+                return self._create(kind, payload)
+            if method == "DELETE":
+                return self._delete(kind, identifier)
+            return _error(405, "Method Not Allowed")
+        if path in LINK_ROUTES:
+            if method != "POST":
+                return _error(405, "Method Not Allowed")
+            return self._link(path, identifier, query.get("child_identifier"))
+        if path in CONFIG_ROUTES:
+            expected, kind, field = CONFIG_ROUTES[path]
+            if method != expected:
+                return _error(405, "Method Not Allowed")
+            return self._configure(kind, field, identifier, payload)
+        if path == API_ENDPOINTS["CHECK_COMPUTE"]:
+            if method != "GET":
+                return _error(405, "Method Not Allowed")
+            return self._compute(identifier)
+        return _error(404, f"No route for {path}")
+
+    def _validate(self, kind: str, payload: Any) -> None:
+        """Raise ValidationError unless ``payload`` is a valid create body for ``kind``."""
+        check = _Validator()
+        if not isinstance(payload, dict):
+            check.fail([], "dict_type" if payload is not None else "missing", "Input should be a valid object")
+            raise ValidationError(check.errors)
+        entity = check.mapping(payload, ["entity"])
+        info = check.mapping(payload, ["entity_info"], required=kind == "system")
+        if entity:
+            entity_type = entity.get("entity_type")
+            if entity_type != ENTITY_TYPES[kind]:
+                check.fail(
+                    ["entity", "entity_type"],
+                    "missing" if entity_type is None else "literal_error",
+                    f"Input should be '{ENTITY_TYPES[kind]}'",
+                )
+            check.string(entity, ["entity", "name"], pattern=NAME_PATTERN)
+            check.string(entity, ["entity", "label"], max_length=MAX_LABEL_LENGTH)
+            check.string(entity, ["entity", "description"], required=False, max_length=MAX_DESCRIPTION_LENGTH)
+            if kind == "system":
+                owner = check.mapping(entity, ["entity", "owner_person"])
+                if owner:
+                    check.email(owner, ["entity", "owner_person", "email"])
+                    check.string(owner, ["entity", "owner_person", "full_name"], pattern=NOT_BLANK_PATTERN)
+            if kind == "mesh":
+                check.array(entity, ["entity", "assignees"])
+                check.array(entity, ["entity", "security_policy"])
+                for index, assignee in enumerate(entity.get("assignees") or []):
+                    loc = ["entity", "assignees", str(index)]
+                    if not isinstance(assignee, dict):
+                        check.fail(loc, "dict_type", "Input should be a valid object")
+                        continue
+                    check.email(assignee, [*loc, "email"])
+                    check.string(assignee, [*loc, "full_name"], pattern=NOT_BLANK_PATTERN)
+        check.email(info, ["entity_info", "owner"], required=kind == "system")
+        check.array(info, ["entity_info", "contact_ids"])
+        check.array(info, ["entity_info", "links"])
+        if kind == "product":
+            host = payload.get("host_mesh_identifier")
+            if host not in self.entities["mesh"]:
+                check.fail(["host_mesh_identifier"], "value_error", f"Unknown mesh '{host}'")
+        if check.errors:
+            raise ValidationError(check.errors)
+
+    def _create(self, kind: str, payload: Any) -> Response:
+        try:
+            self._validate(kind, payload)
+        except ValidationError as exc:
+            return 422, error_body(422, exc.errors)
+        name = payload["entity"]["name"]
+        if kind in UNIQUE_NAME_KINDS and name in self._names[kind]:
+            return _error(409, f"{ENTITY_TYPES[kind]} '{name}' already exists", ["body", "entity", "name"], "conflict")
+
+        identifier = str(uuid.uuid4())
+        entity = payload["entity"]
+        fields = {
+            "identifier": identifier,
+            "name": entity["name"],
+            "description": entity.get("description", ""),
+            "label": entity["label"],
+            "urn": f"urn:{ENTITY_TYPES[kind]}:{identifier}",
+            "created_at": _now(),
+        }
+        info = payload.get("entity_info") or {}
+        entity_info = {
+            "owner": info.get("owner", ""),
+            "contact_ids": info.get("contact_ids") or [],
+            "links": info.get("links") or [],
+        }
+        record: Dict[str, Any] = {"entity": fields, "entity_info": entity_info}
+        if kind == "system":
+            owner = entity["owner_person"]
+            fields["owner_person"] = {"email": owner["email"], "full_name": owner["full_name"]}
+        elif kind == "mesh":
+            fields["purpose"] = entity.get("purpose", "")
+        elif kind == "product":
+            record["host_mesh_identifier"] = payload["host_mesh_identifier"]
+        if kind in COMPUTE_KINDS:
+            record["compute_identifier"] = self._start_compute(identifier)
+        self.entities[kind][identifier] = record
+        self._names[kind][fields["name"]] = identifier
+        return 201, self._render(kind, record, created=True)
+
+    def _render(self, kind: str, record: Dict[str, Any], created: bool = False) -> Dict[str, Any]:
+        """Shape a stored entity like the API does for ``kind``."""
+        if kind == "system":
+            # Systems are returned flat
+            return {**record["entity"]}
+        body = {"entity": {**record["entity"]}, "entity_info": {**record["entity_info"]}}
+        if created or kind not in COMPUTE_KINDS:
+            return body
+        compute_id = record["compute_identifier"]
+        status = self.simulator.status(compute_id)
+        healthy = status == StatusCheckCompute.COMPLETED.value
+        if kind == "product":
+            body["host_mesh_identifier"] = record["host_mesh_identifier"]
+            body["compute"] = {"identifier": compute_id, "status": status}
+            body["schema"] = record.get("schema")
+            body["builder"] = record.get("builder")
+            return body
+        body["entity"].update(compute_identifier=compute_id, healthy=healthy)
+        body.update(compute_identifier=compute_id, healthy=healthy)
+        if kind == "source":
+            body["connection"] = record.get("connection")
+            body["secrets"] = sorted((record.get("secrets") or {}).keys())
+        else:
+            body["config"] = record.get("config")
+        return body
+
+    def _list(self, kind: str) -> Dict[str, Any]:
+        entities = [
+            {**record["entity"], "entity_info": record["entity_info"]}
+            for record in self.entities[kind].values()
+        ]
+        return {"entities": entities, "total": len(entities)}
+
+    def _get(self, kind: str, identifier: str) -> Response:
+        record = self.entities[kind].get(identifier)
+        if record is None:
+            return _error(404, f"{ENTITY_TYPES[kind]} '{identifier}' not found")
+        return 200, self._render(kind, record)
+
+    def _dependents(self, kind: str, identifier: str) -> int:
+        """Count the links and hosted products that keep an entity from being deleted."""
+        count = sum(
+            1
+            for route, (parent_kind, _) in LINK_ROUTES.items()
+            if parent_kind == kind
+            for parent, _ in self.links[route]
+            if parent == identifier
+        )
+        if kind == "mesh":
+            count += sum(
+                1
+                for product in self.entities["product"].values()
+                if product["host_mesh_identifier"] == identifier
+            )
+        return count
+
+    def _delete(self, kind: str, identifier: Optional[str]) -> Response:
+        if not identifier:
+            return _error(422, "Field required", ["query", "identifier"], "missing")
+        if identifier not in self.entities[kind]:
+            return _error(404, f"{ENTITY_TYPES[kind]} '{identifier}' not found")
+        dependents = self._dependents(kind, identifier)
+        if dependents:
+            return _error(409, f"{ENTITY_TYPES[kind]} '{identifier}' still has {dependents} dependents")
+        record = self.entities[kind].pop(identifier)
+        if self._names[kind].get(record["entity"]["name"]) == identifier:
+            del self._names[kind][record["entity"]["name"]]
+        for route, (_, child_kind) in LINK_ROUTES.items():
+            if child_kind == kind:
+                self.links[route] = {link for link in self.links[route] if link[1] != identifier}
+        compute_identifier = record.get("compute_identifier")
+        if compute_identifier:
+            self.computes.pop(compute_identifier, None)
+            self.simulator.forget(compute_identifier)
+        return 200, {"identifier": identifier, "deleted": True}
+
+    def _link(self, route: str, parent: Optional[str], child: Optional[str]) -> Response:
+        parent_kind, child_kind = LINK_ROUTES[route]
+        for name, value in (("identifier", parent), ("child_identifier", child)):
+            if not value:
+                return _error(422, "Field required", ["query", name], "missing")
+        if parent not in self.entities[parent_kind]:
+            return _error(404, f"{ENTITY_TYPES[parent_kind]} '{parent}' not found")
+        if child not in self.entities[child_kind]:
+            return _error(404, f"{ENTITY_TYPES[child_kind]} '{child}' not found")
+        if parent == child:
+            return _error(422, "An entity cannot be linked to itself", ["query", "child_identifier"], "value_error")
+        self.links[route].add((parent, child))
+        return 200, {"identifier": parent, "child_identifier": child}
+
+    def _configure(self, kind: str, field: str, identifier: Optional[str], payload: Any) -> Response:
+        if not identifier:
+            return _error(422, "Field required", ["query", "identifier"], "missing")
+        record = self.entities[kind].get(identifier)
+        if record is None:
+            return _error(404, f"{ENTITY_TYPES[kind]} '{identifier}' not found")
+        if not isinstance(payload, dict):
+            return _error(422, "Input should be a valid object", ["body"], "dict_type")
+        if field == "secrets":
+            record["secrets"] = {**(record.get("secrets") or {}), **payload}
+        else:
+            record[field] = payload
+            record["compute_identifier"] = self._start_compute(identifier, record.get("compute_identifier"))
+        return 200, {"identifier": identifier, field: sorted(payload) if field == "secrets" else payload}
+
+    def _start_compute(self, entity_identifier: str, compute_identifier: Optional[str] = None) -> str:
+        """
+        Create or restart the compute of an entity in the simulator.
+
+        Args:
+            entity_identifier: The entity owning the compute
+            compute_identifier: The existing compute to restart, if any
+
+        Returns:
+            The compute identifier
+        """
+        compute_identifier = compute_identifier or str(uuid.uuid4())
+        self.computes[compute_identifier] = entity_identifier
+        self.simulator.start(compute_identifier)
+        return compute_identifier
+
+    def _compute(self, identifier: Optional[str]) -> Response:
+        if not identifier or identifier not in self.computes:
+            return _error(404, f"compute '{identifier}' not found")
+        return 200, {
+            "identifier": identifier,
+            "entity_identifier": self.computes[identifier],
+            "status": {"status": self.simulator.status(identifier)},
+        }
@@ -0,0 +1,206 @@
+"""
+Local HTTP server for the in-memory mock backend.
+
+``MockApiServer`` serves a ``MockBackend`` over HTTP/1.1 (keep-alive) from an
+asyncio event loop running on a daemon thread of the current process, so
+Playwright request contexts, the async API layer and the root scripts talk to
+it exactly like they talk to the real API. With ``MOCK_SERVER=1`` the test
+session starts one and points ``API_URL`` at it (see ``start_from_env``).
+"""
+
+import asyncio
+import json
+import os
+import threading
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Set
+
+from utils.compute_simulator import INSTANT_DURATIONS, ComputeSimulator
+from utils.mock_backend import MockBackend, error_body
+
+# Credentials used when the environment does not define any
+DEFAULT_ENV = {
+    "QA_USERNAME": "qa-user",
+    "QA_PASSWORD": "qa-password",
+    "OWNER_EMAIL": "qa.owner@example.com",
+    "OWNER_NAME": "QA Owner",
+}
+
+
+class MockApiServer:
+    """HTTP front end of a MockBackend, running on a background event loop."""
+
+    def __init__(self, backend: Optional[MockBackend] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            backend: The backend to serve (a fresh MockBackend if None)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.backend = backend or MockBackend()
+        self.host = host
+        self.port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def base_url(self) -> str:
+        """The server's base URL."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """
+        Start listening on a background thread.
+
+        Returns:
+            The base URL of the server
+        """
+        if self._thread is not None:
+            return self.base_url
+        ready = threading.Event()
+        errors = []
+
+        def serve() -> None:
+            loop = self._loop = asyncio.new_event_loop()
+            try:
+                self._server = loop.run_until_complete(
+                    asyncio.start_server(self._connection, self.host, self.port)
+                )
+            except OSError as exc:
+                errors.append(exc)
+                ready.set()
+                loop.close()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+        self._thread = threading.Thread(target=serve, name="mock-api-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self.base_url
+
+    def stop(self) -> None:
+        """Close every connection and stop the server thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def __enter__(self) -> "MockApiServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = await self._read_headers(reader)
+                body = await self._read_body(reader, headers)
+                try:
+                    status, payload = self.backend.handle(method, target, headers, body)
+                except Exception as exc:
+                    status = 500
+                    payload = error_body(500, [{"loc": [], "type": "error", "detail": str(exc)}])
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.CancelledError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # Client gone, malformed request or server shutdown
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    return b"".join(chunks)
+                chunks.append(chunk[:-2])
+        length = int(headers.get("content-length", "0") or 0)
+        return await reader.readexactly(length) if length else b""
+
+    @staticmethod
+    def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+        body = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode()
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+
+def start_from_env() -> Optional[MockApiServer]:
+    """
+    Start a mock server when ``MOCK_SERVER`` is set and point the API settings at it.
+
+    ``API_URL`` is set to the server, ``API_TOKEN`` is cleared, the token cache
+    is disabled (tokens are only valid for the server that issued them) and
+    missing credentials and owner settings get defaults (see ``DEFAULT_ENV``).
+    ``MOCK_SERVER_PORT`` picks a fixed port (default: any free port). Computes
+    complete instantly unless ``COMPUTE_SIM_DURATIONS`` sets phase durations
+    (in wall-clock seconds, see ``ComputeSimulator.from_env``).
+
+    Returns:
+        The running MockApiServer, or None when ``MOCK_SERVER`` is not set
+    """
+    if os.getenv("MOCK_SERVER", "").lower() not in ("1", "true", "yes"):
+        return None
+    backend = MockBackend(simulator=ComputeSimulator.from_env(durations=INSTANT_DURATIONS))
+    server = MockApiServer(backend, port=int(os.getenv("MOCK_SERVER_PORT", "0")))
+    os.environ["API_URL"] = server.start()
+    os.environ.pop("API_TOKEN", None)
+    os.environ["TOKEN_CACHE"] = "0"
+    for name, value in DEFAULT_ENV.items():
+        if not os.getenv(name):
+            os.environ[name] = value
+    return server
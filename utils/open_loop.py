@@ -0,0 +1,208 @@
+"""
+Open-loop, rate-controlled request generator.
+
+Closed-loop runners only send a request once the previous one returned, so a
+slow backend also slows down the load and queueing never shows up in the
+numbers (coordinated omission). This generator schedules ``create_*`` calls
+at fixed intervals for a target rate, whatever the backend does, on the async
+API layer. Each call's latency is measured from its *scheduled* start, so time
+spent waiting for a connection or for a late scheduler is counted; the
+response time from the actual send is kept alongside for comparison.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from api.aio.bulk import created_identifier
+from api.aio.client import read_response
+from api.aio.mesh import create_mesh
+from api.aio.object import create_object
+from api.aio.product import create_product
+from api.aio.source import create_source
+from api.aio.system import create_system
+from test_data.shared.mesh_payload import create_mesh_payload
+from test_data.shared.object_payload import create_object_payload
+from test_data.shared.product_payload import create_product_payload
+from test_data.shared.source_payload import create_source_payload
+from test_data.shared.system_payload import create_system_payload
+from utils.latency import LatencyHistogram
+
+# Target -> (async create function, payload factory(host mesh identifier))
+TARGETS: Dict[str, Tuple[Callable[..., Awaitable[Any]], Callable[[Optional[str]], Dict]]] = {
+    "mesh": (create_mesh, lambda mesh_id: create_mesh_payload()),
+    "system": (create_system, lambda mesh_id: create_system_payload()),
+    "source": (create_source, lambda mesh_id: create_source_payload()),
+    "object": (create_object, lambda mesh_id: create_object_payload()),
+    "product": (create_product, lambda mesh_id: create_product_payload(mesh_id)),
+}
+
+
+class TargetStats:
+    """Counters and latency histograms (scheduled-start and actual-send based) of one target."""
+
+    __slots__ = ("sent", "errors", "corrected", "service")
+
+    def __init__(self):
+        self.sent = 0
+        self.errors = 0
+        self.corrected = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+
+class OpenLoopReport:
+    """Results of one open-loop stage."""
+
+    def __init__(self, rate: float, elapsed: float, stats: Dict[str, TargetStats]):
+        """
+        Initialize the report.
+
+        Args:
+            rate: The target rate in requests per second
+            elapsed: Seconds until the last response arrived
+            stats: Statistics keyed by target
+        """
+        self.rate = rate
+        self.elapsed = elapsed
+        self.stats = stats
+
+    @property
+    def sent(self) -> int:
+        """Total number of requests sent."""
+        return sum(stats.sent for stats in self.stats.values())
+
+    @property
+    def achieved_rate(self) -> float:
+        """Completed requests per second."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as JSON-serializable data (latencies in ms)."""
+        targets = {}
+        for target, stats in self.stats.items():
+            corrected, service = stats.corrected, stats.service
+            targets[target] = {
+                "sent": stats.sent,
+                "errors": stats.errors,
+                "corrected_p50_ms": corrected.percentile(50) * 1000,
+                "corrected_p99_ms": corrected.percentile(99) * 1000,
+                "corrected_max_ms": corrected.max / 1000,
+                "service_p50_ms": service.percentile(50) * 1000,
+                "service_p99_ms": service.percentile(99) * 1000,
+            }
+        return {
+            "rate": self.rate,
+            "achieved_rate": self.achieved_rate,
+            "elapsed": self.elapsed,
+            "targets": targets,
+        }
+
+    def format(self) -> str:
+        """Render the per-target table."""
+        lines = [
+            f"🎯 {self.rate:g} req/s target, {self.achieved_rate:.1f} req/s achieved, "
+            f"{self.sent} requests in {self.elapsed:.1f}s",
+            f"{'target':<10} {'sent':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'max ms':>9} {'svc p50':>9} {'svc p99':>9}",
+        ]
+        for target, row in self.to_dict()["targets"].items():
+            lines.append(
+                f"{target:<10} {row['sent']:>7} {row['errors']:>7} "
+                f"{row['corrected_p50_ms']:>9.1f} {row['corrected_p99_ms']:>9.1f} "
+                f"{row['corrected_max_ms']:>9.1f} {row['service_p50_ms']:>9.1f} "
+                f"{row['service_p99_ms']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+class OpenLoopGenerator:
+    """Send ``create_*`` requests at a fixed rate, independently of response times."""
+
+    def __init__(
+        self,
+        context: Any,
+        access_token: str,
+        targets: Sequence[str] = tuple(TARGETS),
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            context: The async API request context (e.g. a ``BoundedContext``)
+            access_token: Authentication token for API access
+            targets: Targets to cycle through (keys of ``TARGETS``)
+            clock: Monotonic clock (injectable for tests)
+
+        Raises:
+            ValueError: If a target is unknown
+        """
+        unknown = [target for target in targets if target not in TARGETS]
+        if unknown or not targets:
+            raise ValueError(f"Unknown targets: {unknown or 'none given'}")
+        self.context = context
+        self.access_token = access_token
+        self.targets = list(targets)
+        self.clock = clock
+        self.host_mesh: Optional[str] = None
+
+    async def prepare(self) -> None:
+        """
+        Create the host mesh that generated products are attached to.
+
+        Raises:
+            RuntimeError: If the mesh could not be created
+        """
+        if "product" not in self.targets or self.host_mesh:
+            return
+        response = await create_mesh(
+            self.context, create_mesh_payload("Open loop host"), self.access_token, None
+        )
+        body = await read_response(response)
+        self.host_mesh = created_identifier(body) if response.ok else None
+        if self.host_mesh is None:
+            raise RuntimeError(f"Could not create the host mesh: {response.status} - {body}")
+
+    async def run(self, rate: float, duration: float) -> OpenLoopReport:
+        """
+        Send requests at ``rate`` per second for ``duration`` seconds.
+
+        Request ``n`` is scheduled at ``start + n / rate`` and targets
+        ``targets[n % len(targets)]``. Sending never waits for earlier responses.
+
+        Args:
+            rate: Target requests per second
+            duration: Seconds during which requests are scheduled
+
+        Returns:
+            The OpenLoopReport of the stage
+        """
+        await self.prepare()
+        stats = {target: TargetStats() for target in self.targets}
+        total = int(rate * duration)
+        start = self.clock()
+        tasks: List["asyncio.Task[None]"] = []
+        for n in range(total):
+            scheduled = start + n / rate
+            # Always yield so in-flight requests progress even when the schedule is late
+            await asyncio.sleep(max(0.0, scheduled - self.clock()))
+            target = self.targets[n % len(self.targets)]
+            tasks.append(asyncio.ensure_future(self._fire(target, scheduled, stats[target])))
+        await asyncio.gather(*tasks)
+        return OpenLoopReport(rate, self.clock() - start, stats)
+
+    async def _fire(self, target: str, scheduled: float, stats: TargetStats) -> None:
+        """Send one request and record its corrected and service latencies."""
+        create, build_payload = TARGETS[target]
+        payload = build_payload(self.host_mesh)
+        sent_at = self.clock()
+        try:
+            response = await create(self.context, payload, self.access_token, None)
+            ok = response.ok
+        except Exception:
+            ok = False
+        finished = self.clock()
+        stats.sent += 1
+        stats.errors += 0 if ok else 1
+        stats.corrected.record(finished - scheduled)
+        stats.service.record(finished - sent_at)
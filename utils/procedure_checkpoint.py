@@ -0,0 +1,298 @@
+"""
+Checkpoints of procedure runs.
+
+Every procedure run gets a run id. After each successful step, the entity
+registry and the set of completed steps are written to
+``<PROCEDURE_CHECKPOINT_DIR>/<run-id>.json`` (default
+``<tmp>/foundation-qa-runs``). ``pytest --resume <run-id>`` restores them:
+the stored identifiers are revalidated against the server (``get_*_by_id``,
+or the listing for meshes and systems), the steps touching an entity that is
+gone run again, and every other completed step is skipped, compute waits
+included.
+
+A run that does not complete keeps its entities out of the end-of-session
+teardown so that it can be resumed; once every step has completed, the
+checkpoint is removed and the entities are torn down as usual.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from api.mesh import get_all_mesh
+from api.object import get_object_by_id
+from api.product import get_product_by_id
+from api.source import get_source_by_id
+from api.system import get_all_system
+from utils.procedure_executor import collect_step_refs
+from utils.procedure_plan import step_id
+from utils.teardown import defer_teardown, keep_after_teardown
+
+# Entity type -> lookup by identifier
+FETCHERS_BY_ID = {
+    "source": get_source_by_id,
+    "object": get_object_by_id,
+    "product": get_product_by_id,
+}
+
+# Entity types without a lookup by identifier -> listing
+LISTINGS = {
+    "mesh": get_all_mesh,
+    "system": get_all_system,
+}
+
+
+def checkpoint_enabled() -> bool:
+    """Whether procedure runs are checkpointed (``PROCEDURE_CHECKPOINT``, default on)."""
+    return os.getenv("PROCEDURE_CHECKPOINT", "1").lower() not in ("0", "false", "no")
+
+
+def checkpoint_dir() -> str:
+    """Return the checkpoint directory (``PROCEDURE_CHECKPOINT_DIR``)."""
+    return os.getenv("PROCEDURE_CHECKPOINT_DIR") or os.path.join(
+        tempfile.gettempdir(), "foundation-qa-runs"
+    )
+
+
+def new_run_id() -> str:
+    """Return a fresh run id like ``20240501-142233-a1b2c3``."""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 of a file's content."""
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+class ProcedureCheckpoint:
+    """The completed steps and registered entities of a procedure run."""
+
+    def __init__(
+        self,
+        path: str,
+        run_id: str,
+        procedure: str,
+        digest: str = "",
+        completed: Optional[Iterable[str]] = None,
+        entities: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize a checkpoint.
+
+        Args:
+            path: The checkpoint file
+            run_id: The run id
+            procedure: The procedure file
+            digest: SHA-256 of the procedure file when the run started
+            completed: Ids of the completed steps (see ``step_id``)
+            entities: The registry content, as ``{id: entity}``
+        """
+        self.path = path
+        self.run_id = run_id
+        self.procedure = procedure
+        self.digest = digest
+        self.completed: Set[str] = set(completed or ())
+        # Steps completed by the run being resumed
+        self.resumed: Set[str] = set(self.completed)
+        self.entities: Dict[str, Dict[str, Any]] = dict(entities or {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, procedure: str, directory: Optional[str] = None) -> "ProcedureCheckpoint":
+        """
+        Start the checkpoint of a new run.
+
+        Args:
+            procedure: The procedure file
+            directory: The checkpoint directory (``checkpoint_dir()`` if None)
+
+        Returns:
+            An empty checkpoint with a fresh run id
+        """
+        directory = directory or checkpoint_dir()
+        os.makedirs(directory, exist_ok=True)
+        run_id = new_run_id()
+        path = os.path.join(directory, f"{run_id}.json")
+        return cls(path, run_id, procedure, file_digest(procedure))
+
+    @classmethod
+    def load(
+        cls, run_id: str, procedure: str, directory: Optional[str] = None
+    ) -> "ProcedureCheckpoint":
+        """
+        Load the checkpoint of an earlier run.
+
+        Args:
+            run_id: The run id
+            procedure: The procedure file being run
+            directory: The checkpoint directory (``checkpoint_dir()`` if None)
+
+        Returns:
+            The checkpoint
+
+        Raises:
+            FileNotFoundError: If the run has no checkpoint
+            ValueError: If the run executed another procedure
+        """
+        path = os.path.join(directory or checkpoint_dir(), f"{run_id}.json")
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if os.path.normpath(data["procedure"]) != os.path.normpath(procedure):
+            raise ValueError(f"Run {run_id} executed {data['procedure']}, not {procedure}")
+        if data.get("digest") != file_digest(procedure):
+            print(f"⚠️ {procedure} changed since run {run_id}: steps are matched by id")
+        return cls(
+            path,
+            run_id,
+            data["procedure"],
+            data.get("digest", ""),
+            data["completed"],
+            data["entities"],
+        )
+
+    def is_completed(self, key: str) -> bool:
+        """Whether a step completed in this run (or the run it resumes)."""
+        return key in self.completed
+
+    def is_resumed(self, key: str) -> bool:
+        """Whether a step completed in the run being resumed (and is skipped)."""
+        return key in self.resumed
+
+    def complete(self, key: str, registry: Any) -> None:
+        """
+        Mark a step as completed and write the checkpoint.
+
+        Args:
+            key: The step id (see ``step_id``)
+            registry: The entity registry to store
+        """
+        with self._lock:
+            self.completed.add(key)
+            self.entities = registry.to_dict()
+            self._save()
+
+    def _save(self) -> None:
+        data = {
+            "run_id": self.run_id,
+            "procedure": self.procedure,
+            "digest": self.digest,
+            "completed": sorted(self.completed),
+            "entities": self.entities,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(temporary, self.path)
+
+    def invalidate(self, entity_ids: Iterable[str], steps: List[Mapping[str, Any]]) -> List[str]:
+        """
+        Forget entities and mark the completed steps touching them as pending.
+
+        Args:
+            entity_ids: The landscape ids of the entities that are gone
+            steps: The ordered procedure steps
+
+        Returns:
+            The ids of the steps to run again
+        """
+        gone = set(entity_ids)
+        if not gone:
+            return []
+        rerun = []
+        with self._lock:
+            for entity_id in gone:
+                self.entities.pop(entity_id, None)
+            for index, step in enumerate(steps):
+                key = step_id(index, step)
+                if key not in self.completed:
+                    continue
+                writes, reads = collect_step_refs(step)
+                if (writes | reads) & gone:
+                    self.completed.discard(key)
+                    self.resumed.discard(key)
+                    rerun.append(key)
+        return rerun
+
+    def restore(self, registry: Any) -> None:
+        """Register the stored entities in a registry."""
+        for entity in self.entities.values():
+            registry.register(entity)
+
+    def finish(self, registry: Any, steps: List[Mapping[str, Any]]) -> bool:
+        """
+        Close the run at the end of the session.
+
+        A completed run removes its checkpoint and hands every entity (created
+        by this run or by the runs it resumes) to the teardown; an incomplete
+        run keeps its entities for ``--resume``.
+
+        Args:
+            registry: The entity registry
+            steps: The ordered procedure steps
+
+        Returns:
+            Whether every step completed
+        """
+        entities: Dict[str, List[str]] = {}
+        for record in registry:
+            if record.get("type") and record.get("identifier"):
+                entities.setdefault(record["type"], []).append(record["identifier"])
+        if all(self.is_completed(step_id(index, step)) for index, step in enumerate(steps)):
+            defer_teardown(entities)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return True
+        keep_after_teardown(entities)
+        print(f"📌 Procedure run {self.run_id} incomplete: resume with --resume {self.run_id}")
+        return False
+
+
+def revalidate(
+    checkpoint: ProcedureCheckpoint, context: Any, access_token: str, request: Any
+) -> List[str]:
+    """
+    Check that the entities stored in a checkpoint still exist.
+
+    Args:
+        checkpoint: The loaded checkpoint
+        context: The API request context
+        access_token: Authentication token for API access
+        request: The test request object for logging
+
+    Returns:
+        The landscape ids of the entities that are gone
+
+    Raises:
+        RuntimeError: If the server cannot tell whether an entity exists
+    """
+    listed: Dict[str, Set[str]] = {}
+    gone = []
+    for entity_id, entity in checkpoint.entities.items():
+        kind, identifier = entity.get("type"), entity.get("identifier")
+        if kind in FETCHERS_BY_ID:
+            response = FETCHERS_BY_ID[kind](context, identifier, access_token, request)
+            if response.status == 404:
+                gone.append(entity_id)
+            elif not response.ok:
+                raise RuntimeError(f"Cannot check {kind} {identifier}: {response.status}")
+        elif kind in LISTINGS:
+            if kind not in listed:
+                listed[kind] = _listed_identifiers(kind, context, access_token, request)
+            if identifier not in listed[kind]:
+                gone.append(entity_id)
+    return gone
+
+
+def _listed_identifiers(kind: str, context: Any, access_token: str, request: Any) -> Set[str]:
+    response = LISTINGS[kind](context, access_token, request)
+    if not response.ok:
+        raise RuntimeError(f"Cannot list {kind} entities: {response.status}")
+    body = response.json()
+    items = body.get("entities", []) if isinstance(body, dict) else body
+    return {item.get("entity", item).get("identifier") for item in items or []}
@@ -0,0 +1,344 @@
+"""
+Dependency-aware parallel executor for procedure steps.
+
+This module infers a dependency graph from the ``id``/``ref``/``*_ref`` fields
+of procedure step configurations and runs independent branches concurrently
+on a pool of worker threads.
+"""
+
+import heapq
+import queue
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pytest
+
+from utils.api_trace import trace_context
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+BLOCKED = "blocked"
+
+
+def collect_step_refs(step: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+    """
+    Collect the entity references touched by a step.
+
+    A step *writes* the entity it defines (``id``) or acts upon (``ref``) and
+    *reads* every entity referenced from its input (``*_ref`` keys and
+    ``*_refs`` lists, at any depth).
+
+    Args:
+        step: The step configuration
+
+    Returns:
+        Tuple of (writes, reads) sets of landscape ids
+    """
+    writes = {step[key] for key in ("id", "ref") if isinstance(step.get(key), str)}
+    reads: Set[str] = set()
+
+    def _walk(value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key.endswith("_ref") and isinstance(item, str):
+                    reads.add(item)
+                elif key.endswith("_refs") and isinstance(item, (list, tuple)):
+                    reads.update(ref for ref in item if isinstance(ref, str))
+                else:
+                    _walk(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                _walk(item)
+
+    _walk(step.get("input"))
+    return writes, reads - writes
+
+
+def build_dependency_graph(steps: List[Dict[str, Any]]) -> List[Set[int]]:
+    """
+    Build the dependency graph of a list of steps.
+
+    Steps touching the same entity keep their declared order using
+    reader/writer semantics: a writer waits for the previous writer and every
+    reader since, a reader only waits for the previous writer. Steps touching
+    disjoint entities are independent.
+
+    Args:
+        steps: The ordered step configurations
+
+    Returns:
+        For each step index, the set of step indexes it depends on
+    """
+    last_writer: Dict[str, int] = {}
+    readers_since_write: Dict[str, List[int]] = {}
+    dependencies: List[Set[int]] = []
+
+    for index, step in enumerate(steps):
+        writes, reads = collect_step_refs(step)
+        deps: Set[int] = set()
+
+        for ref in reads:
+            if ref in last_writer:
+                deps.add(last_writer[ref])
+        for ref in writes:
+            if ref in last_writer:
+                deps.add(last_writer[ref])
+            deps.update(readers_since_write.get(ref, []))
+
+        for ref in reads:
+            readers_since_write.setdefault(ref, []).append(index)
+        for ref in writes:
+            last_writer[ref] = index
+            readers_since_write[ref] = []
+
+        deps.discard(index)
+        dependencies.append(deps)
+
+    return dependencies
+
+
+def critical_path_length(
+    dependencies: List[Set[int]], costs: Optional[List[float]] = None
+) -> float:
+    """
+    Compute the length of the longest dependency chain.
+
+    Args:
+        dependencies: The graph returned by ``build_dependency_graph``
+        costs: Optional cost of each step (defaults to 1 per step)
+
+    Returns:
+        The summed cost of the critical path
+    """
+    finish: List[float] = []
+    for index, deps in enumerate(dependencies):
+        cost = costs[index] if costs else 1
+        finish.append(max((finish[dep] for dep in deps), default=0) + cost)
+    return max(finish, default=0)
+
+
+class StepRequest:
+    """Stand-in for the pytest ``request`` fixture used by steps run off the test thread."""
+
+    def __init__(self, nodeid: str = ""):
+        self.node = SimpleNamespace(nodeid=nodeid)
+
+
+class StepOutcome:
+    """Result of a single step run by the executor."""
+
+    def __init__(
+        self,
+        index: int,
+        status: str,
+        error: Optional[BaseException] = None,
+        api_info: Optional[Dict[str, Any]] = None,
+        duration: float = 0.0,
+        blocked_by: Optional[int] = None,
+        api_calls: Any = None,
+    ):
+        self.index = index
+        self.status = status
+        self.error = error
+        self.api_info = api_info
+        self.api_calls = api_calls
+        self.duration = duration
+        self.blocked_by = blocked_by
+
+    def __repr__(self) -> str:
+        return f"StepOutcome(index={self.index}, status={self.status!r})"
+
+
+class ProcedureExecutor:
+    """
+    Run procedure steps concurrently while respecting their dependencies.
+
+    Each worker thread calls ``worker_setup`` once and passes its result to
+    every ``run_step`` call, which lets callers give each thread its own
+    (non thread-safe) Playwright request context.
+    """
+
+    def __init__(
+        self,
+        steps: List[Dict[str, Any]],
+        run_step: Callable[[int, Dict[str, Any], StepRequest, Any], None],
+        max_workers: int = 4,
+        worker_setup: Optional[Callable[[], Any]] = None,
+        worker_teardown: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            steps: The ordered step configurations
+            run_step: Callable ``(index, step, request, worker_state)`` executing one step
+            max_workers: Number of worker threads
+            worker_setup: Optional callable returning per-worker state
+            worker_teardown: Optional callable releasing per-worker state
+        """
+        self.steps = steps
+        self.run_step = run_step
+        self.max_workers = max(1, max_workers)
+        self.worker_setup = worker_setup
+        self.worker_teardown = worker_teardown
+        self.dependencies = build_dependency_graph(steps)
+
+    def run(self) -> Dict[int, StepOutcome]:
+        """
+        Execute every step and wait for completion.
+
+        Steps whose dependency failed, was skipped or was blocked are not run
+        and are reported as ``blocked``.
+
+        Returns:
+            Mapping of step index to its outcome
+        """
+        total = len(self.steps)
+        outcomes: Dict[int, StepOutcome] = {}
+        if total == 0:
+            return outcomes
+
+        dependents: List[List[int]] = [[] for _ in range(total)]
+        pending = [len(deps) for deps in self.dependencies]
+        for index, deps in enumerate(self.dependencies):
+            for dep in deps:
+                dependents[dep].append(index)
+
+        work: "queue.Queue[Optional[int]]" = queue.Queue()
+        done: "queue.Queue[StepOutcome]" = queue.Queue()
+        ready = [index for index in range(total) if pending[index] == 0]
+        heapq.heapify(ready)
+
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(work, done), name=f"procedure-worker-{n}", daemon=True
+            )
+            for n in range(min(self.max_workers, total))
+        ]
+        for worker in workers:
+            worker.start()
+
+        in_flight = 0
+        while len(outcomes) < total:
+            while ready:
+                work.put(heapq.heappop(ready))
+                in_flight += 1
+            if in_flight == 0:
+                break
+
+            outcome = done.get()
+            in_flight -= 1
+            outcomes[outcome.index] = outcome
+
+            blocked = [outcome] if outcome.status != PASSED else []
+            for dependent in dependents[outcome.index]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0 and not blocked:
+                    heapq.heappush(ready, dependent)
+
+            while blocked:
+                cause = blocked.pop()
+                for dependent in dependents[cause.index]:
+                    if dependent in outcomes:
+                        continue
+                    outcomes[dependent] = StepOutcome(
+                        dependent, BLOCKED, blocked_by=cause.index
+                    )
+                    blocked.append(outcomes[dependent])
+
+            ready = [index for index in ready if index not in outcomes]
+            heapq.heapify(ready)
+
+        for _ in workers:
+            work.put(None)
+        for worker in workers:
+            worker.join()
+
+        return outcomes
+
+    def _worker(
+        self, work: "queue.Queue[Optional[int]]", done: "queue.Queue[StepOutcome]"
+    ) -> None:
+        """Worker loop: run steps from the work queue until a sentinel arrives."""
+        state = None
+        setup_error: Optional[BaseException] = None
+        try:
+            state = self.worker_setup() if self.worker_setup else None
+        except BaseException as exc:  # noqa: B036 - reported per step below
+            setup_error = exc
+
+        try:
+            while True:
+                index = work.get()
+                if index is None:
+                    return
+                if setup_error is not None:
+                    done.put(StepOutcome(index, FAILED, error=setup_error))
+                    continue
+                done.put(self._run_one(index, state))
+        finally:
+            if self.worker_teardown and setup_error is None:
+                try:
+                    self.worker_teardown(state)
+                except Exception as exc:
+                    print(f"⚠️ Worker teardown failed: {exc}")
+
+    def _run_one(self, index: int, state: Any) -> StepOutcome:
+        """Run a single step and convert its result into a ``StepOutcome``."""
+        step = self.steps[index]
+        request = StepRequest(nodeid=f"step-{index + 1}:{step.get('type')}")
+        started = time.perf_counter()
+        status, error = PASSED, None
+        try:
+            with trace_context(request.node.nodeid, step.get("type")):
+                self.run_step(index, step, request, state)
+        except pytest.skip.Exception as exc:
+            status, error = SKIPPED, exc
+        except BaseException as exc:  # pytest.fail raises a BaseException subclass
+            status, error = FAILED, exc
+        return StepOutcome(
+            index,
+            status,
+            error=error,
+            api_info=getattr(request.node, "_api_info", None),
+            duration=time.perf_counter() - started,
+            api_calls=getattr(request.node, "_api_calls", None),
+        )
+
+
+def step_index(steps: List[Dict[str, Any]], step: Dict[str, Any]) -> int:
+    """
+    Find the position of a step by identity (steps may compare equal).
+
+    Args:
+        steps: The ordered step configurations
+        step: The step to look up
+
+    Returns:
+        The index of the step
+    """
+    return next(index for index, candidate in enumerate(steps) if candidate is step)
+
+
+def report_outcome(request: Any, outcome: StepOutcome) -> None:
+    """
+    Replay a step outcome inside the pytest test that owns the step.
+
+    Args:
+        request: The test request object
+        outcome: The outcome recorded by the executor
+
+    Raises:
+        The original step exception, or ``pytest.skip`` if the step was blocked
+    """
+    if outcome.api_info is not None:
+        request.node._api_info = outcome.api_info
+    if outcome.api_calls is not None:
+        request.node._api_calls = outcome.api_calls
+    if outcome.status == BLOCKED:
+        pytest.skip(f"Blocked by unsuccessful dependency: step {outcome.blocked_by + 1}")
+    if outcome.error is not None:
+        raise outcome.error
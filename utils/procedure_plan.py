@@ -0,0 +1,272 @@
+"""
+Lazy procedure plans.
+
+A procedure file (``test_data/procedures/*.py``) defines a ``config`` dict
+whose steps call payload factories. This module compiles the file into a
+plan without executing it: literal step fields (``type``, ``id``, ``ref``,
+``*_ref`` inputs...) are read from the AST, and every other expression is
+kept as source and only evaluated when a step actually reads that field.
+Compiled plans are cached on disk, keyed by the file's mtime and size, in a
+private per-user directory (see ``utils.cache_dir``).
+"""
+
+import ast
+import hashlib
+import importlib.util
+import os
+import pickle
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.cache_dir import private_cache_dir
+
+# Bump when the compiled format changes to invalidate on-disk caches
+PLAN_FORMAT = 1
+
+# Cached in place of a compiled plan for files that must be imported eagerly
+EAGER = "eager"
+
+
+class Deferred:
+    """An expression of the procedure file, evaluated on first access."""
+
+    __slots__ = ("source",)
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __getstate__(self) -> str:
+        return self.source
+
+    def __setstate__(self, source: str) -> None:
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"<deferred {self.source}>"
+
+
+class LazyStep(Mapping):
+    """
+    A procedure step whose non-literal fields are materialized on access.
+
+    Each field is evaluated at most once, so payloads built with ``makeid``
+    stay stable for the whole run.
+    """
+
+    __slots__ = ("_plan", "_data", "_resolved")
+
+    def __init__(self, plan: "ProcedurePlan", data: Dict[str, Any]):
+        self._plan = plan
+        self._data = data
+        self._resolved: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._resolved:
+            return self._resolved[key]
+        value = self._data[key]
+        if not _has_deferred(value):
+            return value
+        with self._plan._lock:
+            if key not in self._resolved:
+                self._resolved[key] = self._plan.materialize(value)
+        return self._resolved[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fully materialized step as a plain dict."""
+        return {key: self[key] for key in self._data}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+def _has_deferred(value: Any) -> bool:
+    if isinstance(value, Deferred):
+        return True
+    if isinstance(value, dict):
+        return any(_has_deferred(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_deferred(item) for item in value)
+    return False
+
+
+def _compile_value(node: ast.AST) -> Any:
+    """Turn an AST node into literals, keeping non-literal expressions as Deferred."""
+    if isinstance(node, ast.Dict) and all(
+        isinstance(key, ast.Constant) and isinstance(key.value, str) for key in node.keys
+    ):
+        return {key.value: _compile_value(value) for key, value in zip(node.keys, node.values)}
+    if isinstance(node, ast.List):
+        return [_compile_value(item) for item in node.elts]
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return Deferred(ast.unparse(node))
+
+
+def _compile_source(source: str, path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Split a procedure file into its prelude and its compiled ``config``.
+
+    Returns:
+        Tuple of (prelude source, compiled config), or None if the file does
+        not assign a dict literal to ``config`` or modifies it afterwards
+    """
+    module = ast.parse(source, filename=path)
+    prelude, config = [], None
+    for statement in module.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and [getattr(target, "id", None) for target in statement.targets] == ["config"]
+            and isinstance(statement.value, ast.Dict)
+        ):
+            config = _compile_value(statement.value)
+        elif config is not None and any(
+            isinstance(node, ast.Name) and node.id == "config" for node in ast.walk(statement)
+        ):
+            # ``config`` is modified after its definition: only a real import is faithful
+            return None
+        else:
+            prelude.append(statement)
+    if not isinstance(config, dict):
+        return None
+    return ast.unparse(ast.Module(body=prelude, type_ignores=[])), config
+
+
+class ProcedurePlan:
+    """Compiled procedure: literal step skeletons plus a lazily executed prelude."""
+
+    def __init__(self, path: str, prelude: str, config: Dict[str, Any]):
+        """
+        Initialize the plan.
+
+        Args:
+            path: Path of the procedure file
+            prelude: Source of the file's top-level statements other than ``config``
+            config: The compiled ``config`` dict (may contain Deferred values)
+        """
+        self.path = path
+        self.prelude = prelude
+        self._lock = threading.RLock()
+        self._namespace: Optional[Dict[str, Any]] = None
+        self.steps: List[LazyStep] = [LazyStep(self, step) for step in config.get("steps") or []]
+        self.config: Dict[str, Any] = {**config, "steps": self.steps}
+
+    def namespace(self) -> Dict[str, Any]:
+        """Execute the prelude (imports of payload factories) once and return its globals."""
+        with self._lock:
+            if self._namespace is None:
+                namespace: Dict[str, Any] = {"__file__": self.path, "__name__": "procedure_config"}
+                exec(compile(self.prelude, self.path, "exec"), namespace)
+                self._namespace = namespace
+            return self._namespace
+
+    def fork(self) -> "ProcedurePlan":
+        """
+        Return a copy of the plan whose steps are materialized again.
+
+        The copy shares the executed prelude but evaluates payload factories
+        anew, so each copy gets its own generated names and identifiers.
+
+        Returns:
+            A new ProcedurePlan
+        """
+        plan = ProcedurePlan(
+            self.path, self.prelude, {**self.config, "steps": [step._data for step in self.steps]}
+        )
+        plan._namespace = self._namespace
+        return plan
+
+    def materialize(self, value: Any) -> Any:
+        """Evaluate every Deferred expression inside a compiled value."""
+        if isinstance(value, Deferred):
+            return eval(compile(value.source, self.path, "eval"), self.namespace())
+        if isinstance(value, dict):
+            return {key: self.materialize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.materialize(item) for item in value]
+        return value
+
+
+def _cache_path(path: str, directory: Optional[str]) -> str:
+    directory = private_cache_dir("foundation-qa-plans", directory)
+    digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(directory, f"plan-{digest}.pickle")
+
+
+def _load_eager(path: str) -> Dict[str, Any]:
+    """Import a procedure file the classic way and return its ``config``."""
+    spec = importlib.util.spec_from_file_location("procedure_config", path)
+    if spec is None or spec.loader is None:
+        raise FileNotFoundError(f"Could not load procedure configuration file {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.config or {}
+
+
+def load_procedure(path: str, cache_dir: Optional[str] = None) -> ProcedurePlan:
+    """
+    Load a procedure file as a lazy plan, using the on-disk cache when fresh.
+
+    Files whose ``config`` is not a plain dict literal are imported eagerly.
+
+    Args:
+        path: Path of the procedure file
+        cache_dir: Plan cache directory (``PROCEDURE_PLAN_CACHE`` env, else a private tmp dir)
+
+    Returns:
+        The compiled ProcedurePlan
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        PermissionError: If the default cache directory is not private
+    """
+    stat = os.stat(path)
+    stamp = (PLAN_FORMAT, stat.st_mtime_ns, stat.st_size)
+    cache_file = _cache_path(path, cache_dir or os.getenv("PROCEDURE_PLAN_CACHE"))
+
+    compiled = None
+    try:
+        with open(cache_file, "rb") as f:
+            cached_stamp, cached = pickle.load(f)
+        if cached_stamp == stamp:
+            compiled = cached
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    if compiled is None:
+        with open(path, encoding="utf-8") as f:
+            compiled = _compile_source(f.read(), path) or EAGER
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump((stamp, compiled), f)
+        os.replace(tmp_file, cache_file)
+
+    if compiled == EAGER:
+        return ProcedurePlan(path, "", _load_eager(path))
+    prelude, config = compiled
+    return ProcedurePlan(path, prelude, config)
+
+
+def step_id(index: int, step: Mapping) -> str:
+    """
+    Build the pytest id of a step without materializing its payload.
+
+    Args:
+        index: Position of the step in the procedure
+        step: The step
+
+    Returns:
+        An id like ``Step 3: create_source_source-1``
+    """
+    suffix = step.get("id") or step.get("identifier") or step.get("ref") or ""
+    return f"Step {index + 1}: {step['type']}_{suffix}"
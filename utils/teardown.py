@@ -0,0 +1,124 @@
+"""
+Dependency-ordered, concurrent teardown of created entities.
+
+``teardown`` deletes entities with the async ``delete_*`` functions through
+``api.aio.bulk.bulk_delete``: products, then objects, sources, systems and
+meshes, each type's entities concurrently. ``teardown_tracked`` deletes
+everything the run created through the API layer and did not delete itself
+(see ``utils.entity_tracker``), plus what fixtures handed over with
+``defer_teardown`` and minus what ``keep_after_teardown`` kept; the test
+session calls it once at the end unless ``TEARDOWN=0``.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+from api.aio.auth import login_token
+from api.aio.bulk import DEFAULT_CONCURRENCY, BulkOperationError, bulk_delete
+from api.aio.client import async_api_context, run_async
+from utils.entity_tracker import TRACKER
+from utils.token_cache import TokenCache
+
+
+def teardown_enabled() -> bool:
+    """Whether created entities are deleted at the end of a run (``TEARDOWN``, default on)."""
+    return os.getenv("TEARDOWN", "1").lower() not in ("0", "false", "no")
+
+
+def teardown(
+    entities: Dict[str, List[str]],
+    access_token: Optional[str] = None,
+    base_url: Optional[str] = None,
+    concurrency: Optional[int] = None,
+) -> List[str]:
+    """
+    Delete entities in reverse dependency order, concurrently within each type.
+
+    Failures are reported, never raised: teardown must not fail a test run.
+
+    Args:
+        entities: Identifiers by entity type ("product", "object", "source", "system", "mesh")
+        access_token: Authentication token (cached token or a fresh login if None)
+        base_url: The API base URL (``API_URL`` if None)
+        concurrency: Maximum number of deletes in flight (``TEARDOWN_CONCURRENCY``, default 8)
+
+    Returns:
+        The deleted entities, as ``"<type> <identifier>"`` keys
+    """
+    if not any(entities.values()):
+        return []
+    base_url = base_url or os.getenv("API_URL", "http://localhost:8000")
+    concurrency = concurrency or int(os.getenv("TEARDOWN_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+    total = sum(len(identifiers) for identifiers in entities.values())
+
+    async def _teardown() -> List[str]:
+        async with async_api_context(base_url, concurrency) as context:
+            token = access_token or await _access_token(context)
+            if not token:
+                print("⚠️ Teardown skipped: no access token")
+                return []
+            try:
+                return await bulk_delete(context, entities, token, concurrency=concurrency)
+            except BulkOperationError as exc:
+                for key, error in exc.failures:
+                    print(f"❌ Failed to delete {key}: {error}")
+                return list(exc.results)
+
+    start = time.perf_counter()
+    try:
+        deleted = run_async(_teardown())
+    except Exception as exc:
+        print(f"❌ Teardown failed: {exc}")
+        return []
+    for key in deleted:
+        kind, identifier = key.split(" ", 1)
+        TRACKER.discard(kind, identifier)
+    print(f"🧹 Deleted {len(deleted)}/{total} entities in {time.perf_counter() - start:.2f}s")
+    return deleted
+
+
+async def _access_token(context) -> Optional[str]:
+    """Return the API token, the cached token or a fresh login's token."""
+    credentials = {"user": os.getenv("QA_USERNAME", ""), "password": os.getenv("QA_PASSWORD", "")}
+    return await TokenCache.access_token(lambda: login_token(context, credentials))
+
+
+def defer_teardown(entities: Dict[str, List[str]]) -> None:
+    """
+    Hand entities over to the end-of-session teardown.
+
+    Args:
+        entities: Identifiers by entity type
+    """
+    for kind, identifiers in entities.items():
+        for identifier in identifiers:
+            if identifier:
+                TRACKER.add(kind, identifier)
+
+
+def keep_after_teardown(entities: Dict[str, List[str]]) -> None:
+    """
+    Keep entities out of the end-of-session teardown (e.g. a reconciled landscape).
+
+    Args:
+        entities: Identifiers by entity type
+    """
+    for kind, identifiers in entities.items():
+        for identifier in identifiers:
+            TRACKER.discard(kind, identifier)
+
+
+def teardown_tracked(access_token: Optional[str] = None) -> List[str]:
+    """
+    Delete every entity created through the API layer and still tracked.
+
+    Args:
+        access_token: Authentication token (cached token or a fresh login if None)
+
+    Returns:
+        The deleted entities (empty when ``TEARDOWN=0``)
+    """
+    if not teardown_enabled():
+        return []
+    return teardown(TRACKER.pending(), access_token)
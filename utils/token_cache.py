@@ -0,0 +1,233 @@
+"""
+On-disk access token cache.
+
+Tokens are cached per ``API_URL``, user and ``X_ACCOUNT`` in a file shared by
+every xdist worker (and by later runs), guarded by a file lock so that only
+one worker logs in when the token is missing or about to expire. The expiry
+is read from the JWT ``exp`` claim; tokens are refreshed ``refresh_margin``
+seconds before they expire.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_REFRESH_MARGIN = 300
+# Lifetime assumed for tokens without a readable ``exp`` claim
+DEFAULT_TOKEN_TTL = 3600
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    Read the expiry of a JWT without verifying its signature.
+
+    Args:
+        token: The access token
+
+    Returns:
+        The ``exp`` claim as a Unix timestamp, or None if it cannot be read
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (ValueError, AttributeError):
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenCache:
+    """File-backed access token cache with expiry-aware refresh."""
+
+    def __init__(
+        self,
+        base_url: str,
+        user: str,
+        account: str = "",
+        directory: Optional[str] = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            base_url: The API base URL
+            user: The login user
+            account: The ``X_ACCOUNT`` value
+            directory: Cache directory (defaults to ``<tmp>/foundation-qa-tokens``)
+            refresh_margin: Seconds before expiry at which the token is refreshed
+            clock: Wall clock function (injectable for tests)
+        """
+        key = hashlib.sha256(f"{base_url}|{user}|{account}".encode()).hexdigest()[:16]
+        directory = directory or os.path.join(tempfile.gettempdir(), "foundation-qa-tokens")
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.path = os.path.join(directory, f"token-{key}.json")
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+
+    @classmethod
+    def from_env(cls) -> "TokenCache":
+        """
+        Build a cache from ``API_URL``, ``QA_USERNAME``, ``X_ACCOUNT``,
+        ``TOKEN_CACHE_DIR`` and ``TOKEN_REFRESH_MARGIN``.
+
+        Returns:
+            A TokenCache instance
+        """
+        return cls(
+            os.getenv("API_URL", "http://localhost:8000"),
+            os.getenv("QA_USERNAME", ""),
+            os.getenv("X_ACCOUNT", ""),
+            directory=os.getenv("TOKEN_CACHE_DIR") or None,
+            refresh_margin=float(os.getenv("TOKEN_REFRESH_MARGIN", str(DEFAULT_REFRESH_MARGIN))),
+        )
+
+    @classmethod
+    def from_env_if_enabled(cls) -> Optional["TokenCache"]:
+        """
+        Build a cache with ``from_env``, unless ``TOKEN_CACHE=0`` disables it.
+
+        Returns:
+            A TokenCache instance, or None
+        """
+        return None if os.getenv("TOKEN_CACHE", "1") == "0" else cls.from_env()
+
+    @classmethod
+    async def access_token(cls, login: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Return ``API_TOKEN``, else the cached token, else a fresh login's token.
+
+        The token cache is built with ``from_env_if_enabled``; without it, every
+        call logs in.
+
+        Args:
+            login: Coroutine function performing the login and returning the new token
+
+        Returns:
+            The access token, or None if the login failed
+        """
+        token = os.getenv("API_TOKEN")
+        if token:
+            return token
+        token_cache = cls.from_env_if_enabled()
+        if token_cache is None:
+            return await login()
+        return await token_cache.aget(login)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the cache file across processes."""
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, expires_at: Optional[float]) -> bool:
+        """Return True if a token expiring at ``expires_at`` does not need a refresh yet."""
+        return expires_at is not None and expires_at - self.refresh_margin > self.clock()
+
+    def load(self) -> Optional[str]:
+        """
+        Return the cached token if it is not about to expire.
+
+        Returns:
+            The access token, or None
+        """
+        entry = self._read()
+        if entry and self.is_fresh(entry.get("expires_at")):
+            return entry.get("access_token")
+        return None
+
+    def store(self, token: str) -> float:
+        """
+        Write a token to the cache (atomically, readable by the owner only).
+
+        Args:
+            token: The access token
+
+        Returns:
+            The token expiry timestamp
+        """
+        expires_at = token_expiry(token) or self.clock() + DEFAULT_TOKEN_TTL
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"access_token": token, "expires_at": expires_at}, f)
+        os.replace(tmp_path, self.path)
+        return expires_at
+
+    def invalidate(self) -> None:
+        """Drop the cached token (e.g. after a 401)."""
+        with self._locked():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, login: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return a fresh token, logging in only if the cache is empty or expiring.
+
+        The check and the login happen under the file lock, so concurrent
+        workers wait for the first one's login instead of logging in too.
+
+        Args:
+            login: Callable performing the login and returning the new token
+
+        Returns:
+            The access token, or None if the login failed
+        """
+        with self._locked():
+            token = self.load()
+            if token:
+                return token
+            token = login()
+            if token:
+                self.store(token)
+            return token
+
+    async def aget(self, login: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Async counterpart of ``get``.
+
+        The file lock is held across the login, which blocks the event loop
+        while another worker logs in.
+
+        Args:
+            login: Coroutine function performing the login and returning the new token
+
+        Returns:
+            The access token, or None if the login failed
+        """
+        with self._locked():
+            token = self.load()
+            if token:
+                return token
+            token = await login()
+            if token:
+                self.store(token)
+            return token